@@ -1,8 +1,42 @@
 import os
+import sys
 import json
-import networkx as nx
 from pathlib import Path
 
+# networkx/pydot are only imported for the optional '--networkx' export; the
+# default path uses the small native graph and DOT writer below.
+
+class DiGraph:
+    """Just enough of networkx.DiGraph for this script: ordered nodes and adjacency."""
+    def __init__(self):
+        self.adjacency = {}
+
+    def add_node(self, node):
+        if node not in self.adjacency:
+            self.adjacency[node] = {}
+
+    def add_edge(self, source, target):
+        self.add_node(source)
+        self.add_node(target)
+        self.adjacency[source][target] = None
+
+    @property
+    def nodes(self):
+        return list(self.adjacency)
+
+    @property
+    def edges(self):
+        return [(source, target) for source, targets in self.adjacency.items() for target in targets]
+
+    def number_of_nodes(self):
+        return len(self.adjacency)
+
+    def number_of_edges(self):
+        return sum(len(targets) for targets in self.adjacency.values())
+
+def dot_id(name):
+    return '"' + str(name).replace('"', '\\"') + '"'
+
 def collect_ast_files(directory):
     """Recursively collect all .json files under the given directory."""
     ast_files = {}
@@ -60,7 +94,7 @@ def extract_attribute_dependencies(ast_json):
     return deps
 
 def build_dependency_graph(ast_files):
-    G = nx.DiGraph()
+    G = DiGraph()
 
     for path, ast in ast_files.items():
         node = path.replace("\\", "/").replace(".py.json", "")
@@ -78,7 +112,22 @@ def build_dependency_graph(ast_files):
     return G
 
 def save_dot_file(G, output_path):
-    nx.drawing.nx_pydot.write_dot(G, output_path)
+    """Writes the graph as DOT, streaming one line per node and edge in networkx order."""
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write("strict digraph  {\n")
+        f.writelines(f"{dot_id(node)};\n" for node in G.adjacency)
+        f.writelines(f"{dot_id(source)} -> {dot_id(target)};\n"
+                     for source, targets in G.adjacency.items() for target in targets)
+        f.write("}\n")
+    print(f"DOT file written to: {output_path}")
+
+def save_networkx_dot_file(G, output_path):
+    """Optional export through networkx/pydot, for callers that want pydot's exact formatting."""
+    import networkx as nx
+    nx_graph = nx.DiGraph()
+    nx_graph.add_nodes_from(G.adjacency)
+    nx_graph.add_edges_from(G.edges)
+    nx.drawing.nx_pydot.write_dot(nx_graph, output_path)
     print(f"DOT file written to: {output_path}")
 
 # === Run ===
@@ -90,4 +139,7 @@ if __name__ == "__main__":
     print(f"Discovered {len(ast_files)} AST files")
 
     graph = build_dependency_graph(ast_files)
-    save_dot_file(graph, output_dot)
+    if "--networkx" in sys.argv:
+        save_networkx_dot_file(graph, output_dot)
+    else:
+        save_dot_file(graph, output_dot)
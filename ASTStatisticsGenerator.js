@@ -32,6 +32,37 @@ function findNodesByType(node, type) {
     return nodes;
 }
 
+// Compiled once and reused for every string literal.
+const HARDCODED_URL_REGEX = /https?:\/\/[^\s/$.?#].[^\s'"`]*/gi;
+const STRING_CONTENT_TYPES = new Set(['string_fragment', 'string_content']);
+const STRING_LITERAL_TYPES = new Set(['string', 'template_string']);
+const SUBSTITUTION_TYPES = new Set(['template_substitution']);
+
+/**
+ * Calls the callback with the text of every leaf string content node, iteratively.
+ * String literals with substitutions or without content children are passed whole,
+ * without quotes, so a URL around a `${...}` substitution is still found.
+ * @param {object} root - The AST node to start from.
+ * @param {function(string): void} callback - Receives each string's content.
+ */
+function forEachStringContent(root, callback) {
+    const stack = [root];
+    while (stack.length > 0) {
+        const node = stack.pop();
+        if (!node) continue;
+        const children = node.children || [];
+        if (STRING_CONTENT_TYPES.has(node.type)) {
+            callback(node.text);
+        } else if (STRING_LITERAL_TYPES.has(node.type) &&
+                   (children.some(c => SUBSTITUTION_TYPES.has(c.type)) || !children.some(c => STRING_CONTENT_TYPES.has(c.type)))) {
+            callback(node.text.replace(/^['"`]|['"`]$/g, ''));
+        } else if (/['"`]/.test(node.text)) {
+            // Subtrees without a quote character cannot contain a string literal.
+            for (let i = children.length - 1; i >= 0; i--) stack.push(children[i]);
+        }
+    }
+}
+
 /**
  * Calculates the cyclomatic complexity of a function node.
  * @param {object} functionNode - The AST node of a function.
@@ -128,10 +159,10 @@ function analyzeAstFile(filePath, stats) {
             stats.reactSpecifics.hooks[identifier]++;
         }
     }
-    const hardcodedUrlRegex = /https?:\/\/[^\s/$.?#].[^\s]*/gi;
-    findNodesByType(ast, 'string').forEach(node => {
-        const matches = node.text.match(hardcodedUrlRegex);
-        if(matches){
+    forEachStringContent(ast, text => {
+        if (!text.includes('://')) return;
+        const matches = text.match(HARDCODED_URL_REGEX);
+        if (matches) {
             stats.api.hardcodedUrls.push(...matches);
         }
     });
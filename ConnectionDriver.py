@@ -0,0 +1,157 @@
+# To run this script:
+# 1. First, generate the ASTs (e.g. into ./PythonAST or ./JavaScriptAST).
+# 2. Execute from your terminal, choosing the detector and the AST directory:
+#    python ConnectionDriver.py python ./PythonAST
+#    python ConnectionDriver.py javascript ./JavaScriptAST --workers 8
+#    python ConnectionDriver.py python ./PythonAST --ndjson findings.ndjson
+#
+# Runs Pythonconnectiondetails / Javascriptconnectiondetails over a process pool.
+# The file list is collected once (in the same os.walk order as the sequential
+# scripts), split into contiguous shards, and the shard results are merged back
+# in shard order, so the output is identical to the single-process run. Only a
+# few shards per worker are in flight at a time, which bounds the memory held by
+# results that are waiting for an earlier shard.
+
+import os
+import sys
+import json
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import Pythonconnectiondetails
+import Javascriptconnectiondetails
+from SymbolTable import SymbolCache
+
+# --- Detector Adapters ---
+# Each adapter knows how to list its AST files, analyze one file, turn a result
+# into NDJSON records and merge results into the sequential output structure.
+
+def python_analyze(full_path, key, symbols):
+    return Pythonconnectiondetails.parse_ast_file(full_path, symbols, f"{key}.json")
+
+def python_records(full_path, key, symbols):
+    return Pythonconnectiondetails.parse_ast_file_records(full_path, key, symbols)
+
+def python_merge(graph, key, findings):
+    if findings:
+        graph[key] = findings
+
+def javascript_analyze(full_path, key, symbols):
+    return Javascriptconnectiondetails.try_analyze_ast_file(full_path, key, symbols)
+
+def javascript_records(full_path, key, symbols):
+    file_results = javascript_analyze(full_path, key, symbols)
+    return Javascriptconnectiondetails.file_results_to_records(file_results) if file_results else []
+
+def javascript_merge(graph, key, file_results):
+    for category, values in (file_results or {}).items():
+        graph.setdefault(category, []).extend(values)
+
+DETECTORS = {
+    'python': {
+        'files': Pythonconnectiondetails.iter_ast_files,
+        'analyze': python_analyze,
+        'records': python_records,
+        'merge': python_merge,
+    },
+    'javascript': {
+        'files': Javascriptconnectiondetails.iter_ast_files,
+        'analyze': javascript_analyze,
+        'records': javascript_records,
+        'merge': javascript_merge,
+    },
+}
+
+# --- Sharding ---
+
+def make_shards(files, shard_count):
+    """Splits the file list into at most shard_count contiguous, similarly sized shards."""
+    shard_count = max(1, min(shard_count, len(files)))
+    size, extra = divmod(len(files), shard_count)
+    shards, start = [], 0
+    for i in range(shard_count):
+        end = start + size + (1 if i < extra else 0)
+        shards.append(files[start:end])
+        start = end
+    return shards
+
+def analyze_shard(detector_name, mode, root_dir, shard):
+    """Worker entry point: runs one detector over one shard of (full_path, key) pairs."""
+    detector = DETECTORS[detector_name]
+    symbols = SymbolCache(root_dir, detector_name)
+    analyze = detector[mode]
+    return [(key, analyze(full_path, key, symbols)) for full_path, key in shard]
+
+def iter_shard_results(detector_name, mode, root_dir, workers=None, shards_per_worker=4):
+    """
+    Yields (key, result) for every AST file in sequential order while the shards
+    are analyzed in parallel. At most two shards per worker are submitted ahead of
+    the one being consumed, so finished results waiting for an earlier shard stay
+    bounded and the order stays deterministic.
+    """
+    files = list(DETECTORS[detector_name]['files'](root_dir))
+    if not files:
+        return
+    workers = workers or os.cpu_count() or 1
+    shards = make_shards(files, workers * shards_per_worker)
+
+    if workers == 1:
+        for shard in shards:
+            yield from analyze_shard(detector_name, mode, root_dir, shard)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for shard in shards:
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+            pending.append(executor.submit(analyze_shard, detector_name, mode, root_dir, shard))
+        while pending:
+            yield from pending.popleft().result()
+
+def build_connection_graph(detector_name, root_dir, workers=None):
+    """Parallel equivalent of create_connection_graph / parse_ast_files."""
+    graph = {}
+    merge = DETECTORS[detector_name]['merge']
+    for key, result in iter_shard_results(detector_name, 'analyze', root_dir, workers):
+        merge(graph, key, result)
+    return graph
+
+def stream_connection_graph(detector_name, root_dir, out, workers=None):
+    """Parallel equivalent of the --ndjson mode; returns the number of records written."""
+    record_count = 0
+    for _, records in iter_shard_results(detector_name, 'records', root_dir, workers):
+        for record in records:
+            out.write(json.dumps(record) + "\n")
+        if records:
+            out.flush()
+        record_count += len(records)
+    return record_count
+
+# --- Main Execution ---
+def main(argv):
+    if len(argv) < 3 or argv[1] not in DETECTORS:
+        print(f"Usage: python ConnectionDriver.py <{'|'.join(DETECTORS)}> <path-to-ast-directory> [--workers N] [--ndjson [output.ndjson]]")
+        sys.exit(1)
+
+    detector_name, root_dir = argv[1], argv[2]
+    if not os.path.isdir(root_dir):
+        print(f"Error: Directory '{root_dir}' not found.", file=sys.stderr)
+        sys.exit(1)
+
+    workers = int(argv[argv.index("--workers") + 1]) if "--workers" in argv else None
+
+    if "--ndjson" in argv:
+        args = argv[argv.index("--ndjson") + 1:]
+        if args and not args[0].startswith("--") and args[0] != "-":
+            with open(args[0], "w", encoding="utf-8") as f_out:
+                count = stream_connection_graph(detector_name, root_dir, f_out, workers)
+            print(f"Streamed {count} findings to {args[0]}", file=sys.stderr)
+        else:
+            stream_connection_graph(detector_name, root_dir, sys.stdout, workers)
+        return
+
+    print(json.dumps(build_connection_graph(detector_name, root_dir, workers), indent=2))
+
+if __name__ == "__main__":
+    main(sys.argv)
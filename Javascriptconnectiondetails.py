@@ -1,11 +1,15 @@
 import os
+import sys
 import json
 import re
 from collections import defaultdict
+from functools import partial
+from SymbolTable import SymbolCache
 
-def find_api_or_route_in_node(node, file_path, results):
+def find_api_or_route_in_node(node, file_path, results, resolve_constant=None):
     """
     Recursively traverses the AST to find API calls or route definitions.
+    If resolve_constant is given, paths such as ROUTES.HOME are resolved to strings.
     """
     if not isinstance(node, dict):
         return
@@ -21,7 +25,8 @@ def find_api_or_route_in_node(node, file_path, results):
                 args = node.get("children", [{}, {}])[1].get("children", [])
                 if args:
                     path_node = args[0]
-                    path = path_node.get("text", "unknown_path").strip("'\"")
+                    path_text = path_node.get("text", "unknown_path")
+                    path = resolve_constant(path_text) if resolve_constant else path_text.strip("'\"")
                     results['api_calls'].append(f"{file_path} \t {method} \t {path}")
 
     # Fallback for broken JSX ASTs by parsing the text content
@@ -32,6 +37,8 @@ def find_api_or_route_in_node(node, file_path, results):
     for match in route_matches:
         # match will be a tuple, e.g., ('ROUTES.HOME', '') or ('', '/home')
         path_value = match[0] if match[0] else match[1]
+        if resolve_constant and match[0]:
+            path_value = resolve_constant(path_value)
         path_value = path_value.replace('`', '').replace('${', '{').strip()
         # Cannot determine HTTP method from React Router, so we label it as 'ROUTE'
         results['api_calls'].append(f"{file_path} \t ROUTE \t {path_value}")
@@ -40,7 +47,7 @@ def find_api_or_route_in_node(node, file_path, results):
     # Recursively check children
     if "children" in node and isinstance(node["children"], list):
         for child in node["children"]:
-            find_api_or_route_in_node(child, file_path, results)
+            find_api_or_route_in_node(child, file_path, results, resolve_constant)
 
 
 def find_socket_info_in_node(node, file_path, results):
@@ -80,6 +87,63 @@ def find_socket_info_in_node(node, file_path, results):
         for child in node["children"]:
             find_socket_info_in_node(child, file_path, results)
 
+def analyze_ast_file(file_path, relative_path, symbols=None):
+    """
+    Runs every detector over one AST JSON file, resolving constants through the
+    shared SymbolCache when one is given.
+
+    Returns:
+        dict: The de-duplicated, sorted findings of this file keyed by category.
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        ast_data = json.load(f)
+
+    # Create a temporary dict for the current file's results
+    file_results = defaultdict(list)
+
+    resolve_constant = None
+    if symbols is not None:
+        symbols.table_for(relative_path, ast_data)
+        resolve_constant = partial(symbols.resolve, relative_path)
+
+    find_api_or_route_in_node(ast_data, relative_path, file_results, resolve_constant)
+    find_socket_info_in_node(ast_data, relative_path, file_results)
+
+    # Remove duplicates
+    return {key: sorted(list(set(values))) for key, values in file_results.items()}
+
+def iter_ast_files(root_folder):
+    """
+    Yields (file_path, relative_path) for every JSON AST file under root_folder.
+    """
+    for dirpath, _, filenames in os.walk(root_folder):
+        for filename in filenames:
+            if filename.endswith(".json"):
+                file_path = os.path.join(dirpath, filename)
+                yield file_path, os.path.relpath(file_path, root_folder)
+
+def try_analyze_ast_file(file_path, relative_path, symbols=None):
+    """
+    Like analyze_ast_file, but reports unreadable files and returns None for them.
+    """
+    try:
+        return analyze_ast_file(file_path, relative_path, symbols)
+    except json.JSONDecodeError:
+        print(f"Warning: Could not decode JSON from {relative_path}", file=sys.stderr)
+    except Exception as e:
+        print(f"An error occurred while processing {relative_path}: {e}", file=sys.stderr)
+    return None
+
+def iter_file_results(root_folder):
+    """
+    Walks the AST folder and yields (relative_path, file_results) one file at a time.
+    """
+    symbols = SymbolCache(root_folder, 'javascript')
+    for file_path, relative_path in iter_ast_files(root_folder):
+        file_results = try_analyze_ast_file(file_path, relative_path, symbols)
+        if file_results is not None:
+            yield relative_path, file_results
+
 def parse_ast_files(root_folder):
     """
     Parses all JSON AST files in a given folder and its subdirectories.
@@ -96,32 +160,56 @@ def parse_ast_files(root_folder):
 
     all_results = defaultdict(list)
 
-    for dirpath, _, filenames in os.walk(root_folder):
-        for filename in filenames:
-            if filename.endswith(".json"):
-                file_path = os.path.join(dirpath, filename)
-                relative_path = os.path.relpath(file_path, root_folder)
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        ast_data = json.load(f)
+    for _, file_results in iter_file_results(root_folder):
+        for key, values in file_results.items():
+            all_results[key].extend(values)
+
+    return dict(all_results)
 
-                    # Create a temporary dict for the current file's results
-                    file_results = defaultdict(list)
+def result_to_record(key, value):
+    """
+    Converts one tab-separated finding (e.g. 'a.js \t GET \t /api') into a flat
+    NDJSON record with file, kind, method, path and target fields.
+    """
+    parts = [part.strip() for part in value.split("\t")]
+    record = {"file": parts[0], "kind": key, "method": None, "path": None, "target": None}
+    if key == 'api_calls':
+        record["kind"] = "route" if parts[1] == "ROUTE" else "api_call"
+        record["method"] = parts[1]
+        record["path"] = parts[2] if len(parts) > 2 else None
+    elif key == 'socket_connections':
+        record["kind"] = "socket"
+        record["method"] = "LISTEN" if parts[1] == "Socket connects" else "EVENT"
+        record["target"] = parts[2] if len(parts) > 2 else None
+    return record
 
-                    find_api_or_route_in_node(ast_data, relative_path, file_results)
-                    find_socket_info_in_node(ast_data, relative_path, file_results)
+def file_results_to_records(file_results):
+    """
+    Flattens one file's findings into NDJSON records, in a stable category order.
+    """
+    return [result_to_record(key, value) for key in sorted(file_results) for value in file_results[key]]
 
-                    # Remove duplicates and add to the main results
-                    for key, values in file_results.items():
-                        unique_values = sorted(list(set(values)))
-                        all_results[key].extend(unique_values)
+def stream_ast_files(root_folder, out):
+    """
+    Streaming variant of parse_ast_files: writes one NDJSON record per finding
+    as soon as each file has been analyzed, so memory does not grow with the repo.
 
-                except json.JSONDecodeError:
-                    print(f"Warning: Could not decode JSON from {relative_path}")
-                except Exception as e:
-                    print(f"An error occurred while processing {relative_path}: {e}")
+    Returns:
+        int: The number of records written, or None if the folder does not exist.
+    """
+    if not os.path.isdir(root_folder):
+        print(f"Error: Directory '{root_folder}' not found.", file=sys.stderr)
+        return None
 
-    return dict(all_results)
+    record_count = 0
+    for _, file_results in iter_file_results(root_folder):
+        records = file_results_to_records(file_results)
+        for record in records:
+            out.write(json.dumps(record) + "\n")
+        if records:
+            out.flush()
+        record_count += len(records)
+    return record_count
 
 def main():
     """
@@ -151,6 +239,16 @@ def main():
         with open(full_path, 'w', encoding='utf-8') as f:
             f.write(content)
 
+    # Streaming mode: python Javascriptconnectiondetails.py --ndjson [output.ndjson]
+    if "--ndjson" in sys.argv:
+        args = sys.argv[sys.argv.index("--ndjson") + 1:]
+        if args and args[0] != "-":
+            with open(args[0], 'w', encoding='utf-8') as f_out:
+                stream_ast_files(folder_name, f_out)
+        else:
+            stream_ast_files(folder_name, sys.stdout)
+        return
+
     # Run the parser and get the results
     parsed_data = parse_ast_files(folder_name)
 
@@ -1,6 +1,9 @@
 import os
+import sys
 import json
-import re
+from functools import partial
+from SymbolTable import SymbolCache
+from URLScanner import scan_ast
 
 # --- Configuration for Detection ---
 
@@ -69,8 +72,11 @@ def find_database_connections(node, imported_modules):
     return connections
 
 
-def find_flask_endpoints(node):
-    """Recursively finds Flask endpoints in an AST node."""
+def find_flask_endpoints(node, resolve_constant=None):
+    """
+    Recursively finds Flask endpoints in an AST node. If resolve_constant is given,
+    route arguments such as ROUTES.HOME are resolved to their string values.
+    """
     endpoints = set()
     if isinstance(node, dict):
         if node.get("type") == "decorated_definition":
@@ -79,7 +85,8 @@ def find_flask_endpoints(node):
                 if call_node and ".route" in call_node.get("text", ""):
                     arg_list = next((c for c in call_node.get("children", []) if c.get("type") == "argument_list"), {})
                     
-                    path = arg_list.get("children", [{}])[0].get("text", "''").strip("'\"")
+                    path_text = arg_list.get("children", [{}])[0].get("text", "''")
+                    path = resolve_constant(path_text) if resolve_constant else path_text.strip("'\"")
                     methods = ["GET"] # Default method
 
                     methods_arg = next((arg for arg in arg_list.get("children", []) if arg.get("text", "").startswith("methods=")), None)
@@ -91,83 +98,150 @@ def find_flask_endpoints(node):
                         endpoints.add(f"{method} {path}")
 
         for child in node.get("children", []):
-            endpoints.update(find_flask_endpoints(child))
+            endpoints.update(find_flask_endpoints(child, resolve_constant))
             
     elif isinstance(node, list):
         for item in node:
-            endpoints.update(find_flask_endpoints(item))
+            endpoints.update(find_flask_endpoints(item, resolve_constant))
             
     return endpoints
 
-def find_hardcoded_urls(node):
-    """Recursively finds hardcoded URLs in string literals."""
-    urls = set()
-    url_pattern = r'https?://[^\s/$.?#].[^\s]*'
-
-    if isinstance(node, dict):
-        if node.get("type") == "string":
-            string_content = node.get("text", "").strip("'\"")
-            found = re.findall(url_pattern, string_content)
-            for url in found:
-                urls.add(f"Hardcoded URL: {url}")
-
-        for child in node.get("children", []):
-            urls.update(find_hardcoded_urls(child))
+def find_hardcoded_urls(node, literals=None):
+    """Finds hardcoded URLs in string literals. literals is a scan_ast result of node, if already computed."""
+    if literals is None:
+        literals = scan_ast(node)
+    return {f"Hardcoded URL: {url['url']}" for url in literals['urls']}
 
-    elif isinstance(node, list):
-        for item in node:
-            urls.update(find_hardcoded_urls(item))
-            
-    return urls
+def find_hardcoded_secrets(node, literals=None):
+    """Finds secret-looking string literals (reported by kind, never by value)."""
+    if literals is None:
+        literals = scan_ast(node)
+    return {f"Hardcoded secret: {kind}" for kind in literals['secrets']}
 
-def parse_ast_file(file_path):
-    """Parses a single AST JSON file and extracts relevant information."""
+def load_ast_file(file_path):
+    """Loads a single AST JSON file, returning None if it cannot be read."""
     try:
         with open(file_path, 'r') as f:
-            ast_data = json.load(f)
+            return json.load(f)
     except (json.JSONDecodeError, FileNotFoundError) as e:
-        print(f"Error reading or parsing {file_path}: {e}")
+        print(f"Error reading or parsing {file_path}: {e}", file=sys.stderr)
+        return None
+
+def constant_resolver(symbols, ast_key, ast_data):
+    """Returns a resolver for ast_key's constants, seeding the shared cache with the loaded AST."""
+    if symbols is None:
+        return None
+    symbols.table_for(ast_key, ast_data)
+    return partial(symbols.resolve, ast_key)
+
+def parse_ast_file(file_path, symbols=None, ast_key=None):
+    """Parses a single AST JSON file and extracts relevant information."""
+    ast_data = load_ast_file(file_path)
+    if ast_data is None:
         return []
+    resolve_constant = constant_resolver(symbols, ast_key, ast_data)
 
     # First, find all imported modules in this file
     imported_modules = get_imported_modules(ast_data)
 
     # Combine all findings for this file
     findings = set()
-    findings.update(find_flask_endpoints(ast_data))
+    findings.update(find_flask_endpoints(ast_data, resolve_constant))
     findings.update(find_database_connections(ast_data, imported_modules))
-    findings.update(find_hardcoded_urls(ast_data))
+    literals = scan_ast(ast_data)
+    findings.update(find_hardcoded_urls(ast_data, literals))
+    findings.update(find_hardcoded_secrets(ast_data, literals))
 
     return sorted(list(findings)) # Return a sorted list for consistent output
 
-def create_connection_graph(root_dir):
-    """
-    Walks a directory, parses all .py.json files, and builds a connection graph.
-    """
-    connection_graph = {}
-    
+def make_record(file, kind, method=None, path=None, target=None):
+    """Builds one flat NDJSON finding record."""
+    return {"file": file, "kind": kind, "method": method, "path": path, "target": target}
+
+def parse_ast_file_records(file_path, original_py_path, symbols=None):
+    """Parses a single AST JSON file and returns its findings as flat records."""
+    ast_data = load_ast_file(file_path)
+    if ast_data is None:
+        return []
+    resolve_constant = constant_resolver(symbols, f"{original_py_path}.json", ast_data)
+
+    imported_modules = get_imported_modules(ast_data)
+    records = []
+    for endpoint in sorted(find_flask_endpoints(ast_data, resolve_constant)):
+        method, _, path = endpoint.partition(" ")
+        records.append(make_record(original_py_path, "endpoint", method=method, path=path))
+    for connection in sorted(find_database_connections(ast_data, imported_modules)):
+        records.append(make_record(original_py_path, "database", target=connection))
+    literals = scan_ast(ast_data)
+    for url in sorted(literals['urls'], key=lambda u: u['url']):
+        record = make_record(original_py_path, "url", target=url['url'])
+        record["scope"] = url['scope']
+        records.append(record)
+    for kind in sorted(literals['secrets']):
+        records.append(make_record(original_py_path, "secret", target=kind))
+    return records
+
+def iter_ast_files(root_dir):
+    """Yields (full_path, original_py_path) for every .py.json file under root_dir."""
     for dirpath, _, filenames in os.walk(root_dir):
         for filename in filenames:
             if filename.endswith(".py.json"):
                 full_path = os.path.join(dirpath, filename)
-                
+
                 # Create a representative key for the output JSON, like 'routes/user.py'
                 relative_path = os.path.relpath(full_path, root_dir)
-                original_py_path = relative_path.replace(".json", "").replace("\\", "/")
-                
-                findings = parse_ast_file(full_path)
-                
-                if findings:
-                    connection_graph[original_py_path] = findings
+                yield full_path, relative_path.replace(".json", "").replace("\\", "/")
+
+def create_connection_graph(root_dir):
+    """
+    Walks a directory, parses all .py.json files, and builds a connection graph.
+    """
+    connection_graph = {}
+    symbols = SymbolCache(root_dir, 'python')
+
+    for full_path, original_py_path in iter_ast_files(root_dir):
+        findings = parse_ast_file(full_path, symbols, f"{original_py_path}.json")
+
+        if findings:
+            connection_graph[original_py_path] = findings
 
     return connection_graph
 
+def stream_connection_graph(root_dir, out):
+    """
+    Walks a directory like create_connection_graph, but writes one NDJSON record
+    per finding as soon as each file is analyzed instead of collecting them.
+    Returns the number of records written.
+    """
+    record_count = 0
+    symbols = SymbolCache(root_dir, 'python')
+    for full_path, original_py_path in iter_ast_files(root_dir):
+        records = parse_ast_file_records(full_path, original_py_path, symbols)
+        for record in records:
+            out.write(json.dumps(record) + "\n")
+        if records:
+            out.flush()
+        record_count += len(records)
+    return record_count
+
 # --- Main Execution ---
 if __name__ == "__main__":
     # The script will search for .py.json files in the directory it is run from
     # and all its subdirectories.
     target_directory = "./PythonAST"  # Change this to your target directory if needed
-    
+
+    # Streaming mode: python Pythonconnectiondetails.py --ndjson [output.ndjson]
+    # Records go to stdout unless an output file is given.
+    if "--ndjson" in sys.argv:
+        args = sys.argv[sys.argv.index("--ndjson") + 1:]
+        if args and args[0] != "-":
+            with open(args[0], "w", encoding="utf-8") as f_out:
+                count = stream_connection_graph(target_directory, f_out)
+            print(f"Streamed {count} findings to {args[0]}", file=sys.stderr)
+        else:
+            stream_connection_graph(target_directory, sys.stdout)
+        sys.exit(0)
+
     print(f"Starting advanced AST parsing in directory: '{os.path.abspath(target_directory)}'...")
     
     # Generate the graph
@@ -0,0 +1,275 @@
+import os
+import json
+import re
+from collections import OrderedDict
+
+# --- Per-file symbol tables for resolving string constants ---
+#
+# The connection detectors only see the raw argument text of a call, e.g.
+# `ROUTES.HOME` or `${API}/users`. A SymbolTable is built once per file from its
+# module-level statements only (no full-tree walk) and maps constant names to
+# their string values, plus the names the file imports from other modules.
+# SymbolCache shares those tables between files so an imported constant is
+# resolved with a couple of dict lookups instead of rescanning its module; it
+# keeps only the most recently used tables, so streaming runs stay bounded.
+
+TEMPLATE_SUBSTITUTION = re.compile(r'\$\{\s*([A-Za-z_$][\w$.]*)\s*\}')
+JS_EXTENSIONS = ['.js', '.jsx', '.ts', '.tsx']
+
+# A whole string literal: optional Python prefix (r, b, u, f, rb, fr, ...), then
+# matching triple, single or back quotes around the content.
+STRING_LITERAL = re.compile(r'([rRbBuUfF]{0,2})(\'\'\'|"""|\'|"|`)(.*)\2\Z', re.DOTALL)
+
+def strip_quotes(text):
+    """Removes the prefix and surrounding quotes/backticks from a string literal."""
+    match = STRING_LITERAL.match(text)
+    if match:
+        return match.group(3)
+    return text.strip("'\"")
+
+def is_string_literal(text):
+    match = STRING_LITERAL.match(text)
+    return match is not None and match.group(2) != '`'
+
+class SymbolTable:
+    """Module-level string constants and imported names of one file."""
+    def __init__(self):
+        self.constants = {}  # 'NAME' or 'NAME.key' -> string value
+        self.imports = {}    # local name -> (module specifier, imported name; '*' for namespaces)
+
+    def add_constant(self, name, value_node):
+        """Records NAME = <string | template | identifier> if it can be resolved locally."""
+        value = self.literal_value(value_node)
+        if value is not None:
+            self.constants[name] = value
+
+    def literal_value(self, value_node):
+        value_type = value_node.get("type")
+        text = value_node.get("text", "")
+        if value_type == "string":
+            return strip_quotes(text)
+        if value_type == "template_string":
+            return self.substitute(strip_quotes(text))
+        if value_type in ("identifier", "member_expression", "attribute"):
+            return self.constants.get(text)
+        return None
+
+    def substitute(self, template):
+        """Replaces every ${NAME} whose value is known locally."""
+        return TEMPLATE_SUBSTITUTION.sub(lambda m: self.constants.get(m.group(1), m.group(0)), template)
+
+# --- Table Builders (module-level statements only) ---
+
+def build_python_symbol_table(ast_data):
+    """Builds the symbol table of a Python AST from its top-level statements."""
+    table = SymbolTable()
+    if not isinstance(ast_data, dict):
+        return table
+
+    for statement in ast_data.get("children", []):
+        statement_type = statement.get("type")
+        if statement_type == "expression_statement":
+            assignment = next(iter(statement.get("children", [])), {})
+            children = assignment.get("children", [])
+            if assignment.get("type") == "assignment" and len(children) >= 2 and children[0].get("type") == "identifier":
+                table.add_constant(children[0].get("text", ""), children[-1])
+
+        elif statement_type == "import_from_statement":
+            children = statement.get("children", [])
+            if not children:
+                continue
+            module = children[0].get("text", "")
+            for child in children[1:]:
+                if child.get("type") == "dotted_name":
+                    name = child.get("text", "")
+                    table.imports[name] = (module, name)
+                elif child.get("type") == "aliased_import":
+                    parts = child.get("children", [])
+                    if len(parts) == 2:
+                        table.imports[parts[1].get("text", "")] = (module, parts[0].get("text", ""))
+
+        elif statement_type == "import_statement":
+            for child in statement.get("children", []):
+                if child.get("type") == "dotted_name":
+                    name = child.get("text", "")
+                    table.imports[name] = (name, "*")
+    return table
+
+def build_js_symbol_table(ast_data):
+    """Builds the symbol table of a JavaScript/TypeScript AST from its top-level statements."""
+    table = SymbolTable()
+    if not isinstance(ast_data, dict):
+        return table
+
+    for statement in ast_data.get("children", []):
+        statement_type = statement.get("type")
+
+        if statement_type == "export_statement":
+            inner = statement.get("children", [])
+            # `export default config;` -> resolve `default.X` through `config.X`
+            if len(inner) == 1 and inner[0].get("type") == "identifier":
+                table.imports.setdefault("default", (None, inner[0].get("text", "")))
+                continue
+            statement = next((c for c in inner if c.get("type") in ("lexical_declaration", "variable_declaration")), {})
+            statement_type = statement.get("type")
+
+        if statement_type in ("lexical_declaration", "variable_declaration"):
+            for declarator in statement.get("children", []):
+                children = declarator.get("children", [])
+                if declarator.get("type") != "variable_declarator" or len(children) < 2:
+                    continue
+                name = children[0].get("text", "")
+                value = children[-1]
+                if value.get("type") == "object":
+                    for pair in value.get("children", []):
+                        pair_children = pair.get("children", [])
+                        if pair.get("type") == "pair" and len(pair_children) == 2:
+                            key = strip_quotes(pair_children[0].get("text", ""))
+                            table.add_constant(f"{name}.{key}", pair_children[1])
+                else:
+                    table.add_constant(name, value)
+
+        elif statement_type == "import_statement":
+            source = next((c for c in statement.get("children", []) if c.get("type") == "string"), None)
+            clause = next((c for c in statement.get("children", []) if c.get("type") == "import_clause"), None)
+            if not source or not clause:
+                continue
+            module = strip_quotes(source.get("text", ""))
+            for child in clause.get("children", []):
+                if child.get("type") == "identifier":
+                    table.imports[child.get("text", "")] = (module, "default")
+                elif child.get("type") == "namespace_import":
+                    alias = next((c for c in child.get("children", []) if c.get("type") == "identifier"), {})
+                    table.imports[alias.get("text", "")] = (module, "*")
+                elif child.get("type") == "named_imports":
+                    for specifier in child.get("children", []):
+                        names = [c.get("text", "") for c in specifier.get("children", []) if c.get("type") == "identifier"]
+                        if names:
+                            table.imports[names[-1]] = (module, names[0])
+    return table
+
+SYMBOL_TABLE_BUILDERS = {
+    'python': build_python_symbol_table,
+    'javascript': build_js_symbol_table,
+}
+
+# --- Import-resolved Cache Shared Across Files ---
+
+class SymbolCache:
+    """
+    Holds SymbolTables of AST files under root_dir. Tables of imported modules
+    are built lazily the first time one of their constants is needed and then
+    reused by every other file importing from them. Only the max_tables most
+    recently used tables (and import resolutions) are kept, so memory stays
+    bounded however many files a run streams through; an evicted table is
+    rebuilt from disk if it is needed again.
+    """
+    def __init__(self, root_dir, language, max_tables=4096):
+        self.root_dir = root_dir
+        self.language = language
+        self.build_table = SYMBOL_TABLE_BUILDERS[language]
+        self.max_tables = max_tables
+        self.tables = OrderedDict()        # relative AST path ('a/b.js.json') -> SymbolTable
+        self.module_files = OrderedDict()  # (importing file, specifier) -> relative AST path or None
+
+    def table_for(self, relative_path, ast_data=None):
+        """Returns the table of a file, building it from ast_data (or disk) on first use."""
+        relative_path = relative_path.replace("\\", "/")
+        table = self.tables.get(relative_path)
+        if table is None:
+            if ast_data is None:
+                ast_data = self.load_ast(relative_path)
+            table = self.build_table(ast_data)
+            self.remember(self.tables, relative_path, table)
+        else:
+            self.tables.move_to_end(relative_path)
+        return table
+
+    def remember(self, cache, key, value):
+        cache[key] = value
+        if len(cache) > self.max_tables:
+            cache.popitem(last=False)
+
+    def load_ast(self, relative_path):
+        try:
+            with open(os.path.join(self.root_dir, relative_path), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def exists(self, relative_path):
+        return os.path.isfile(os.path.join(self.root_dir, relative_path))
+
+    def module_file(self, importing_file, specifier):
+        """Maps an import specifier to the AST file of the imported module (memoized)."""
+        key = (importing_file, specifier)
+        if key in self.module_files:
+            self.module_files.move_to_end(key)
+            return self.module_files[key]
+        candidates = self.python_candidates(importing_file, specifier) if self.language == 'python' \
+            else self.js_candidates(importing_file, specifier)
+        module_file = next((c for c in candidates if self.exists(c)), None)
+        self.remember(self.module_files, key, module_file)
+        return module_file
+
+    def python_candidates(self, importing_file, module):
+        level = len(module) - len(module.lstrip('.'))
+        parts = [p for p in module.lstrip('.').split('.') if p]
+        if level:
+            base = os.path.dirname(importing_file).split('/') if os.path.dirname(importing_file) else []
+            base = base[:len(base) - (level - 1)] if level > 1 else base
+        else:
+            base = []
+        module_path = "/".join(base + parts)
+        return [f"{module_path}.py.json", f"{module_path}/__init__.py.json"]
+
+    def js_candidates(self, importing_file, specifier):
+        if specifier.startswith('.'):
+            module_path = os.path.normpath(os.path.join(os.path.dirname(importing_file), specifier)).replace("\\", "/")
+        elif specifier.startswith('@/'):
+            module_path = f"src/{specifier[2:]}"
+        else:
+            return []
+        candidates = [f"{module_path}.json"] if os.path.splitext(module_path)[1] in JS_EXTENSIONS else []
+        candidates += [f"{module_path}{ext}.json" for ext in JS_EXTENSIONS]
+        candidates += [f"{module_path}/index{ext}.json" for ext in JS_EXTENSIONS]
+        return candidates
+
+    def lookup(self, relative_path, name, depth=0):
+        """Resolves a (possibly dotted) constant name as seen from relative_path."""
+        table = self.table_for(relative_path)
+        if name in table.constants:
+            return table.constants[name]
+        if depth > 8:
+            return None
+
+        head, _, rest = name.partition('.')
+        imported = table.imports.get(head)
+        if not imported:
+            return None
+        module, imported_name = imported
+        if module is None:  # `export default <name>`
+            return self.lookup(relative_path, f"{imported_name}.{rest}" if rest else imported_name, depth + 1)
+
+        module_file = self.module_file(relative_path.replace("\\", "/"), module)
+        if not module_file:
+            return None
+        if imported_name == '*':
+            target = rest
+        else:
+            target = f"{imported_name}.{rest}" if rest else imported_name
+        return self.lookup(module_file, target, depth + 1) if target else None
+
+    def resolve(self, relative_path, expression):
+        """
+        Returns the string value an argument expression evaluates to, or the
+        expression itself (without quotes) if it cannot be resolved statically.
+        """
+        expression = expression.strip()
+        if is_string_literal(expression):
+            return strip_quotes(expression)
+        if expression.startswith('`') and expression.endswith('`'):
+            return TEMPLATE_SUBSTITUTION.sub(
+                lambda m: self.lookup(relative_path, m.group(1)) or m.group(0), expression[1:-1])
+        value = self.lookup(relative_path, expression)
+        return value if value is not None else expression.strip("'\"")
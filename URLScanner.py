@@ -0,0 +1,159 @@
+import re
+import ipaddress
+from functools import lru_cache
+from urllib.parse import urlsplit
+
+# --- Hardcoded URL and Secret Literal Scanner ---
+#
+# All patterns are compiled once at import time. The scanner only looks at the
+# leaf content nodes of string literals (string_content, string_fragment, ...),
+# so quotes and the enclosing expression text are never scanned and every
+# literal is visited exactly once. A literal with interpolations (f-strings,
+# template strings) is scanned whole, its URLs keeping the interpolation as
+# written; the secret patterns never see the interpolated expressions.
+
+URL_PATTERN = re.compile(r'https?://[^\s/$.?#].[^\s\'"`]*', re.IGNORECASE)
+
+# One alternation with a named group per secret kind, so each string is matched once.
+SECRET_PATTERNS = {
+    'aws_access_key': r'\b(?:AKIA|ASIA)[0-9A-Z]{16}\b',
+    'github_token': r'\bgh[pousr]_[A-Za-z0-9]{36,}\b',
+    'slack_token': r'\bxox[abprs]-[A-Za-z0-9-]{10,}',
+    'google_api_key': r'\bAIza[0-9A-Za-z_\-]{35}',
+    'stripe_secret_key': r'\b[sr]k_live_[0-9A-Za-z]{16,}',
+    'jwt': r'\beyJ[A-Za-z0-9_\-]{8,}\.eyJ[A-Za-z0-9_\-]{8,}\.[A-Za-z0-9_\-]{8,}',
+    'private_key': r'-----BEGIN (?:RSA |EC |DSA |OPENSSH )?PRIVATE KEY-----',
+}
+SECRET_PATTERN = re.compile('|'.join(f'(?P<{name}>{pattern})' for name, pattern in SECRET_PATTERNS.items()))
+# Shortest text any SECRET_PATTERNS entry can match (slack_token: 'xoxb-' and 10 more);
+# shorter strings skip the secret scan.
+SECRET_MIN_LENGTH = 15
+# Checked only on strings that already contain '://'.
+URL_CREDENTIALS_PATTERN = re.compile(r'[a-z][a-z0-9+.\-]*://[^\s/:@]+:[^\s/@]+@', re.IGNORECASE)
+
+# Leaf nodes holding the raw characters of a string literal, per tree-sitter grammar.
+STRING_CONTENT_TYPES = {'string_content', 'string_fragment', 'string_literal_content'}
+# String literal nodes that are scanned directly when the grammar gives them no content children.
+STRING_LITERAL_TYPES = {'string', 'template_string', 'string_literal', 'interpreted_string_literal', 'raw_string_literal'}
+# Interpolated expressions inside a literal (f-strings, template strings). A literal with any
+# of them is scanned whole, so a URL built around an interpolation is still found.
+SUBSTITUTION_TYPES = {'interpolation', 'template_substitution'}
+# Optional Python prefix and the quotes around a literal's text.
+QUOTED_TEXT = re.compile(r'[rRbBuUfF]{0,2}(\'\'\'|"""|\'|"|`)(.*)\1\Z', re.DOTALL)
+
+INTERNAL_HOST_SUFFIXES = ('.local', '.internal', '.intranet', '.corp', '.lan', '.home.arpa', '.svc', '.cluster.local')
+LOCALHOST_NAMES = {'localhost', 'localhost.localdomain', 'ip6-localhost'}
+
+# --- Host Classification ---
+
+@lru_cache(maxsize=4096)
+def classify_host(host):
+    """Classifies a host name as 'localhost', 'internal' or 'external'."""
+    host = (host or '').strip('[]').lower()
+    if not host or host in LOCALHOST_NAMES or host.endswith('.localhost'):
+        return 'localhost'
+    try:
+        address = ipaddress.ip_address(host)
+        if address.is_loopback or address.is_unspecified:
+            return 'localhost'
+        return 'internal' if address.is_private or address.is_link_local else 'external'
+    except ValueError:
+        pass
+    if '.' not in host or host.endswith(INTERNAL_HOST_SUFFIXES):
+        return 'internal'
+    return 'external'
+
+def classify_url(url):
+    """Returns (host, scope) for a URL found in source code."""
+    try:
+        host = urlsplit(url).hostname or ''
+    except ValueError:
+        host = ''
+    return host, classify_host(host)
+
+# --- Scanning ---
+
+def unquote(text):
+    match = QUOTED_TEXT.match(text)
+    return match.group(2) if match else text.strip('\'"`')
+
+def literal_texts(literal):
+    """
+    (text, text without substitutions) of a string literal scanned whole, or None if
+    its content children are scanned instead.
+    """
+    children = literal.get('children') or []
+    substitutions = [child.get('text', '') for child in children if child.get('type') in SUBSTITUTION_TYPES]
+    if not substitutions and any(child.get('type') in STRING_CONTENT_TYPES for child in children):
+        return None
+    text = unquote(literal.get('text', ''))
+    plain = text
+    for substitution in substitutions:
+        plain = plain.replace(substitution, '')
+    return text, plain
+
+def collect_string_contents(node):
+    """
+    Iteratively collects the (text, text without substitutions) of every leaf string
+    content node in an AST, in source order. Literals with substitutions or without
+    content children are collected whole instead. Subtrees whose text contains no
+    quote character cannot hold a string literal and are skipped without visiting
+    their children.
+    """
+    contents = []
+    stack = list(node) if isinstance(node, list) else [node]
+    pop, extend, append = stack.pop, stack.extend, contents.append
+    while stack:
+        current = pop()
+        node_type = current.get('type')
+        if node_type in STRING_CONTENT_TYPES:
+            text = current.get('text', '')
+            append((text, text))
+            continue
+        if node_type in STRING_LITERAL_TYPES:
+            texts = literal_texts(current)
+            if texts is not None:
+                append(texts)
+                continue
+        children = current.get('children')
+        if children:
+            text = current.get('text', '')
+            if '"' in text or "'" in text or '`' in text:
+                extend(children)
+    # Children are pushed in order and popped last-first, so the result is reversed source order.
+    contents.reverse()
+    return contents
+
+def scan_text(text, urls, secrets, secret_text=None):
+    """
+    Adds the URLs and secret kinds found in one string to the given lists. URLs keep
+    any interpolation as written; secret_text (text without its interpolated
+    expressions, by default text itself) is what the secret patterns see.
+    """
+    if secret_text is None:
+        secret_text = text
+    if '://' in text:
+        urls.extend(URL_PATTERN.findall(text))
+        if '@' in secret_text and URL_CREDENTIALS_PATTERN.search(secret_text):
+            secrets.append('url_credentials')
+    if len(secret_text) >= SECRET_MIN_LENGTH:
+        for match in SECRET_PATTERN.finditer(secret_text):
+            secrets.append(match.lastgroup)
+
+def scan_ast(ast_data):
+    """
+    Scans every string literal of an AST once.
+
+    Returns:
+        dict: {'urls': [{'url', 'host', 'scope'}], 'secrets': [kind, ...]}, de-duplicated,
+        in order of first appearance.
+    """
+    urls, secrets = [], []
+    for text, secret_text in collect_string_contents(ast_data):
+        scan_text(text, urls, secrets, secret_text)
+
+    url_findings = []
+    for url in dict.fromkeys(urls):
+        host, scope = classify_url(url)
+        url_findings.append({'url': url, 'host': host, 'scope': scope})
+    return {'urls': url_findings, 'secrets': list(dict.fromkeys(secrets))}
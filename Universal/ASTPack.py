@@ -0,0 +1,178 @@
+# Packfile output: every AST of a project in one append-only archive.
+#
+# UniversalAST.py writes it with '--pack ast.pack' instead of one JSON file per
+# source file. Layout:
+#
+#    b"ASTPACK1" or b"ASTPACKB"                   magic: JSON or binary records
+#    <record> <record> ...                         appended in parse order
+#    index entries, one per record:                '<QIH' offset, length, path length, then the UTF-8 path
+#    '<QI' index offset, entry count, b"ASTINDEX"  fixed-size footer
+#
+# Readers mmap the file, read the index once from the footer and slice any
+# file's AST out by its relative path without touching the directory tree.
+# Identical files share one record: their index entries hold the same offset.
+# JSON records are compact node_to_dict output; binary records (see ASTView.py)
+# are never decoded as a whole: load() returns a lazy NodeView over the mapping.
+#    python ASTPack.py list ast.pack
+#    python ASTPack.py cat ast.pack api/routes.py
+
+import json
+import mmap
+import os
+import struct
+import sys
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+import ASTView
+from ASTView import NodeView
+
+MAGIC = b"ASTPACK1"
+BINARY_MAGIC = b"ASTPACKB"
+FOOTER_MAGIC = b"ASTINDEX"
+ENTRY = struct.Struct('<QIH')
+FOOTER = struct.Struct('<QI8s')
+
+def encode_ast(ast: Dict[str, Any]) -> bytes:
+    return json.dumps(ast, separators=(',', ':')).encode('utf-8')
+
+# --- Writing ---
+
+class ASTPackWriter:
+    """Appends records to a fresh pack next to pack_path and moves it into place on close()."""
+    def __init__(self, pack_path: str, binary: bool = False):
+        self.pack_path = pack_path
+        self.temp_path = pack_path + ".tmp"
+        self.binary = binary
+        self.f = open(self.temp_path, 'wb')
+        self.f.write(BINARY_MAGIC if binary else MAGIC)
+        self.offset = len(MAGIC)
+        self.entries: Dict[str, Tuple[int, int]] = {}
+
+    def add(self, path: str, data: bytes):
+        """Appends one serialized AST. A path added twice resolves to its latest record."""
+        self.f.write(data)
+        self.entries[path] = (self.offset, len(data))
+        self.offset += len(data)
+        if self.binary and self.offset % 8:
+            # Keeps every binary record's integer columns aligned in the mapping
+            padding = 8 - self.offset % 8
+            self.f.write(b"\0" * padding)
+            self.offset += padding
+
+    def add_copy(self, path: str, existing_path: str):
+        """Indexes path to the record of an identical, already added file; nothing is written."""
+        self.entries[path] = self.entries[existing_path]
+
+    def add_ast(self, path: str, ast: Dict[str, Any]):
+        self.add(path, ASTView.encode_ast(ast) if self.binary else encode_ast(ast))
+
+    def add_tree(self, path: str, source: bytes, root_node):
+        """Adds a tree-sitter tree directly. Binary packs only: JSON records need node_to_dict."""
+        self.add(path, ASTView.encode_tree(source, root_node))
+
+    def close(self):
+        index_offset = self.offset
+        try:
+            for path, (offset, length) in self.entries.items():
+                encoded = path.encode('utf-8')
+                self.f.write(ENTRY.pack(offset, length, len(encoded)))
+                self.f.write(encoded)
+            self.f.write(FOOTER.pack(index_offset, len(self.entries), FOOTER_MAGIC))
+        finally:
+            self.f.close()
+        os.replace(self.temp_path, self.pack_path)
+        print(f"✅ AST pack ({len(self.entries)} files, {len(set(self.entries.values()))} unique, {index_offset} bytes of ASTs) saved to: {self.pack_path}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.f.close()
+
+# --- Reading ---
+
+class ASTPack:
+    """A memory-mapped pack. Records are sliced out of the mapping on demand."""
+    def __init__(self, pack_path: str):
+        with open(pack_path, 'rb') as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if os.fstat(f.fileno()).st_size else b""
+        if len(self.data) < len(MAGIC) + FOOTER.size or self.data[:len(MAGIC)] not in (MAGIC, BINARY_MAGIC):
+            raise ValueError(f"{pack_path} is not an AST pack")
+        self.binary = self.data[:len(MAGIC)] == BINARY_MAGIC
+        index_offset, count, footer_magic = FOOTER.unpack_from(self.data, len(self.data) - FOOTER.size)
+        if footer_magic != FOOTER_MAGIC:
+            raise ValueError(f"{pack_path} has no index (was it written completely?)")
+
+        self.entries: Dict[str, Tuple[int, int]] = {}
+        position = index_offset
+        for _ in range(count):
+            offset, length, path_length = ENTRY.unpack_from(self.data, position)
+            position += ENTRY.size
+            self.entries[bytes(self.data[position:position + path_length]).decode('utf-8')] = (offset, length)
+            position += path_length
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            try:
+                self.data.close()
+            except BufferError:
+                # NodeViews still reference the mapping; it is unmapped once they are released
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __contains__(self, path: str) -> bool:
+        return path in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def paths(self) -> List[str]:
+        return list(self.entries)
+
+    def raw(self, path: str) -> memoryview:
+        """The serialized AST of one file, as a view into the mapping (no copy)."""
+        offset, length = self.entries[path]
+        return memoryview(self.data)[offset:offset + length]
+
+    def load(self, path: str) -> Union[Dict[str, Any], NodeView]:
+        """The AST of one file: a dict for JSON packs, a lazy root NodeView for binary packs."""
+        if self.binary:
+            return ASTView.load_view(self.raw(path))
+        return json.loads(self.raw(path).tobytes())
+
+    def iter_asts(self, suffixes: Optional[Tuple[str, ...]] = None) -> Iterator[Tuple[str, Union[Dict[str, Any], NodeView]]]:
+        """Yields (path, AST) in archive order, optionally only for paths ending with one of suffixes."""
+        for path in self.entries:
+            if suffixes is None or path.endswith(suffixes):
+                yield path, self.load(path)
+
+def is_pack(path: str) -> bool:
+    if not os.path.isfile(path):
+        return False
+    with open(path, 'rb') as f:
+        return f.read(len(MAGIC)) in (MAGIC, BINARY_MAGIC)
+
+# --- Main Execution ---
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "list":
+        with ASTPack(sys.argv[2]) as pack:
+            for path, (offset, length) in pack.entries.items():
+                print(f"{offset:>12} {length:>10}  {path}")
+    elif len(sys.argv) == 4 and sys.argv[1] == "cat":
+        with ASTPack(sys.argv[2]) as pack:
+            if sys.argv[3] not in pack:
+                print(f"Error: {sys.argv[3]} is not in the pack.", file=sys.stderr)
+            else:
+                ast = pack.load(sys.argv[3])
+                print(json.dumps(ast.to_dict() if pack.binary else ast, indent=2))
+    else:
+        print("Usage: python ASTPack.py list <ast.pack>")
+        print("       python ASTPack.py cat <ast.pack> <relative-path>")
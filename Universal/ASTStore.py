@@ -0,0 +1,354 @@
+# SQLite-backed AST store: every parsed file, its source and its nodes in one database.
+#
+# UniversalAST.py and GenerateAST.py write it with '--store ast.db' instead of one
+# JSON file per source file. Nodes are stored flat, in pre-order, with their byte
+# span into the file's source (so node text is never duplicated) and the id of
+# their last descendant (so a subtree is the id range [id, last]). Identical
+# files share one 'contents' row (keyed by language and git blob id) and its
+# nodes; 'copies' counts the paths referring to it, and counts are weighted by
+# it. Indexes on (content, type) and (type) let analyzers fetch every node of a
+# type without deserializing whole trees:
+#    python ASTStore.py query ast.db decorator --text .route
+#
+# ASTs already written as JSON can be imported into a store:
+#    python ASTStore.py import ast.db ./Project_AST_Output
+
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE contents (id INTEGER PRIMARY KEY, blob TEXT NOT NULL, source BLOB NOT NULL, root INTEGER NOT NULL, copies INTEGER NOT NULL);
+CREATE TABLE files (id INTEGER PRIMARY KEY, path TEXT NOT NULL UNIQUE, language TEXT, content INTEGER NOT NULL);
+CREATE TABLE node_types (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+CREATE TABLE nodes (id INTEGER PRIMARY KEY, content INTEGER NOT NULL, parent INTEGER, last INTEGER NOT NULL, type INTEGER NOT NULL,
+                    start_byte INTEGER NOT NULL, end_byte INTEGER NOT NULL,
+                    start_row INTEGER NOT NULL, start_col INTEGER NOT NULL, end_row INTEGER NOT NULL, end_col INTEGER NOT NULL);
+"""
+# Created after the bulk insert, which is much faster than maintaining them row by row.
+INDEXES = """
+CREATE INDEX nodes_content_type ON nodes (content, type);
+CREATE INDEX nodes_type ON nodes (type);
+CREATE INDEX files_content ON files (content);
+"""
+NODE_COLUMNS = "id, parent, type, start_byte, end_byte, start_row, start_col, end_row, end_col"
+
+# Used only to label files imported from JSON; the generators pass their own language key.
+EXTENSION_LANGUAGES = {
+    '.py': 'python', '.java': 'java', '.js': 'javascript', '.jsx': 'javascript',
+    '.ts': 'typescript', '.tsx': 'tsx', '.go': 'go', '.cs': 'c_sharp',
+}
+
+# --- Writing ---
+
+def blob_id(source: bytes) -> str:
+    """The git blob id of a file's content, so stores and caches agree with 'git hash-object'."""
+    return hashlib.sha1(b"blob %d\0" % len(source) + source).hexdigest()
+
+def line_offsets(source: bytes) -> List[int]:
+    offsets = [0]
+    position = source.find(b"\n")
+    while position != -1:
+        offsets.append(position + 1)
+        position = source.find(b"\n", position + 1)
+    return offsets
+
+def flatten_tree(root_node, type_id: Callable[[str], int]) -> List[list]:
+    """
+    The named nodes of a tree-sitter tree in pre-order, as rows
+    [parent index, type id, start_byte, end_byte, start_row, start_col, end_row, end_col].
+    """
+    rows = []
+    stack = [(root_node, None)]
+    while stack:
+        node, parent = stack.pop()
+        rows.append([parent, type_id(node.type), node.start_byte, node.end_byte,
+                     node.start_point[0], node.start_point[1], node.end_point[0], node.end_point[1]])
+        index = len(rows) - 1
+        stack.extend((child, index) for child in reversed(node.named_children))
+    return rows
+
+def flatten_ast(ast: Dict[str, Any], type_id: Callable[[str], int]) -> Tuple[bytes, List[list]]:
+    """Like flatten_tree for an AST dict written by node_to_dict. Its root text stands in for the source."""
+    source = ast.get('text', '').encode('utf-8')
+    offsets = line_offsets(source)
+    root_row, root_column = ast['startPosition']['row'], ast['startPosition']['column']
+
+    def byte_offset(position: Dict[str, int]) -> int:
+        row = position['row'] - root_row
+        return offsets[row] + position['column'] - (root_column if row == 0 else 0)
+
+    rows = []
+    stack = [(ast, None)]
+    while stack:
+        node, parent = stack.pop()
+        start, end = node['startPosition'], node['endPosition']
+        rows.append([parent, type_id(node['type']), byte_offset(start), byte_offset(end),
+                     start['row'], start['column'], end['row'], end['column']])
+        index = len(rows) - 1
+        stack.extend((child, index) for child in reversed(node.get('children', [])))
+    return source, rows
+
+def last_descendants(rows: List[list]) -> List[int]:
+    """Index of the last descendant of every row; a node's subtree is rows[i:last[i] + 1]."""
+    last = list(range(len(rows)))
+    # Children follow their parent in pre-order, so one reverse pass suffices
+    for i in range(len(rows) - 1, 0, -1):
+        parent = rows[i][0]
+        if last[i] > last[parent]:
+            last[parent] = last[i]
+    return last
+
+class ASTStoreWriter:
+    """Builds a fresh store next to db_path and moves it into place on close()."""
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.temp_path = db_path + ".tmp"
+        if os.path.exists(self.temp_path):
+            os.remove(self.temp_path)
+        self.connection = sqlite3.connect(self.temp_path)
+        self.connection.executescript("PRAGMA journal_mode=OFF; PRAGMA synchronous=OFF;" + SCHEMA)
+        self.type_ids: Dict[str, int] = {}
+        self.next_node_id = 1
+        self.file_count = 0
+        self.content_ids: Dict[Tuple[Optional[str], str], int] = {}     # (language, blob id) -> content
+        self.file_contents: Dict[str, int] = {}                        # path -> content
+
+    def type_id(self, node_type: str) -> int:
+        if node_type not in self.type_ids:
+            self.type_ids[node_type] = len(self.type_ids) + 1
+            self.connection.execute("INSERT INTO node_types VALUES (?, ?)", (self.type_ids[node_type], node_type))
+        return self.type_ids[node_type]
+
+    def add_file(self, path: str, language: Optional[str], source: bytes, rows: List[list], blob: Optional[str] = None):
+        """Inserts a file with new content and its pre-order node rows (see flatten_tree)."""
+        blob = blob or blob_id(source)
+        first = self.next_node_id
+        content_id = self.connection.execute("INSERT INTO contents (blob, source, root, copies) VALUES (?, ?, ?, 0)",
+                                             (blob, source, first)).lastrowid
+        last = last_descendants(rows)
+        self.connection.executemany("INSERT INTO nodes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                    ((first + i, content_id, None if parent is None else first + parent, first + last[i], *fields)
+                                     for i, (parent, *fields) in enumerate(rows)))
+        self.next_node_id += len(rows)
+        self.content_ids[(language, blob)] = content_id
+        self.add_reference(path, language, content_id)
+
+    def add_reference(self, path: str, language: Optional[str], content_id: int):
+        self.connection.execute("INSERT INTO files (path, language, content) VALUES (?, ?, ?)", (path, language, content_id))
+        self.connection.execute("UPDATE contents SET copies = copies + 1 WHERE id = ?", (content_id,))
+        self.file_contents[path] = content_id
+        self.file_count += 1
+
+    def add_copy(self, path: str, language: Optional[str], existing_path: str):
+        """Adds a path whose content is identical to an already stored file's; nothing is re-stored."""
+        self.add_reference(path, language, self.file_contents[existing_path])
+
+    def add_tree(self, path: str, language: Optional[str], source: bytes, root_node):
+        """Stores a tree-sitter tree with the same named nodes node_to_dict would serialize."""
+        blob = blob_id(source)
+        if (language, blob) in self.content_ids:
+            self.add_reference(path, language, self.content_ids[(language, blob)])
+        else:
+            self.add_file(path, language, source, flatten_tree(root_node, self.type_id), blob)
+
+    def add_ast(self, path: str, language: Optional[str], ast: Dict[str, Any]):
+        """Stores an AST dict as written by node_to_dict. Its root text becomes the file's source."""
+        blob = blob_id(ast.get('text', '').encode('utf-8'))
+        if (language, blob) in self.content_ids:
+            self.add_reference(path, language, self.content_ids[(language, blob)])
+            return
+        source, rows = flatten_ast(ast, self.type_id)
+        self.add_file(path, language, source, rows, blob)
+
+    def close(self):
+        try:
+            self.connection.executescript(INDEXES)
+            self.connection.commit()
+        finally:
+            self.connection.close()
+        os.replace(self.temp_path, self.db_path)
+        print(f"✅ AST store ({self.file_count} files, {len(self.content_ids)} unique, {self.next_node_id - 1} nodes) saved to: {self.db_path}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.connection.close()
+
+# --- Reading ---
+
+class ASTStore:
+    """Read-only queries over a store. Nodes are returned as node_to_dict-style dicts."""
+    def __init__(self, db_path: str):
+        if not os.path.isfile(db_path):
+            raise FileNotFoundError(f"AST store not found: {db_path}")
+        self.connection = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        self.type_ids: Dict[str, int] = dict(self.connection.execute("SELECT name, id FROM node_types"))
+        self.type_names: Dict[int, str] = {tid: name for name, tid in self.type_ids.items()}
+        self.content_paths: Optional[Dict[int, List[str]]] = None
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @staticmethod
+    def file_scope(language: Optional[str] = None, path: Optional[str] = None) -> Tuple[str, list]:
+        """SQL condition (on nodes aliased 'n') restricting a query to one language and/or file."""
+        if path is not None:
+            return " AND n.content = (SELECT content FROM files WHERE path = ?)", [path]
+        if language is not None:
+            return " AND n.content IN (SELECT content FROM files WHERE language = ?)", [language]
+        return "", []
+
+    def paths_of(self, content_id: int) -> List[str]:
+        """Every path sharing one stored content."""
+        if self.content_paths is None:
+            self.content_paths = {}
+            for content, path in self.connection.execute("SELECT content, path FROM files ORDER BY id"):
+                self.content_paths.setdefault(content, []).append(path)
+        return self.content_paths.get(content_id, [])
+
+    def iter_files(self, language: Optional[str] = None) -> Iterator[Tuple[str, Optional[str]]]:
+        """Yields (path, language) for every stored file."""
+        if language is None:
+            yield from self.connection.execute("SELECT path, language FROM files ORDER BY id")
+        else:
+            yield from self.connection.execute("SELECT path, language FROM files WHERE language = ? ORDER BY id", (language,))
+
+    def root_spans(self, language: Optional[str] = None) -> Iterator[Tuple[str, int, int]]:
+        """Yields (path, start row, end row) of every file's root node."""
+        query = ("SELECT f.path, n.start_row, n.end_row FROM files f JOIN contents c ON c.id = f.content "
+                 "JOIN nodes n ON n.id = c.root")
+        if language is None:
+            yield from self.connection.execute(query + " ORDER BY f.id")
+        else:
+            yield from self.connection.execute(query + " WHERE f.language = ? ORDER BY f.id", (language,))
+
+    def count_nodes(self, node_type: str, language: Optional[str] = None) -> int:
+        if node_type not in self.type_ids:
+            return 0
+        scope, params = self.file_scope(language)
+        return self.connection.execute("SELECT coalesce(sum(c.copies), 0) FROM nodes n JOIN contents c ON c.id = n.content WHERE n.type = ?" + scope,
+                                       [self.type_ids[node_type]] + params).fetchone()[0]
+
+    def count_descendants(self, ancestor_type: str, node_type: str, language: Optional[str] = None) -> int:
+        """Sum over all nodes of ancestor_type of the nodes of node_type in their subtree (themselves included)."""
+        if ancestor_type not in self.type_ids or node_type not in self.type_ids:
+            return 0
+        scope, params = self.file_scope(language)
+        return self.connection.execute(
+            "SELECT coalesce(sum(c.copies), 0) FROM nodes n JOIN contents c ON c.id = n.content JOIN nodes d ON d.id BETWEEN n.id AND n.last "
+            "WHERE n.type = ? AND d.type = ?" + scope,
+            [self.type_ids[ancestor_type], self.type_ids[node_type]] + params).fetchone()[0]
+
+    def nodes_of_type(self, node_type: str, text_contains: Optional[str] = None,
+                      language: Optional[str] = None, path: Optional[str] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Yields (file path, node with its subtree) for every node of node_type,
+        optionally containing a substring. A node of content shared by several
+        paths is built once and yielded for each of them.
+        """
+        if node_type not in self.type_ids:
+            return
+        scope, params = self.file_scope(language, path)
+        query = ("SELECT n.id, n.last, n.content, n.start_byte, n.end_byte FROM nodes n JOIN contents c ON c.id = n.content "
+                 "WHERE n.type = ?" + scope)
+        params = [self.type_ids[node_type]] + params
+        if text_contains is not None:
+            # Byte-wise search in the node's span of the source blob
+            query += " AND instr(substr(c.source, n.start_byte + 1, n.end_byte - n.start_byte), ?) > 0"
+            params.append(text_contains.encode('utf-8'))
+        for node_id, last, content_id, start_byte, end_byte in self.connection.execute(query + " ORDER BY n.id", params).fetchall():
+            node = self.subtree(node_id, last, content_id, start_byte, end_byte)
+            for file_path in ([path] if path is not None else self.paths_of(content_id)):
+                yield file_path, node
+
+    def subtree(self, node_id: int, last: int, content_id: int, start_byte: int, end_byte: int) -> Dict[str, Any]:
+        """Rebuilds the dict of one node and its descendants from the id range [node_id, last]."""
+        source = self.connection.execute("SELECT substr(source, ?, ?) FROM contents WHERE id = ?",
+                                         (start_byte + 1, end_byte - start_byte, content_id)).fetchone()[0]
+        built: Dict[int, Dict[str, Any]] = {}
+        root = None
+        for nid, parent, tid, start, end, start_row, start_col, end_row, end_col in self.connection.execute(
+                f"SELECT {NODE_COLUMNS} FROM nodes WHERE id BETWEEN ? AND ? ORDER BY id", (node_id, last)):
+            node = {
+                'type': self.type_names[tid],
+                'text': source[start - start_byte:end - start_byte].decode('utf8'),
+                'startPosition': {'row': start_row, 'column': start_col},
+                'endPosition': {'row': end_row, 'column': end_col},
+                'children': [],
+            }
+            built[nid] = node
+            if nid == node_id:
+                root = node
+            else:
+                built[parent]['children'].append(node)
+        return root
+
+    def load_tree(self, path: str) -> Optional[Dict[str, Any]]:
+        """The whole AST of one file, as node_to_dict would have serialized it."""
+        row = self.connection.execute(
+            "SELECT n.id, n.last, n.content, n.start_byte, n.end_byte FROM files f JOIN contents c ON c.id = f.content "
+            "JOIN nodes n ON n.id = c.root WHERE f.path = ?", (path,)).fetchone()
+        return self.subtree(*row) if row else None
+
+# --- Import ---
+
+def import_json_asts(db_path: str, ast_dirs: Iterable[str]):
+    """Builds a store from directories of '<relative path>.json' AST files."""
+    with ASTStoreWriter(db_path) as writer:
+        for ast_dir in ast_dirs:
+            for root, _, files in os.walk(ast_dir):
+                for file in sorted(files):
+                    if not file.endswith('.json'):
+                        continue
+                    full_path = os.path.join(root, file)
+                    path = os.path.relpath(full_path, ast_dir)[:-len('.json')].replace("\\", "/")
+                    try:
+                        with open(full_path, 'r', encoding='utf-8') as f:
+                            ast = json.load(f)
+                        writer.add_ast(path, EXTENSION_LANGUAGES.get(os.path.splitext(path)[1]), ast)
+                    except (ValueError, KeyError, TypeError, sqlite3.IntegrityError) as e:
+                        print(f"[FAILED] Could not import {full_path}. Reason: {e}")
+
+# --- Main Execution ---
+
+def query(db_path: str, node_type: str, text_contains: Optional[str] = None, language: Optional[str] = None):
+    started = time.perf_counter()
+    with ASTStore(db_path) as store:
+        matches = list(store.nodes_of_type(node_type, text_contains, language))
+    elapsed = (time.perf_counter() - started) * 1000
+    for path, node in matches:
+        first_line = node['text'].split("\n", 1)[0]
+        print(f"{path}:{node['startPosition']['row'] + 1}: {first_line}")
+    print(f"\n{len(matches)} '{node_type}' nodes in {elapsed:.1f} ms")
+
+def option(args: List[str], name: str) -> Optional[str]:
+    if name in args and args.index(name) + 1 < len(args):
+        return args[args.index(name) + 1]
+    return None
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 4 and sys.argv[1] == "import":
+        import_json_asts(sys.argv[2], sys.argv[3:])
+    elif len(sys.argv) >= 4 and sys.argv[1] == "query":
+        try:
+            query(sys.argv[2], sys.argv[3], option(sys.argv, "--text"), option(sys.argv, "--language"))
+        except FileNotFoundError as e:
+            print(f"Error: {e}", file=sys.stderr)
+    else:
+        print("Usage: python ASTStore.py import <ast.db> <ast-dir>...")
+        print("       python ASTStore.py query <ast.db> <node-type> [--text substring] [--language python]")
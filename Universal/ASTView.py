@@ -0,0 +1,254 @@
+# Compact AST node representations that stand in for node_to_dict dicts.
+#
+# ASTNode is what load_ast_file builds from a JSON AST: one __slots__ object
+# per node with an interned type and plain integer positions, instead of a
+# dict plus two position dicts.
+#
+# Binary AST records and lazy, zero-copy node views over them:
+# A record holds one file: a small header, the file's node type names, one
+# column of 32-bit integers per node field (type, last descendant, byte span,
+# start/end row and column) in pre-order, and the source bytes. Nothing is
+# decoded up front: BinaryAST casts its columns straight out of the buffer
+# (usually an mmap of an ASTPack) and a NodeView is just (tree, index), reading a
+# field only when it is accessed. A node's subtree is the index range
+# [index, last[index]], so find_all scans one integer column instead of walking
+# dicts.
+#
+# Both classes mirror the node_to_dict keys through get() and item access, so
+# selector code written for dicts works on them unchanged.
+
+import json
+import struct
+import sys
+from array import array
+from typing import Any, Dict, Iterator, List, TextIO, Union
+
+from ASTStore import flatten_ast, flatten_tree, last_descendants
+
+RECORD_MAGIC = b"ASTB"
+HEADER = struct.Struct('<4sIII')       # magic, node count, type table size, source size
+COLUMNS = ('types', 'last', 'start_byte', 'end_byte', 'start_row', 'start_col', 'end_row', 'end_col')
+FIELDS = frozenset(('type', 'text', 'startPosition', 'endPosition', 'children'))
+
+# --- Compact Nodes ---
+
+class ASTNode:
+    """A node_to_dict node stored in slots; positions are kept as plain integers."""
+    __slots__ = ('type', 'text', 'children', 'start_row', 'start_col', 'end_row', 'end_col')
+
+    def __init__(self, node_type: str, text: str, children: List["ASTNode"],
+                 start_row: int, start_col: int, end_row: int, end_col: int):
+        self.type = node_type
+        self.text = text
+        self.children = children
+        self.start_row = start_row
+        self.start_col = start_col
+        self.end_row = end_row
+        self.end_col = end_col
+
+    @property
+    def startPosition(self) -> Dict[str, int]:
+        return {'row': self.start_row, 'column': self.start_col}
+
+    @property
+    def endPosition(self) -> Dict[str, int]:
+        return {'row': self.end_row, 'column': self.end_col}
+
+    def find_all(self, node_type: str) -> List["ASTNode"]:
+        """This node and its descendants of node_type, in pre-order."""
+        found = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node.type == node_type:
+                found.append(node)
+            stack.extend(reversed(node.children))
+        return found
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in FIELDS else default
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in FIELDS
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'type': self.type,
+            'text': self.text,
+            'startPosition': self.startPosition,
+            'endPosition': self.endPosition,
+            'children': [child.to_dict() for child in self.children],
+        }
+
+    def __repr__(self) -> str:
+        return f"<ASTNode {self.type} {self.start_row}:{self.start_col}>"
+
+NO_POSITION = {'row': 0, 'column': 0}
+
+def compact_node(obj: Dict[str, Any]) -> Any:
+    """json object_hook: turns every node dict into an ASTNode (position dicts pass through and are dropped)."""
+    if 'type' not in obj:
+        return obj
+    start, end = obj.get('startPosition') or NO_POSITION, obj.get('endPosition') or NO_POSITION
+    return ASTNode(sys.intern(obj['type']), obj.get('text', ''), obj.get('children', []),
+                   start['row'], start['column'], end['row'], end['column'])
+
+def load_ast_json(f: TextIO) -> ASTNode:
+    return json.load(f, object_hook=compact_node)
+
+def load_ast_file(path: str) -> ASTNode:
+    """Loads a JSON AST file as ASTNodes."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return load_ast_json(f)
+
+# --- Encoding ---
+
+def encode_rows(source: bytes, rows: List[list], type_names: List[str]) -> bytes:
+    """Packs flatten_tree/flatten_ast rows (type ids indexing type_names) into one record."""
+    type_table = "\0".join(type_names).encode('utf-8')
+    type_table += b"\0" * (-len(type_table) % 4)
+    last = last_descendants(rows)
+    columns = [array('I', (row[1] for row in rows)), array('I', last)]
+    columns.extend(array('I', (row[field] for row in rows)) for field in range(2, 8))
+    parts = [HEADER.pack(RECORD_MAGIC, len(rows), len(type_table), len(source)), type_table]
+    for column in columns:
+        if sys.byteorder != 'little':
+            column.byteswap()
+        parts.append(column.tobytes())
+    parts.append(source)
+    return b"".join(parts)
+
+def type_interner(type_names: List[str]):
+    type_ids: Dict[str, int] = {}
+
+    def type_id(node_type: str) -> int:
+        if node_type not in type_ids:
+            type_ids[node_type] = len(type_names)
+            type_names.append(node_type)
+        return type_ids[node_type]
+    return type_id
+
+def encode_tree(source: bytes, root_node) -> bytes:
+    """A record for a tree-sitter tree, with the named nodes node_to_dict would serialize."""
+    type_names: List[str] = []
+    rows = flatten_tree(root_node, type_interner(type_names))
+    return encode_rows(source, rows, type_names)
+
+def encode_ast(ast: Dict[str, Any]) -> bytes:
+    """A record for an AST dict written by node_to_dict."""
+    type_names: List[str] = []
+    source, rows = flatten_ast(ast, type_interner(type_names))
+    return encode_rows(source, rows, type_names)
+
+# --- Views ---
+
+class BinaryAST:
+    """One decoded record header with its columns cast (not copied) from the buffer."""
+    __slots__ = ('type_names', 'type_ids', 'source') + COLUMNS
+
+    def __init__(self, buffer: Union[bytes, memoryview]):
+        buffer = memoryview(buffer)
+        magic, count, type_table_size, source_size = HEADER.unpack_from(buffer)
+        if magic != RECORD_MAGIC:
+            raise ValueError("not a binary AST record")
+        position = HEADER.size
+        self.type_names = bytes(buffer[position:position + type_table_size]).rstrip(b"\0").decode('utf-8').split("\0")
+        self.type_ids = {name: tid for tid, name in enumerate(self.type_names)}
+        position += type_table_size
+        for name in COLUMNS:
+            column = buffer[position:position + 4 * count]
+            if sys.byteorder == 'little':
+                column = column.cast('I')
+            else:
+                column = array('I', column.tobytes())
+                column.byteswap()
+            setattr(self, name, column)
+            position += 4 * count
+        self.source = buffer[position:position + source_size]
+
+    @property
+    def root(self) -> "NodeView":
+        return NodeView(self, 0)
+
+class NodeView:
+    """A node of a BinaryAST. Every field is read from the record when accessed."""
+    __slots__ = ('tree', 'index')
+
+    def __init__(self, tree: BinaryAST, index: int):
+        self.tree = tree
+        self.index = index
+
+    @property
+    def type(self) -> str:
+        return self.tree.type_names[self.tree.types[self.index]]
+
+    @property
+    def text(self) -> str:
+        tree = self.tree
+        return tree.source[tree.start_byte[self.index]:tree.end_byte[self.index]].tobytes().decode('utf8')
+
+    @property
+    def startPosition(self) -> Dict[str, int]:
+        return {'row': self.tree.start_row[self.index], 'column': self.tree.start_col[self.index]}
+
+    @property
+    def endPosition(self) -> Dict[str, int]:
+        return {'row': self.tree.end_row[self.index], 'column': self.tree.end_col[self.index]}
+
+    @property
+    def children(self) -> List["NodeView"]:
+        return list(self.iter_children())
+
+    def iter_children(self) -> Iterator["NodeView"]:
+        tree = self.tree
+        last = tree.last
+        child, end = self.index + 1, last[self.index]
+        while child <= end:
+            yield NodeView(tree, child)
+            child = last[child] + 1
+
+    def find_all(self, node_type: str) -> List["NodeView"]:
+        """This node and its descendants of node_type, in pre-order, by scanning the type column."""
+        tree = self.tree
+        tid = tree.type_ids.get(node_type)
+        if tid is None:
+            return []
+        start = self.index
+        return [NodeView(tree, start + offset)
+                for offset, t in enumerate(tree.types[start:tree.last[start] + 1]) if t == tid]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in FIELDS else default
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in FIELDS
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Materializes this subtree as node_to_dict would have serialized it."""
+        return {
+            'type': self.type,
+            'text': self.text,
+            'startPosition': self.startPosition,
+            'endPosition': self.endPosition,
+            'children': [child.to_dict() for child in self.iter_children()],
+        }
+
+    def __repr__(self) -> str:
+        return f"<NodeView {self.type} {self.tree.start_row[self.index]}:{self.tree.start_col[self.index]}>"
+
+def load_view(buffer: Union[bytes, memoryview]) -> NodeView:
+    return BinaryAST(buffer).root
+
+def is_node(value: Any) -> bool:
+    """True for an AST node: a node_to_dict dict, an ASTNode or a NodeView."""
+    return isinstance(value, (dict, ASTNode, NodeView))
@@ -0,0 +1,327 @@
+# To run this script:
+# 1. First, generate the ASTs for a project using 'UniversalAST.py'.
+# 2. Execute from your terminal:
+#    python CallGraph.py ./PythonAST call_graph.dot
+#    python CallGraph.py ./JavascriptAST call_graph.json --workers 8
+#
+# Builds a cross-file, function-level call graph in three passes:
+#   1. every AST is walked once, over a process pool, to collect its definitions,
+#      call sites and import bindings;
+#   2. a global symbol table is built from all definitions (keyed by file and
+#      qualified name, by file and simple name, and by simple name);
+#   3. every call site is resolved with a few dict lookups: local definitions,
+#      'self'/'this' methods, imported names and modules, then a unique-name fallback.
+# Calls resolved only by that fallback are drawn as 'may_call' edges.
+
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from GraphExport import export_graph
+from GraphModel import DependencyGraph
+from ImportResolver import ImportResolver, language_of
+
+DEFINITION_TYPES = {'function_definition', 'method_declaration', 'function_declaration', 'method_definition', 'constructor_declaration'}
+CLASS_TYPES = {'class_definition', 'class_declaration', 'interface_declaration'}
+CALL_TYPES = {'call', 'call_expression', 'method_invocation', 'invocation_expression'}
+# `const handler = () => {...}` defines a function through a variable declarator.
+FUNCTION_VALUE_TYPES = {'arrow_function', 'function_expression', 'function'}
+IMPORT_TYPES = {'import_from_statement', 'import_statement', 'import_declaration', 'using_directive'}
+NAME_TYPES = {'identifier', 'property_identifier', 'type_identifier', 'name'}
+PARAMETER_TYPES = {'parameters', 'formal_parameters', 'parameter_list'}
+SELF_NAMES = {'self', 'this', 'cls'}
+# Calls on the parent class are not resolved (the symbol table has no inheritance).
+SUPER_NAMES = {'super', 'base'}
+MODULE_SCOPE = '<module>'
+
+# --- Per-file Extraction ---
+
+def node_name(node: Dict[str, Any]) -> str:
+    return next((c.get('text', '') for c in node.get('children', []) if c.get('type') in NAME_TYPES), '')
+
+def definition_name(node: Dict[str, Any]) -> str:
+    """The name of a function or method: the identifier right before its parameter list, skipping return types."""
+    name = ''
+    for child in node.get('children', []):
+        if child.get('type') in PARAMETER_TYPES:
+            return name
+        if child.get('type') in NAME_TYPES:
+            name = child.get('text', '')
+    return node_name(node)
+
+def callee_parts(call: Dict[str, Any]) -> Tuple[Optional[str], str]:
+    """Returns (receiver text or None, called name) of a call site."""
+    children = call.get('children', [])
+    if call.get('type') == 'method_invocation':
+        # Java: [object], name, [type_arguments], argument_list
+        named = [c for c in children if c.get('type') not in ('argument_list', 'type_arguments')]
+        if not named:
+            return None, ''
+        return (named[0].get('text') if len(named) > 1 else None), named[-1].get('text', '')
+    if not children:
+        return None, ''
+    callee = children[0]
+    parts = callee.get('children', [])
+    if not parts or callee.get('type') in NAME_TYPES:
+        return None, callee.get('text', '')
+    return (parts[0].get('text') if len(parts) > 1 else None), parts[-1].get('text', '')
+
+class FileSymbols:
+    """Definitions, call sites and import bindings of one file."""
+    def __init__(self, file: str):
+        self.file = file
+        self.definitions: List[Tuple[str, str, int]] = []                  # (qualified name, simple name, line)
+        self.calls: List[Tuple[int, str, Optional[str], str, int]] = []    # (caller index or -1, class scope, receiver, name, line)
+        self.bindings: Dict[str, Tuple[str, Optional[str]]] = {}           # local name -> (module, imported name or None for the module)
+        self.wildcards: List[str] = []                                     # modules/namespaces imported wholesale
+
+    def add_import(self, node: Dict[str, Any]):
+        node_type, children = node.get('type'), node.get('children', [])
+        if node_type == 'import_from_statement' and children:
+            module = children[0].get('text', '')
+            for child in children[1:]:
+                if child.get('type') == 'wildcard_import':
+                    self.wildcards.append(module)
+                elif child.get('type') == 'aliased_import':
+                    name, alias = (child.get('children', []) + [{}, {}])[:2]
+                    self.bindings[alias.get('text', '')] = (module, name.get('text', ''))
+                elif child.get('type') == 'dotted_name':
+                    self.bindings[child.get('text', '')] = (module, child.get('text', ''))
+        elif node_type == 'import_statement':
+            source = next((c for c in children if c.get('type') == 'string'), None)
+            if source is None:
+                # Python: import a.b / import a.b as c
+                for child in children:
+                    if child.get('type') == 'aliased_import':
+                        name, alias = (child.get('children', []) + [{}, {}])[:2]
+                        self.bindings[alias.get('text', '')] = (name.get('text', ''), None)
+                    elif child.get('type') == 'dotted_name':
+                        self.bindings[child.get('text', '')] = (child.get('text', ''), None)
+                return
+            # JavaScript: import a, { b as c }, * as d from 'source'
+            module = source.get('text', '').strip('\'"`')
+            for clause in (c for c in children if c.get('type') == 'import_clause'):
+                for part in clause.get('children', []):
+                    if part.get('type') == 'identifier':
+                        self.bindings[part.get('text', '')] = (module, part.get('text', ''))
+                    elif part.get('type') == 'namespace_import':
+                        self.bindings[node_name(part)] = (module, None)
+                    elif part.get('type') == 'named_imports':
+                        for specifier in part.get('children', []):
+                            names = [c.get('text', '') for c in specifier.get('children', []) if c.get('type') in NAME_TYPES]
+                            if names:
+                                self.bindings[names[-1]] = (module, names[0])
+        elif node_type == 'import_declaration':
+            target = next((c for c in children if c.get('type') in ('scoped_identifier', 'identifier')), None)
+            if target is None:
+                return
+            imported = target.get('text', '')
+            if any(c.get('type') == 'asterisk' for c in children):
+                self.wildcards.append(imported)
+            elif node.get('text', '').startswith('import static'):
+                module, _, member = imported.rpartition('.')
+                self.bindings[member] = (module, member)
+            else:
+                self.bindings[imported.rpartition('.')[2]] = (imported, None)
+        elif node_type == 'using_directive':
+            target = next((c for c in children if c.get('type') in ('qualified_name', 'identifier')), None)
+            if target is not None:
+                self.wildcards.append(target.get('text', ''))
+
+def index_file(ast: Dict[str, Any], file: str) -> FileSymbols:
+    """Walks one AST iteratively, tracking the enclosing class and function of every call."""
+    symbols = FileSymbols(file)
+    # (node, scope names, enclosing class scope, enclosing definition index)
+    stack = [(ast, (), (), -1)] if isinstance(ast, dict) else []
+    while stack:
+        node, scope, class_scope, caller = stack.pop()
+        node_type = node.get('type')
+        if node_type in IMPORT_TYPES:
+            symbols.add_import(node)
+            continue
+        if node_type in CLASS_TYPES:
+            scope = class_scope = scope + (node_name(node),)
+        elif node_type in DEFINITION_TYPES or (node_type == 'variable_declarator' and any(
+                c.get('type') in FUNCTION_VALUE_TYPES for c in node.get('children', []))):
+            name = definition_name(node)
+            if name:
+                scope = scope + (name,)
+                caller = len(symbols.definitions)
+                symbols.definitions.append(('.'.join(scope), name, node.get('startPosition', {}).get('row', 0) + 1))
+        elif node_type in CALL_TYPES:
+            receiver, name = callee_parts(node)
+            if name:
+                symbols.calls.append((caller, '.'.join(class_scope), receiver, name,
+                                      node.get('startPosition', {}).get('row', 0) + 1))
+        children = node.get('children')
+        if children:
+            stack.extend((child, scope, class_scope, caller) for child in reversed(children))
+    return symbols
+
+# --- Global Symbol Table ---
+
+class SymbolIndex:
+    """All definitions of a project, indexed for O(1) lookups per call site."""
+    def __init__(self, files: List[FileSymbols]):
+        self.functions: List[Tuple[str, str]] = []                 # (file, qualified name) per function id
+        self.by_qualified: Dict[Tuple[str, str], int] = {}
+        self.by_file_name: Dict[Tuple[str, str], List[int]] = {}
+        self.by_name: Dict[str, List[int]] = {}
+        self.file_ids: Dict[str, List[int]] = {}                   # per file, function id of each definition index
+        for symbols in files:
+            ids = self.file_ids.setdefault(symbols.file, [])
+            for qualified, name, _ in symbols.definitions:
+                fid = len(self.functions)
+                self.functions.append((symbols.file, qualified))
+                self.by_qualified.setdefault((symbols.file, qualified), fid)
+                self.by_file_name.setdefault((symbols.file, name), []).append(fid)
+                self.by_name.setdefault(name, []).append(fid)
+                ids.append(fid)
+        self.resolver = ImportResolver(self.file_ids)
+
+    def in_files(self, files: List[str], name: str) -> List[int]:
+        found = []
+        for file in files:
+            found.extend(self.by_file_name.get((file, name), ()))
+        return found
+
+    def resolve_binding(self, file: str, module: str, name: Optional[str]) -> Tuple[List[str], Optional[str]]:
+        """Returns (target files, imported name); name is None when the binding is a whole module."""
+        if name is not None and language_of(file) == 'python':
+            # 'from . import utils' / 'from pkg import module' bind a module, not a symbol
+            submodule = module + name if module.endswith('.') else f"{module}.{name}"
+            files = self.resolver.resolve(file, submodule)
+            if files:
+                return files, None
+        return self.resolver.resolve(file, module), name
+
+class CallResolver:
+    """Resolves the call sites of one file against the global SymbolIndex."""
+    def __init__(self, index: SymbolIndex, symbols: FileSymbols):
+        self.index = index
+        self.file = symbols.file
+        self.bindings = {local: index.resolve_binding(self.file, module, name)
+                         for local, (module, name) in symbols.bindings.items()}
+        self.wildcard_files = [f for module in symbols.wildcards for f in index.resolver.resolve(self.file, module)]
+
+    def resolve(self, class_scope: str, receiver: Optional[str], name: str) -> Tuple[List[int], bool]:
+        """Returns (callee ids, exact); exact is False for the unique-name fallback."""
+        index = self.index
+        if receiver is None:
+            found = index.by_file_name.get((self.file, name))
+            if found:
+                return found, True
+            if name in self.bindings:
+                files, imported = self.bindings[name]
+                found = index.in_files(files, imported or name)
+                if found:
+                    return found, True
+            found = index.in_files(self.wildcard_files, name)
+            if found:
+                return found, True
+        elif receiver in SELF_NAMES:
+            fid = index.by_qualified.get((self.file, f"{class_scope}.{name}" if class_scope else name))
+            if fid is not None:
+                return [fid], True
+        elif receiver in SUPER_NAMES:
+            return [], False
+        elif receiver in self.bindings:
+            files, imported = self.bindings[receiver]
+            if not files:
+                # Receiver imported from outside the project (request.get, os.path.join, ...)
+                return [], False
+            if imported is None:
+                found = index.in_files(files, name)
+            else:
+                # Imported class: Users.get_by_email() -> Users.get_by_email in the class's file
+                found = [index.by_qualified[(f, f"{imported}.{name}")] for f in files if (f, f"{imported}.{name}") in index.by_qualified]
+            if found:
+                return found, True
+        candidates = index.by_name.get(name)
+        if candidates and len(candidates) == 1:
+            return candidates, False
+        return [], False
+
+# --- Call Graph ---
+
+def list_ast_files(ast_dir: str) -> List[Tuple[str, str]]:
+    """Returns (full path, project-relative source path) for every AST file, in a stable order."""
+    files = []
+    for root, dirs, names in os.walk(ast_dir):
+        dirs.sort()
+        for file_name in sorted(names):
+            if file_name.endswith('.json'):
+                full_path = os.path.join(root, file_name)
+                files.append((full_path, os.path.relpath(full_path, ast_dir).replace("\\", "/")[:-len('.json')]))
+    return files
+
+def index_shard(shard: List[Tuple[str, str]]) -> List[FileSymbols]:
+    """Worker entry point: extracts the symbols of a contiguous shard of AST files."""
+    files = []
+    for full_path, relative_path in shard:
+        try:
+            with open(full_path, 'r', encoding='utf-8') as f:
+                files.append(index_file(json.load(f), relative_path))
+        except Exception as e:
+            print(f"\n❌ Failed to analyze file: {full_path}. Reason: {e}", file=sys.stderr)
+    return files
+
+def load_file_symbols(ast_dir: str, workers: Optional[int] = None) -> List[FileSymbols]:
+    """Runs the per-file pass, over a process pool unless workers is 1; results keep the file order."""
+    files = list_ast_files(ast_dir)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(files) < 2:
+        return index_shard(files)
+    shard_count = min(len(files), workers * 4)
+    shards = [files[i * len(files) // shard_count:(i + 1) * len(files) // shard_count] for i in range(shard_count)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return [symbols for shard in pool.map(index_shard, shards) for symbols in shard]
+
+def build_call_graph(files: List[FileSymbols]) -> Tuple[DependencyGraph, Dict[str, int]]:
+    """Resolves every call site and returns the call graph with resolution statistics."""
+    index = SymbolIndex(files)
+    graph = DependencyGraph()
+    for file, qualified in index.functions:
+        graph.add_node(f"{file}::{qualified}", qualified, "node")
+
+    stats = {"Functions": len(index.functions), "Call sites": 0, "Resolved": 0, "Resolved by name only": 0}
+    for symbols in files:
+        resolver = CallResolver(index, symbols)
+        ids = index.file_ids[symbols.file]
+        for caller, class_scope, receiver, name, _ in symbols.calls:
+            stats["Call sites"] += 1
+            callees, exact = resolver.resolve(class_scope, receiver, name)
+            if not callees:
+                continue
+            stats["Resolved" if exact else "Resolved by name only"] += 1
+            if caller >= 0:
+                source = "::".join(index.functions[ids[caller]])
+            else:
+                source = f"{symbols.file}::{MODULE_SCOPE}"
+                graph.add_node(source, f"{os.path.basename(symbols.file)} {MODULE_SCOPE}", "file")
+            for callee in callees:
+                graph.add_edge(source, "::".join(index.functions[callee]), "calls" if exact else "may_call")
+    return graph, stats
+
+# --- Main Execution ---
+def main(ast_dir: str, output_path: str, workers: Optional[int] = None):
+    if not os.path.isdir(ast_dir):
+        print("Error: AST directory not found.", file=sys.stderr)
+        return
+    graph, stats = build_call_graph(load_file_symbols(ast_dir, workers))
+    export_graph(graph, output_path)
+    print(json.dumps(stats, indent=2))
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    workers = None
+    if "--workers" in args:
+        position = args.index("--workers")
+        workers = int(args[position + 1])
+        del args[position:position + 2]
+    if not args:
+        print("Usage: python CallGraph.py <path-to-ast-directory> [output_file.dot] [--workers N]")
+    else:
+        main(args[0], args[1] if len(args) > 1 else "call_graph.dot", workers)
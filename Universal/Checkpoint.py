@@ -0,0 +1,113 @@
+# Progress journals for resumable runs.
+#
+# UniversalAST.py (JSON output) and UniversalParser.py (when run with
+# '--resume') append one JSON line per completed file to a journal and flush it
+# to disk every few seconds. A run that crashes or is killed leaves its journal
+# behind; rerunning the same command with '--resume' reads it back and skips
+# (or, for analysis, re-uses the saved partial statistics of) every file it
+# records whose content is unchanged: each entry carries the file's blob id or
+# stamp. A run that finishes deletes its journal. The first line identifies the
+# run, so a journal left by a different project or configuration is never resumed.
+#
+# The AST generators write their outputs with the helpers at the end of this file:
+# every write goes through a temporary file and os.replace, which is what lets
+# identical files share one hard-linked output (link_file) safely.
+
+import json
+import os
+import shutil
+import time
+from typing import Any, Dict
+
+class Journal:
+    """An append-only, periodically flushed record of completed work items."""
+    def __init__(self, path: str, run: Any, resume: bool = False, flush_interval: float = 5.0):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.done: Dict[str, Any] = {}
+        if resume and os.path.isfile(path):
+            self.load(run)
+        self.f = open(path, 'a' if self.done else 'w', encoding='utf-8')
+        if not self.done:
+            self.write(["#run", run])
+        self.last_flush = time.monotonic()
+
+    def load(self, run: Any):
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        # A line torn by the interruption is dropped, so appends start on a fresh line
+        complete = data[:data.rfind(b"\n") + 1]
+        lines = complete.decode('utf-8').splitlines()
+        if not lines or json.loads(lines[0]) != ["#run", run]:
+            print(f"⚠️ {self.path} belongs to a different run; starting over.")
+            return
+        with open(self.path, 'r+b') as f:
+            f.truncate(len(complete))
+        for line in lines[1:]:
+            key, value = json.loads(line)
+            self.done[key] = value
+        print(f"Resuming: {len(self.done)} completed items recorded in {self.path}")
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.done
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.done.get(key, default)
+
+    def write(self, item: list):
+        self.f.write(json.dumps(item, separators=(',', ':')) + "\n")
+
+    def record(self, key: str, value: Any = None):
+        """Records a completed item. Call it only once the item's outputs are in place."""
+        self.write([key, value])
+        if time.monotonic() - self.last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        self.f.flush()
+        os.fsync(self.f.fileno())
+        self.last_flush = time.monotonic()
+
+    def close(self):
+        if not self.f.closed:
+            self.flush()
+            self.f.close()
+
+    def finish(self):
+        """Closes and deletes the journal once the whole run has completed."""
+        self.close()
+        os.remove(self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+def write_json_atomic(path: str, data: Any, indent: int = 2):
+    """Writes a JSON file through a temporary file, so an interrupted write never leaves it truncated."""
+    temp_path = path + ".tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=indent)
+    os.replace(temp_path, path)
+
+def write_file(path: str, data: str):
+    """
+    Writes text through a temporary file. A path hard-linked to another output (see
+    link_file) is thereby replaced, never rewritten in place through the shared inode.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = path + ".tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(data)
+    os.replace(temp_path, path)
+
+def link_file(existing_path: str, path: str):
+    """Makes path a hard link to existing_path, or a copy where links are not supported."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if os.path.lexists(path):
+        os.remove(path)
+    try:
+        os.link(existing_path, path)
+    except OSError:
+        shutil.copyfile(existing_path, path)
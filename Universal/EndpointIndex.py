@@ -0,0 +1,224 @@
+# To run this script:
+# 1. First, generate the ASTs for a Java Spring or ASP.NET project using 'UniversalAST.py'.
+# 2. Execute from your terminal:
+#    python EndpointIndex.py ./JavaAST endpoint_inventory.json
+#    python EndpointIndex.py ./CSharpAST endpoint_inventory.json
+#
+# Builds an endpoint inventory (method, path, controller, handler) from Spring
+# @GetMapping/@RequestMapping annotations and ASP.NET [HttpGet]/[Route] attributes.
+# Only declaration containers (namespaces, class bodies) and the annotation or
+# attribute lists of classes and methods are visited; method bodies, which make up
+# most of a controller's AST, are never entered.
+
+import json
+import os
+import re
+import sys
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# --- Compiled Matchers ---
+
+JAVA_MAPPING = re.compile(r'^(?:[\w.]+\.)?(Get|Post|Put|Delete|Patch|Request)Mapping$')
+JAVA_REQUEST_METHOD = re.compile(r'RequestMethod\.(\w+)')
+CSHARP_HTTP_ATTRIBUTE = re.compile(r'^Http(Get|Post|Put|Delete|Patch|Head|Options)(?:Attribute)?$')
+CSHARP_ROUTE_ATTRIBUTE = re.compile(r'^Route(?:Attribute)?$')
+ROUTE_TOKEN = re.compile(r'\[(controller|action)\]', re.IGNORECASE)
+
+# Nodes that can contain class or method declarations without being a code body.
+CONTAINER_TYPES = {
+    'program', 'compilation_unit', 'class_body', 'interface_body', 'declaration_list',
+    'namespace_declaration', 'file_scoped_namespace_declaration',
+}
+CLASS_TYPES = {'class_declaration', 'interface_declaration'}
+METHOD_TYPES = {'method_declaration'}
+# Where a declaration keeps its annotations (Java) or attributes (C#).
+ANNOTATION_HOLDERS = {'modifiers', 'attribute_list'}
+ANNOTATION_TYPES = {'annotation', 'marker_annotation', 'attribute'}
+
+# --- Annotation Parsing ---
+
+def strip_literal(text: str) -> str:
+    text = text.strip()
+    if text.startswith('@"') or text.startswith('$"'):
+        text = text[1:]
+    return text.strip('"\'')
+
+def join_route(prefix: str, path: str) -> str:
+    """Joins a controller-level route prefix and a handler path into '/a/b'."""
+    parts = [p.strip('/') for p in (prefix, path) if p and p.strip('/')]
+    return '/' + '/'.join(parts)
+
+def iter_annotations(declaration: Dict[str, Any]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Yields (name, annotation node) for the annotations/attributes directly on a declaration."""
+    for holder in declaration.get('children', []):
+        if holder.get('type') not in ANNOTATION_HOLDERS:
+            continue
+        for annotation in holder.get('children', []):
+            if annotation.get('type') in ANNOTATION_TYPES:
+                name_node = next((c for c in annotation.get('children', [])
+                                  if c.get('type') in ('identifier', 'scoped_identifier', 'qualified_name')), None)
+                if name_node:
+                    yield name_node.get('text', ''), annotation
+
+def java_annotation_values(annotation: Dict[str, Any]) -> Tuple[List[str], List[str]]:
+    """Returns (paths, http methods) from a Spring mapping annotation's arguments."""
+    paths, methods = [], []
+    arguments = next((c for c in annotation.get('children', []) if c.get('type') == 'annotation_argument_list'), None)
+    for argument in (arguments or {}).get('children', []):
+        if argument.get('type') == 'element_value_pair':
+            key, value = (argument.get('children', []) + [{}, {}])[:2]
+            if key.get('text') in ('value', 'path'):
+                paths.extend(java_string_values(value))
+            elif key.get('text') == 'method':
+                methods.extend(m.upper() for m in JAVA_REQUEST_METHOD.findall(value.get('text', '')))
+        else:
+            paths.extend(java_string_values(argument))
+    return paths, methods
+
+def java_string_values(node: Dict[str, Any]) -> List[str]:
+    if node.get('type') == 'string_literal':
+        return [strip_literal(node.get('text', ''))]
+    if node.get('type') == 'element_value_array_initializer':
+        return [strip_literal(c.get('text', '')) for c in node.get('children', []) if c.get('type') == 'string_literal']
+    return []
+
+def csharp_attribute_path(attribute: Dict[str, Any]) -> Optional[str]:
+    """Returns the route template of an attribute's first positional string argument."""
+    arguments = next((c for c in attribute.get('children', []) if c.get('type') == 'attribute_argument_list'), None)
+    for argument in (arguments or {}).get('children', []):
+        children = argument.get('children', [])
+        # Skip named arguments such as Name = "x"
+        if len(children) == 1 and children[0].get('type') in ('string_literal', 'verbatim_string_literal'):
+            return strip_literal(children[0].get('text', ''))
+    return None
+
+def declaration_routes(declaration: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """Returns the (http method, path) pairs declared on one class or method."""
+    routes, route_paths, mapped = [], [], False
+    for name, annotation in iter_annotations(declaration):
+        java_match = JAVA_MAPPING.match(name)
+        if java_match:
+            mapped = True
+            paths, methods = java_annotation_values(annotation)
+            verb = java_match.group(1).upper()
+            methods = methods or ([verb] if verb != 'REQUEST' else ['ANY'])
+            routes.extend((method, path) for method in methods for path in (paths or ['']))
+            continue
+        csharp_match = CSHARP_HTTP_ATTRIBUTE.match(name)
+        if csharp_match:
+            mapped = True
+            routes.append((csharp_match.group(1).upper(), csharp_attribute_path(annotation) or ''))
+        elif CSHARP_ROUTE_ATTRIBUTE.match(name):
+            route_paths.append(csharp_attribute_path(annotation) or '')
+    # [Route("x")] on a method combines with its [HttpGet]; on its own it accepts any verb.
+    if route_paths:
+        if mapped:
+            routes = [(method, join_route(route, path)) for method, path in routes for route in route_paths]
+        else:
+            routes = [('ANY', route) for route in route_paths]
+    return routes
+
+# --- Endpoint Inventory ---
+
+class EndpointIndex:
+    """An endpoint inventory with lookups by HTTP method, path and controller."""
+    def __init__(self):
+        self.endpoints: List[Dict[str, str]] = []
+        self.by_method: Dict[str, List[int]] = {}
+        self.by_path: Dict[str, List[int]] = {}
+        self.by_controller: Dict[str, List[int]] = {}
+
+    def add(self, method: str, path: str, controller: str, handler: str, file: str):
+        position = len(self.endpoints)
+        self.endpoints.append({'method': method, 'path': path, 'controller': controller, 'handler': handler, 'file': file})
+        self.by_method.setdefault(method, []).append(position)
+        self.by_path.setdefault(path, []).append(position)
+        self.by_controller.setdefault(controller, []).append(position)
+
+    def find(self, method: Optional[str] = None, path: Optional[str] = None, controller: Optional[str] = None) -> List[Dict[str, str]]:
+        """Returns the endpoints matching every given criterion."""
+        candidates = None
+        for index, key in ((self.by_method, method and method.upper()), (self.by_path, path), (self.by_controller, controller)):
+            if key is None:
+                continue
+            positions = set(index.get(key, []))
+            candidates = positions if candidates is None else candidates & positions
+        if candidates is None:
+            return list(self.endpoints)
+        return [self.endpoints[p] for p in sorted(candidates)]
+
+    def add_ast(self, ast: Dict[str, Any], file: str):
+        """Indexes the controllers of one AST, visiting only declarations and their annotations."""
+        stack = [ast] if isinstance(ast, dict) else []
+        while stack:
+            node = stack.pop()
+            for child in reversed(node.get('children', [])):
+                child_type = child.get('type')
+                if child_type in CLASS_TYPES:
+                    self.add_controller(child, file)
+                elif child_type in CONTAINER_TYPES:
+                    stack.append(child)
+
+    def add_controller(self, class_node: Dict[str, Any], file: str):
+        controller = next((c.get('text', '') for c in class_node.get('children', []) if c.get('type') == 'identifier'), '')
+        class_routes = declaration_routes(class_node)
+        # @RequestMapping(value="/api", method={GET, POST}) gives one route per method, but one prefix
+        prefixes = list(dict.fromkeys(path for _, path in class_routes)) or ['']
+        # A class-level method restriction applies to the handlers that accept any method
+        class_methods = list(dict.fromkeys(method for method, _ in class_routes if method != 'ANY'))
+        controller_token = controller[:-len('Controller')] if controller.endswith('Controller') else controller
+
+        body = next((c for c in class_node.get('children', []) if c.get('type') in CONTAINER_TYPES), {})
+        for member in body.get('children', []):
+            member_type = member.get('type')
+            if member_type in CLASS_TYPES:
+                self.add_controller(member, file)
+                continue
+            if member_type not in METHOD_TYPES:
+                continue
+            handler = next((c.get('text', '') for c in member.get('children', []) if c.get('type') == 'identifier'), '')
+            for method, path in declaration_routes(member):
+                for prefix in prefixes:
+                    full_path = join_route(prefix, path)
+                    full_path = ROUTE_TOKEN.sub(lambda m: controller_token if m.group(1).lower() == 'controller' else handler, full_path)
+                    for handler_method in (class_methods if method == 'ANY' and class_methods else [method]):
+                        self.add(handler_method, full_path, controller, handler, file)
+
+    def to_report(self) -> Dict[str, Any]:
+        return {
+            "Endpoints defined": len(self.endpoints),
+            "Endpoints by method": {method: len(positions) for method, positions in sorted(self.by_method.items())},
+            "Endpoints": self.endpoints,
+        }
+
+def build_endpoint_index(ast_dir: str) -> EndpointIndex:
+    """Walks an AST directory and indexes every Spring/ASP.NET endpoint found."""
+    index = EndpointIndex()
+    for root, _, files in os.walk(ast_dir):
+        for file in sorted(files):
+            if file.endswith(('.java.json', '.cs.json')):
+                full_path = os.path.join(root, file)
+                relative_path = os.path.relpath(full_path, ast_dir).replace("\\", "/")
+                try:
+                    with open(full_path, 'r', encoding='utf-8') as f:
+                        index.add_ast(json.load(f), relative_path[:-len('.json')])
+                except Exception as e:
+                    print(f"\n❌ Failed to analyze file: {full_path}. Reason: {e}", file=sys.stderr)
+    return index
+
+# --- Main Execution ---
+def main(ast_dir: str, output_path: str):
+    if not os.path.isdir(ast_dir):
+        print("Error: AST directory not found.", file=sys.stderr)
+        return
+
+    index = build_endpoint_index(ast_dir)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(index.to_report(), f, indent=2)
+    print(f"\n✅ Indexed {len(index.endpoints)} endpoints to: {output_path}")
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python EndpointIndex.py <path-to-ast-directory> [output_file.json]")
+    else:
+        main(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else "endpoint_inventory.json")
@@ -0,0 +1,216 @@
+# One-pass, .gitignore-aware discovery of a project's source files.
+#
+# GenerateAST.py and UniversalAST.py scan the project once and write the result
+# as a manifest (file_manifest.tsv) that parsing, and later runs given
+# '--manifest', reuse instead of walking again. A reused manifest is checked
+# against the project it was written for and against each file's size and mtime:
+#    # file manifest v1 /abs/path/to/project
+#    <relative path> \t <size> \t <mtime in ns> \t <language>
+#
+# Directories are scanned with os.scandir by a pool of threads, one directory
+# per task, so large trees (and slow or network file systems) are walked in
+# parallel. Every .gitignore found on the way, and .git/info/exclude, is
+# compiled to regular expressions once and applied to the directory it lives
+# in and below; an ignored directory is never entered.
+
+import os
+import re
+import sys
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+MANIFEST_HEADER = "# file manifest v1"
+
+class ManifestEntry(NamedTuple):
+    path: str           # relative to the project, '/'-separated
+    size: int
+    mtime: int          # st_mtime_ns
+    language: str
+
+# --- .gitignore Matching ---
+
+def translate_pattern(pattern: str) -> str:
+    """Regular expression for one gitignore glob ('*', '?', '[...]', '**')."""
+    parts = []
+    i, n = 0, len(pattern)
+    while i < n:
+        if pattern.startswith("**/", i):
+            parts.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            parts.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            parts.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            parts.append("[^/]")
+            i += 1
+        elif pattern[i] == "[" and "]" in pattern[i + 2:]:
+            end = pattern.index("]", i + 2)
+            body = pattern[i + 1:end]
+            if body[0] in "!^":
+                body = "^" + body[1:]
+            parts.append("[" + body.replace("\\", "\\\\") + "]")
+            i = end + 1
+        elif pattern[i] == "\\" and i + 1 < n:
+            parts.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            parts.append(re.escape(pattern[i]))
+            i += 1
+    return "".join(parts)
+
+class IgnoreRules:
+    """The patterns of one ignore file, matched against paths relative to its directory (base)."""
+    def __init__(self, base: str, lines: Iterable[str]):
+        self.base = base
+        self.rules: List[Tuple["re.Pattern", bool, bool, bool]] = []     # regex, negated, directories only, matches the path
+        for line in lines:
+            line = line.rstrip("\n")
+            if not line.endswith("\\ "):
+                line = line.rstrip()
+            if not line or line.startswith("#"):
+                continue
+            negated = line.startswith("!")
+            if negated or line.startswith(("\\!", "\\#")):
+                line = line[1:]
+            directories_only = line.endswith("/")
+            line = line.rstrip("/")
+            # A slash anywhere but at the end anchors the pattern to this directory
+            on_path = "/" in line
+            try:
+                self.rules.append((re.compile(translate_pattern(line.lstrip("/")) + r"\Z"), negated, directories_only, on_path))
+            except re.error:
+                continue
+
+    @classmethod
+    def from_file(cls, base: str, path: str) -> "IgnoreRules":
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            return cls(base, f.readlines())
+
+    def match(self, path: str, name: str, is_dir: bool) -> Optional[bool]:
+        """True if ignored, False if re-included ('!pattern'), None if no pattern matches. The last match wins."""
+        relative = path[len(self.base):]
+        for regex, negated, directories_only, on_path in reversed(self.rules):
+            if directories_only and not is_dir:
+                continue
+            if regex.match(relative if on_path else name):
+                return not negated
+        return None
+
+def is_ignored(rules_stack: List[IgnoreRules], path: str, name: str, is_dir: bool) -> bool:
+    # The deepest ignore file that has an opinion decides
+    for rules in reversed(rules_stack):
+        ignored = rules.match(path, name, is_dir)
+        if ignored is not None:
+            return ignored
+    return False
+
+# --- Discovery ---
+
+def scan_directory(project_dir: str, directory: str, rules_stack: List[IgnoreRules],
+                   extensions: Dict[str, str], ignored_dirs: Set[str]):
+    """Lists one directory ('' or 'a/b/'): returns its source files and the subdirectories to scan next."""
+    try:
+        with os.scandir(os.path.join(project_dir, directory)) as it:
+            entries = list(it)
+    except OSError as e:
+        print(f"[SKIPPED] Could not scan {os.path.join(project_dir, directory)}. Reason: {e}")
+        return [], []
+
+    for entry in entries:
+        if entry.name == ".gitignore" and entry.is_file():
+            rules_stack = rules_stack + [IgnoreRules.from_file(directory, entry.path)]
+            break
+
+    files, subdirectories = [], []
+    for entry in entries:
+        path = directory + entry.name
+        if entry.is_dir(follow_symlinks=False):
+            if entry.name not in ignored_dirs and not is_ignored(rules_stack, path, entry.name, True):
+                subdirectories.append((path + "/", rules_stack))
+        elif entry.is_file():
+            language = extensions.get(os.path.splitext(entry.name)[1])
+            if language is not None and not is_ignored(rules_stack, path, entry.name, False):
+                st = entry.stat()
+                files.append(ManifestEntry(path, st.st_size, st.st_mtime_ns, language))
+    return files, subdirectories
+
+def discover_files(project_dir: str, extensions: Dict[str, str], ignored_dirs: Set[str] = frozenset(),
+                   workers: Optional[int] = None) -> List[ManifestEntry]:
+    """Every file of the project with one of the extensions (extension -> language), sorted by path."""
+    rules_stack = []
+    exclude_path = os.path.join(project_dir, ".git", "info", "exclude")
+    if os.path.isfile(exclude_path):
+        rules_stack.append(IgnoreRules.from_file("", exclude_path))
+    ignored_dirs = set(ignored_dirs) | {".git"}
+
+    files: List[ManifestEntry] = []
+    with ThreadPoolExecutor(workers) as pool:
+        pending = {pool.submit(scan_directory, project_dir, "", rules_stack, extensions, ignored_dirs)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                found, subdirectories = future.result()
+                files.extend(found)
+                pending.update(pool.submit(scan_directory, project_dir, directory, stack, extensions, ignored_dirs)
+                               for directory, stack in subdirectories)
+    files.sort()
+    return files
+
+# --- Manifest ---
+
+def write_manifest(manifest_path: str, project_dir: str, entries: List[ManifestEntry]):
+    temp_path = manifest_path + ".tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(f"{MANIFEST_HEADER} {os.path.abspath(project_dir)}\n")
+        f.writelines(f"{e.path}\t{e.size}\t{e.mtime}\t{e.language}\n" for e in entries)
+    os.replace(temp_path, manifest_path)
+    print(f"✅ File manifest ({len(entries)} files) saved to: {manifest_path}")
+
+def read_manifest(manifest_path: str) -> Tuple[str, List[ManifestEntry]]:
+    """Returns (project directory, entries) of a manifest written by write_manifest."""
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        header = f.readline().rstrip("\n")
+        if not header.startswith(MANIFEST_HEADER):
+            raise ValueError(f"{manifest_path} is not a file manifest")
+        entries = []
+        for line in f:
+            path, size, mtime, language = line.rstrip("\n").split("\t")
+            entries.append(ManifestEntry(path, int(size), int(mtime), language))
+    return header[len(MANIFEST_HEADER):].strip(), entries
+
+def load_manifest(manifest_path: str, project_dir: str) -> List[ManifestEntry]:
+    """
+    Reads a manifest to reuse for project_dir. A manifest of another project is
+    refused (ValueError); files deleted since the scan are dropped, and files whose
+    size or mtime changed are reported (they are still parsed, with their new content).
+    """
+    manifest_project, entries = read_manifest(manifest_path)
+    if manifest_project != os.path.abspath(project_dir):
+        raise ValueError(f"{manifest_path} lists the files of '{manifest_project}', not '{os.path.abspath(project_dir)}'")
+    current, changed, deleted = [], 0, 0
+    for entry in entries:
+        try:
+            st = os.stat(os.path.join(project_dir, entry.path))
+        except OSError:
+            deleted += 1
+            continue
+        if (st.st_size, st.st_mtime_ns) != (entry.size, entry.mtime):
+            changed += 1
+        current.append(entry)
+    if changed or deleted:
+        print(f"⚠️ Since the manifest was written, {changed} files changed and {deleted} were deleted; "
+              "scan again (without --manifest) to pick up new files.")
+    return current
+
+# --- Main Execution ---
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "show":
+        project, manifest_entries = read_manifest(sys.argv[2])
+        print(f"{project}: {len(manifest_entries)} files")
+        for manifest_entry in manifest_entries:
+            print(f"{manifest_entry.size:>10}  {manifest_entry.language:<12} {manifest_entry.path}")
+    else:
+        print("Usage: python FileManifest.py show <file_manifest.tsv>")
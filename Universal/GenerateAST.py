@@ -4,6 +4,16 @@
 #
 # 2. Execute from your terminal with ONLY the project path:
 #    python generate_asts_fully_automated.py /path/to/your/project
+#
+#    Or write every AST into one SQLite store instead of JSON files (see ASTStore.py):
+#    python generate_asts_fully_automated.py /path/to/your/project --store ast.db
+#
+# The project is scanned once, honouring its .gitignore files (see FileManifest.py),
+# and the files found are saved to file_manifest.tsv. To parse from an existing
+# manifest instead of scanning again:
+#    python generate_asts_fully_automated.py /path/to/your/project --manifest file_manifest.tsv
+#
+# Identical source files are parsed once; their JSON ASTs are hard links to the first copy's.
 
 import json
 import os
@@ -11,6 +21,10 @@ import sys
 import importlib
 from tree_sitter import Language, Parser
 
+from ASTStore import ASTStoreWriter, blob_id
+from Checkpoint import link_file, write_file
+from FileManifest import discover_files, load_manifest, write_manifest
+
 # --- Source of Truth: The Full Language Configuration ---
 # Maps language keys to their specific settings. The script uses this to know what to do.
 LANGUAGE_CONFIG = {
@@ -55,21 +69,10 @@ def node_to_dict(node):
     }
 
 def discover_languages(project_dir, ignored_dirs):
-    """Scan the project to find which languages and file extensions are present."""
-    found_extensions = set()
-    for root, dirs, files in os.walk(project_dir, topdown=True):
-        dirs[:] = [d for d in dirs if d not in ignored_dirs]
-        for file in files:
-            _, extension = os.path.splitext(file)
-            if extension:
-                found_extensions.add(extension)
-
-    languages_to_load = set()
-    for lang, config in LANGUAGE_CONFIG.items():
-        if any(ext in found_extensions for ext in config['extensions']):
-            languages_to_load.add(lang)
-            
-    return languages_to_load
+    """Scan the project once; returns the languages present and the manifest entries of their files."""
+    extensions = {ext: lang for lang, config in LANGUAGE_CONFIG.items() for ext in config['extensions']}
+    entries = discover_files(project_dir, extensions, ignored_dirs)
+    return {entry.language for entry in entries}, entries
 
 def initialize_parsers(languages_to_load: set) -> dict:
     """Initializes and returns a dictionary of parsers mapped by file extension."""
@@ -89,56 +92,85 @@ def initialize_parsers(languages_to_load: set) -> dict:
             if lang_key == 'typescript':
                 ts_parser = Parser(Language(lang_module.language_typescript()))
                 tsx_parser = Parser(Language(lang_module.language_tsx()))
-                parsers['.ts'] = {'parser': ts_parser, 'output_dir': output_dir}
-                parsers['.tsx'] = {'parser': tsx_parser, 'output_dir': output_dir}
+                parsers['.ts'] = {'parser': ts_parser, 'output_dir': output_dir, 'language': lang_key}
+                parsers['.tsx'] = {'parser': tsx_parser, 'output_dir': output_dir, 'language': lang_key}
             else:
                 parser = Parser(Language(lang_module.language()))
                 for ext in config['extensions']:
-                    parsers[ext] = {'parser': parser, 'output_dir': output_dir}
+                    parsers[ext] = {'parser': parser, 'output_dir': output_dir, 'language': lang_key}
         except (ImportError, Exception) as e:
             print(f"  ❌ Error: Could not initialize parser for '{lang_key}'.")
             print(f"     Please ensure '{lang_import_name}' is installed ('pip install {lang_import_name}').")
     return parsers
 
-def parse_project(project_dir, parsers, ignored_dirs):
-    """Recursively finds and parses all relevant source files using the correct parser."""
+def parse_project(project_dir, parsers, entries, store=None):
+    """
+    Parses the files of the manifest entries using the correct parser.
+    ASTs go to the language output folders, or only into the given ASTStoreWriter.
+    Files with identical content are parsed once and their copies linked to the first AST.
+    """
     file_count = 0
     script_name = os.path.basename(__file__)
-    supported_extensions = tuple(parsers.keys())
-
-    for root, dirs, files in os.walk(project_dir, topdown=True):
-        dirs[:] = [d for d in dirs if d not in ignored_dirs]
-        for file_name in files:
-            if file_name.endswith(supported_extensions) and file_name != script_name:
-                _, extension = os.path.splitext(file_name)
-                parser_info = parsers.get(extension)
-                if not parser_info: continue
-
-                file_path = os.path.join(root, file_name)
-                try:
-                    with open(file_path, 'rb') as f:
-                        tree = parser_info['parser'].parse(f.read())
-                    
-                    serializable_ast = node_to_dict(tree.root_node)
-                    
-                    relative_path = os.path.relpath(file_path, project_dir)
-                    output_file_path = os.path.join(parser_info['output_dir'], f"{relative_path}.json")
-                    os.makedirs(os.path.dirname(output_file_path), exist_ok=True)
-                    
-                    with open(output_file_path, 'w', encoding='utf-8') as f_json:
-                        json.dump(serializable_ast, f_json, indent=2)
-                    
-                    print(f"[SUCCESS] Saved AST for: {file_path}")
-                    file_count += 1
-                except Exception as e:
-                    print(f"[FAILED] Could not process {file_path}. Reason: {e}")
+    parsed = {}     # (extension, blob id) -> relative path of the first file with that content
+
+    for entry in entries:
+        file_name = os.path.basename(entry.path)
+        if file_name == script_name: continue
+        _, extension = os.path.splitext(file_name)
+        parser_info = parsers.get(extension)
+        if not parser_info: continue
+
+        file_path = os.path.join(project_dir, entry.path)
+        try:
+            with open(file_path, 'rb') as f:
+                source = f.read()
+            relative_path = entry.path
+            # .ts and .tsx share a language but not a grammar, so the extension is part of the key
+            content_key = (extension, blob_id(source))
+            original_path = parsed.get(content_key)
+
+            if original_path is not None:
+                if store is not None:
+                    store.add_copy(relative_path, parser_info['language'], original_path)
+                else:
+                    link_file(os.path.join(parser_info['output_dir'], f"{original_path}.json"),
+                              os.path.join(parser_info['output_dir'], f"{relative_path}.json"))
+                print(f"[DUPLICATE] Reused AST of {original_path} for: {file_path}")
+                file_count += 1
+                continue
+
+            tree = parser_info['parser'].parse(source)
+            parsed[content_key] = relative_path
+
+            if store is not None:
+                store.add_tree(relative_path, parser_info['language'], source, tree.root_node)
+                print(f"[SUCCESS] Stored AST for: {file_path}")
+                file_count += 1
+                continue
+
+            serializable_ast = node_to_dict(tree.root_node)
+            
+            output_file_path = os.path.join(parser_info['output_dir'], f"{relative_path}.json")
+            write_file(output_file_path, json.dumps(serializable_ast, indent=2))
+            
+            print(f"[SUCCESS] Saved AST for: {file_path}")
+            file_count += 1
+        except Exception as e:
+            print(f"[FAILED] Could not process {file_path}. Reason: {e}")
 
     return file_count
 
 # --- Main Execution ---
 if __name__ == "__main__":
+    options = {}
+    for name in ("--store", "--manifest"):
+        if name in sys.argv[2:-1]:
+            position = sys.argv.index(name)
+            options[name] = sys.argv[position + 1]
+            del sys.argv[position:position + 2]
+    store_path = options.get("--store")
     if len(sys.argv) != 2:
-        print("Usage: python generate_asts_fully_automated.py <path-to-project>")
+        print("Usage: python generate_asts_fully_automated.py <path-to-project> [--store ast.db] [--manifest file_manifest.tsv]")
         sys.exit(1)
 
     project_directory = sys.argv[1]
@@ -151,9 +183,19 @@ if __name__ == "__main__":
     for lang_cfg in LANGUAGE_CONFIG.values():
         ignored_dirs.add(lang_cfg['output_dir'])
 
-    # 1. Discover which languages are in the project
-    print(f"Scanning project at '{os.path.abspath(project_directory)}' to discover languages...")
-    languages_found = discover_languages(project_directory, ignored_dirs)
+    # 1. Discover which languages are in the project, or reuse a previous scan
+    if "--manifest" in options:
+        try:
+            manifest_entries = load_manifest(options["--manifest"], project_directory)
+        except (OSError, ValueError) as e:
+            print(f"Error: Could not read the file manifest. Reason: {e}")
+            sys.exit(1)
+        print(f"Using {len(manifest_entries)} files from the manifest '{options['--manifest']}'...")
+        languages_found = {entry.language for entry in manifest_entries}
+    else:
+        print(f"Scanning project at '{os.path.abspath(project_directory)}' to discover languages...")
+        languages_found, manifest_entries = discover_languages(project_directory, ignored_dirs)
+        write_manifest(os.path.join(os.getcwd(), "file_manifest.tsv"), project_directory, manifest_entries)
 
     if not languages_found:
         print("\n⚠️ No supported source code files were found to parse.")
@@ -170,7 +212,11 @@ if __name__ == "__main__":
 
     # 3. Parse the entire project using the loaded parsers
     print(f"\nStarting AST generation for all discovered languages...\n")
-    total_files_parsed = parse_project(project_directory, parsers_by_extension, ignored_dirs)
+    if store_path:
+        with ASTStoreWriter(store_path) as store:
+            total_files_parsed = parse_project(project_directory, parsers_by_extension, manifest_entries, store)
+    else:
+        total_files_parsed = parse_project(project_directory, parsers_by_extension, manifest_entries)
     
     # 4. Display a summary
     if total_files_parsed > 0:
@@ -0,0 +1,110 @@
+# Read-only access to a git repository's object database, without a worktree.
+#
+# UniversalAST.py parses a revision straight from git with '--revision REV':
+#    python UniversalAST.py /path/to/repo --revision v2.1.0 --store v2.1.0.db
+# Trees and blobs are read through one long-lived 'git cat-file --batch'
+# process, so nothing is checked out and the live checkout can keep changing
+# (or be analyzed) at the same time. To list the files of a revision:
+#    python GitObjects.py ls /path/to/repo v2.1.0
+
+import subprocess
+import sys
+from typing import Iterator, List, Set, Tuple
+
+TREE_MODE = b"40000"
+BLOB_MODES = (b"100644", b"100755")     # symlinks (120000) and submodules (160000) are skipped
+
+class GitError(Exception):
+    pass
+
+class GitObjects:
+    """A 'git cat-file --batch' process answering object reads for one repository."""
+    def __init__(self, repo_dir: str):
+        self.repo_dir = repo_dir
+        try:
+            self.process = subprocess.Popen(["git", "-C", repo_dir, "cat-file", "--batch"],
+                                            stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        except OSError as e:
+            raise GitError(f"Could not run git: {e}")
+
+    def read(self, name: str) -> Tuple[str, str, bytes]:
+        """Returns (type, sha, content) of an object name: a sha, 'REV', 'REV^{tree}', 'REV:path', ..."""
+        self.process.stdin.write(name.encode('utf-8') + b"\n")
+        self.process.stdin.flush()
+        header = self.process.stdout.readline()
+        fields = header.split()
+        if len(fields) != 3:
+            if not header:
+                raise GitError(f"git cat-file exited reading '{name}' (is {self.repo_dir} a git repository?)")
+            raise GitError(f"'{name}' is {fields[-1].decode()} in {self.repo_dir}")
+        sha, object_type, size = fields
+        content = self.process.stdout.read(int(size))
+        self.process.stdout.read(1)     # the newline after every object
+        return object_type.decode(), sha.decode(), content
+
+    def blob(self, sha: str) -> bytes:
+        return self.read(sha)[2]
+
+    def tree_of(self, revision: str) -> str:
+        """The sha of a revision's root tree."""
+        return self.read(revision + "^{tree}")[1]
+
+    def tree_entries(self, tree_sha: str) -> Iterator[Tuple[bytes, str, str]]:
+        """Yields (mode, name, sha) of a tree's direct entries."""
+        _, _, content = self.read(tree_sha)
+        position = 0
+        # Tree entries: b"<mode> <name>\0" followed by the 20-byte binary sha
+        while position < len(content):
+            name_end = content.index(b"\0", position)
+            mode, name = content[position:name_end].split(b" ", 1)
+            yield mode, name.decode('utf-8', 'surrogateescape'), content[name_end + 1:name_end + 21].hex()
+            position = name_end + 21
+
+    def iter_tree(self, tree_sha: str, prefix: str = "", ignored_dirs: Set[str] = frozenset()) -> Iterator[Tuple[str, str]]:
+        """Yields (path, blob sha) of every regular file under a tree, skipping directories named in ignored_dirs."""
+        for mode, name, sha in list(self.tree_entries(tree_sha)):
+            if mode == TREE_MODE:
+                if name not in ignored_dirs:
+                    yield from self.iter_tree(sha, prefix + name + "/", ignored_dirs)
+            elif mode in BLOB_MODES:
+                yield prefix + name, sha
+
+    def commit(self, revision: str) -> Tuple[str, str, List[str], int]:
+        """Returns (sha, tree sha, parent shas, committer timestamp) of a commit."""
+        _, sha, content = self.read(revision + "^{commit}")
+        tree, parents, timestamp = "", [], 0
+        for line in content.split(b"\n"):
+            if not line:
+                break       # end of the headers; the message follows
+            key, _, value = line.partition(b" ")
+            if key == b"tree":
+                tree = value.decode()
+            elif key == b"parent":
+                parents.append(value.decode())
+            elif key == b"committer":
+                timestamp = int(value.rsplit(b" ", 2)[1])
+        return sha, tree, parents, timestamp
+
+    def close(self):
+        if self.process.poll() is None:
+            self.process.stdin.close()
+            self.process.wait()
+        self.process.stdout.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+# --- Main Execution ---
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "ls":
+        try:
+            with GitObjects(sys.argv[2]) as git:
+                for path, sha in git.iter_tree(git.tree_of(sys.argv[3])):
+                    print(f"{sha}  {path}")
+        except GitError as e:
+            print(f"Error: {e}", file=sys.stderr)
+    else:
+        print("Usage: python GitObjects.py ls <repo> <revision>")
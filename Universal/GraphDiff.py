@@ -0,0 +1,153 @@
+# Canonical graph snapshots and a linear-time diff between two of them.
+#
+# UniversalGraph.py and newUniversalGraph.py write '<output>.edges' next to the
+# rendered graph: one line per node and edge, each with a 64-bit content hash,
+# sorted by hash so the file does not depend on traversal order. To compare two
+# analysis runs (e.g. the base and head of a PR), execute from your terminal:
+#    python GraphDiff.py base/dependencies.edges head/dependencies.edges [graph_diff.json]
+
+import hashlib
+import json
+import sys
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from GraphAnalytics import CSRGraph, strongly_connected_components
+
+# v2: a node's hash covers its type as well as its name
+SNAPSHOT_HEADER = "# dependency-graph snapshot v2"
+
+def item_hash(*fields: str) -> str:
+    return hashlib.blake2b("\0".join(fields).encode('utf-8'), digest_size=8).hexdigest()
+
+# --- Snapshots ---
+
+def write_snapshot(graph, output_path: str):
+    """Writes the canonical, hashed node and edge list of a DependencyGraph."""
+    names = graph.node_names
+    nodes = sorted((item_hash(node_type, name), node_type, name) for _, name, _, node_type in graph.iter_nodes() if node_type != "implicit")
+    edges = sorted((item_hash(names[src], label, names[dst]), label, names[src], names[dst])
+                   for src, dst, label in graph.iter_edges())
+    digest = hashlib.blake2b(digest_size=16)
+    for row in nodes:
+        digest.update(row[0].encode('ascii'))
+    for row in edges:
+        digest.update(row[0].encode('ascii'))
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(f"{SNAPSHOT_HEADER} {digest.hexdigest()}\n")
+        f.writelines(f"N\t{h}\t{node_type}\t{name}\n" for h, node_type, name in nodes)
+        f.writelines(f"E\t{h}\t{label}\t{src}\t{dst}\n" for h, label, src, dst in edges)
+    print(f"✅ Graph snapshot ({len(nodes)} nodes, {len(edges)} edges) saved to: {output_path}")
+
+class Snapshot:
+    """A loaded snapshot: nodes and edges keyed by their hash."""
+    def __init__(self, path: str):
+        self.digest = ""
+        self.nodes: Dict[str, Tuple[str, str]] = {}             # hash -> (name, type)
+        self.edges: Dict[str, Tuple[str, str, str]] = {}        # hash -> (source, label, target)
+        with open(path, 'r', encoding='utf-8') as f:
+            header = f.readline().rstrip("\n")
+            if not header.startswith(SNAPSHOT_HEADER):
+                raise ValueError(f"{path} is not a graph snapshot")
+            self.digest = header[len(SNAPSHOT_HEADER):].strip()
+            for line in f:
+                fields = line.rstrip("\n").split("\t")
+                if fields[0] == "N":
+                    self.nodes[fields[1]] = (fields[3], fields[2])
+                elif fields[0] == "E":
+                    self.edges[fields[1]] = (fields[3], fields[2], fields[4])
+
+    def import_edges(self) -> Iterable[Tuple[str, str]]:
+        return ((src, dst) for src, label, dst in self.edges.values() if label == "imports")
+
+# --- Metrics ---
+
+def fan_counts(edges: Iterable[Tuple[str, str]]) -> Tuple[Dict[str, int], Dict[str, int]]:
+    fan_in: Dict[str, int] = {}
+    fan_out: Dict[str, int] = {}
+    for src, dst in edges:
+        fan_out[src] = fan_out.get(src, 0) + 1
+        fan_in[dst] = fan_in.get(dst, 0) + 1
+    return fan_in, fan_out
+
+def import_cycles(edges: Iterable[Tuple[str, str]]) -> Set[Tuple[str, ...]]:
+    """Every import cycle (SCC with more than one node, or a self-import) as a sorted tuple of names."""
+    ids: Dict[str, int] = {}
+    names: List[str] = []
+    sources, destinations = array('I'), array('I')
+    self_loops = set()
+    for src, dst in edges:
+        for name in (src, dst):
+            if name not in ids:
+                ids[name] = len(names)
+                names.append(name)
+        if src == dst:
+            self_loops.add((src,))
+        sources.append(ids[src])
+        destinations.append(ids[dst])
+    component = strongly_connected_components(CSRGraph.from_edges(len(names), sources, destinations))
+    members: Dict[int, List[str]] = {}
+    for nid, name in enumerate(names):
+        members.setdefault(component[nid], []).append(name)
+    return {tuple(sorted(group)) for group in members.values() if len(group) > 1} | self_loops
+
+def changed_counts(old: Dict[str, int], new: Dict[str, int]) -> Dict[str, List[int]]:
+    return {name: [old.get(name, 0), new.get(name, 0)]
+            for name in sorted(old.keys() | new.keys()) if old.get(name, 0) != new.get(name, 0)}
+
+# --- Diff ---
+
+def diff_snapshots(old: Snapshot, new: Snapshot) -> Dict[str, Any]:
+    """Compares two snapshots with hash-set differences (linear in their size)."""
+    if old.digest and old.digest == new.digest:
+        return {"Identical": True}
+
+    old_cycles, new_cycles = import_cycles(old.import_edges()), import_cycles(new.import_edges())
+    old_in, old_out = fan_counts(old.import_edges())
+    new_in, new_out = fan_counts(new.import_edges())
+    # A node whose type changed has a new hash under the same name
+    added = dict(new.nodes[h] for h in new.nodes.keys() - old.nodes.keys())
+    removed = dict(old.nodes[h] for h in old.nodes.keys() - new.nodes.keys())
+    return {
+        "Identical": False,
+        "Nodes added": sorted(added.keys() - removed.keys()),
+        "Nodes removed": sorted(removed.keys() - added.keys()),
+        "Node type changes": {name: [removed[name], added[name]] for name in sorted(added.keys() & removed.keys())},
+        "Edges added": sorted(list(new.edges[h]) for h in new.edges.keys() - old.edges.keys()),
+        "Edges removed": sorted(list(old.edges[h]) for h in old.edges.keys() - new.edges.keys()),
+        "New cycles": sorted(list(cycle) for cycle in new_cycles - old_cycles),
+        "Resolved cycles": sorted(list(cycle) for cycle in old_cycles - new_cycles),
+        "Fan-in changes": changed_counts(old_in, new_in),
+        "Fan-out changes": changed_counts(old_out, new_out),
+    }
+
+# --- Main Execution ---
+def main(old_path: str, new_path: str, output_path: Optional[str] = None):
+    try:
+        report = diff_snapshots(Snapshot(old_path), Snapshot(new_path))
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return
+    if output_path:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Graph diff saved to: {output_path}")
+    if report["Identical"]:
+        print("Graphs are identical.")
+        return
+    for key in ("Nodes added", "Nodes removed", "Node type changes", "Edges added", "Edges removed", "New cycles", "Resolved cycles"):
+        print(f"{key}: {len(report[key])}")
+    for name, (old_type, new_type) in report["Node type changes"].items():
+        print(f"  ~ {name}: {old_type} -> {new_type}")
+    for src, label, dst in report["Edges added"]:
+        print(f"  + {src} -[{label}]-> {dst}")
+    for src, label, dst in report["Edges removed"]:
+        print(f"  - {src} -[{label}]-> {dst}")
+    for cycle in report["New cycles"]:
+        print(f"  new cycle: {', '.join(cycle)}")
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Usage: python GraphDiff.py <old.edges> <new.edges> [graph_diff.json]")
+    else:
+        main(sys.argv[1], sys.argv[2], sys.argv[3] if len(sys.argv) > 3 else None)
@@ -0,0 +1,179 @@
+# Streaming exporters for DependencyGraph: DOT, GraphML, JSON adjacency and Mermaid.
+#
+# Every exporter writes nodes and edges one line at a time straight from the
+# graph's arrays; no document is assembled in memory. With sort=True (the
+# default) the output is ordered by node name, which keeps files diffable and
+# only costs one integer sort key per edge. With sort=False edges are written in
+# insertion order with constant extra memory.
+#
+# The format is picked from the output file extension:
+#    .dot / .gv, .graphml, .json, .mmd / .mermaid
+
+import json
+import os
+from typing import Callable, Dict, Iterator, List, Tuple
+from xml.sax.saxutils import escape, quoteattr
+
+from GraphModel import IMPLICIT, NODE_STYLES, NODE_TYPE_IDS, NODE_TYPES
+
+WRITE_BUFFER_SIZE = 1 << 20
+PLAIN = NODE_TYPE_IDS["node"]
+# Mermaid node shape (open, close) and fill color per node type id, in NODE_TYPES order.
+MERMAID_SHAPES = [('["', '"]'), ('["', '"]'), ('(["', '"])'), ('[["', '"]]'), ('{{"', '"}}')]
+MERMAID_FILLS = {"plain": "#FFFFFF", "file": "#ADD8E6", "folder": "#D3D3D3", "module": "#FFA500"}
+
+# --- Ordering ---
+
+def node_order(graph, sort: bool = True) -> List[int]:
+    """All node ids, by name if sort is set. Names are compared with their closing quote, as in DOT."""
+    if not sort:
+        return list(range(graph.node_count))
+    names = graph.node_names
+    return sorted(range(graph.node_count), key=lambda nid: names[nid] + '"')
+
+def iter_edge_positions(graph, order: List[int], sort: bool = True) -> Iterator[int]:
+    """Edge positions ordered by (source, target, label) name, or in insertion order."""
+    edge_count = graph.edge_count
+    if not sort:
+        yield from range(edge_count)
+        return
+    node_count, label_count = graph.node_count, len(graph.label_names)
+    rank = [0] * node_count
+    for position, nid in enumerate(order):
+        rank[nid] = position
+    label_rank = [0] * label_count
+    for position, lid in enumerate(sorted(range(label_count), key=lambda lid: graph.label_names[lid] + '"')):
+        label_rank[lid] = position
+    # One packed integer per edge; the edge position is the lowest "digit"
+    keys = [((rank[src] * node_count + rank[dst]) * label_count + label_rank[lid]) * edge_count + position
+            for position, (src, dst, lid) in enumerate(zip(graph.edge_src, graph.edge_dst, graph.edge_label))]
+    keys.sort()
+    for key in keys:
+        yield key % edge_count
+
+def edge_weight(graph, position: int) -> int:
+    return graph.edge_weights[position] if graph.edge_weights else 1
+
+# --- DOT ---
+
+def dot_node(graph, nid: int) -> str:
+    shape, color = NODE_STYLES[graph.node_types[nid]]
+    return f'  "{graph.node_names[nid]}" [label="{graph.node_labels[nid]}", shape="{shape}", color="{color}", style=filled];'
+
+def dot_edge(graph, position: int) -> str:
+    src, dst = graph.node_names[graph.edge_src[position]], graph.node_names[graph.edge_dst[position]]
+    label, weight = graph.label_names[graph.edge_label[position]], edge_weight(graph, position)
+    if weight > 1:
+        return f'  "{src}" -> "{dst}" [label="{label} ({weight})", weight={weight}, penwidth={weight.bit_length()}];'
+    return f'  "{src}" -> "{dst}" [label="{label}"];'
+
+def write_dot(graph, f, sort: bool = True):
+    f.write('digraph G {\n  rankdir=LR;\n  node [fontname="Helvetica"];\n  edge [fontname="Helvetica"];\n')
+    f.write("\n  // --- Nodes ---\n")
+    order = node_order(graph, sort)
+    types = graph.node_types
+    f.writelines(dot_node(graph, nid) + "\n" for nid in order if types[nid] != IMPLICIT)
+    f.write("\n  // --- Edges ---\n")
+    # Unweighted edges, by far the most common, are assembled from pre-quoted parts
+    quoted = ['"' + name + '"' for name in graph.node_names]
+    suffixes = [f' [label="{label}"];\n' for label in graph.label_names]
+    edge_src, edge_dst, edge_label, weights = graph.edge_src, graph.edge_dst, graph.edge_label, graph.edge_weights
+    f.writelines(dot_edge(graph, position) + "\n" if weights and weights[position] > 1 else
+                 "  " + quoted[edge_src[position]] + " -> " + quoted[edge_dst[position]] + suffixes[edge_label[position]]
+                 for position in iter_edge_positions(graph, order, sort))
+    f.write("}")
+
+# --- GraphML ---
+
+def write_graphml(graph, f, sort: bool = True):
+    f.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n'
+            '  <key id="label" for="node" attr.name="label" attr.type="string"/>\n'
+            '  <key id="type" for="node" attr.name="type" attr.type="string"/>\n'
+            '  <key id="edge_label" for="edge" attr.name="label" attr.type="string"/>\n'
+            '  <key id="weight" for="edge" attr.name="weight" attr.type="int"/>\n'
+            '  <graph id="G" edgedefault="directed">\n')
+    names, labels, types = graph.node_names, graph.node_labels, graph.node_types
+    ids = [quoteattr(name) for name in names]
+    order = node_order(graph, sort)
+    for nid in order:
+        f.write(f'    <node id={ids[nid]}><data key="label">{escape(labels[nid])}</data>'
+                f'<data key="type">{NODE_TYPES[types[nid]]}</data></node>\n')
+    label_names = [escape(label) for label in graph.label_names]
+    for position in iter_edge_positions(graph, order, sort):
+        f.write(f'    <edge source={ids[graph.edge_src[position]]} target={ids[graph.edge_dst[position]]}>'
+                f'<data key="edge_label">{label_names[graph.edge_label[position]]}</data>'
+                f'<data key="weight">{edge_weight(graph, position)}</data></edge>\n')
+    f.write('  </graph>\n</graphml>\n')
+
+# --- JSON Adjacency ---
+
+def write_json_adjacency(graph, f, sort: bool = True):
+    """Writes the networkx 'adjacency_data' layout: a node list and, per node, its outgoing edges."""
+    names, labels, types = graph.node_names, graph.node_labels, graph.node_types
+    order = node_order(graph, sort)
+    f.write('{"directed": true, "multigraph": false, "graph": {}, "nodes": [')
+    for i, nid in enumerate(order):
+        f.write((",\n  " if i else "\n  ") + json.dumps({"id": names[nid], "label": labels[nid], "type": NODE_TYPES[types[nid]]}))
+
+    # Group edge positions by source in a single pass (counting sort), keeping their order
+    offsets = [0] * (graph.node_count + 1)
+    for src in graph.edge_src:
+        offsets[src + 1] += 1
+    for nid in range(graph.node_count):
+        offsets[nid + 1] += offsets[nid]
+    grouped = [0] * graph.edge_count
+    fill = offsets[:-1]
+    for position in iter_edge_positions(graph, order, sort):
+        src = graph.edge_src[position]
+        grouped[fill[src]] = position
+        fill[src] += 1
+
+    f.write('\n], "adjacency": [')
+    encoded_names = [json.dumps(name) for name in names]
+    encoded_labels = [json.dumps(label) for label in graph.label_names]
+    edge_dst, edge_label = graph.edge_dst, graph.edge_label
+    for i, nid in enumerate(order):
+        targets = ", ".join(f'{{"id": {encoded_names[edge_dst[p]]}, "label": {encoded_labels[edge_label[p]]}, "weight": {edge_weight(graph, p)}}}'
+                            for p in grouped[offsets[nid]:offsets[nid + 1]])
+        f.write(("],\n  [" if i else "\n  [") + targets)
+    f.write("]\n]}\n" if order else "\n]}\n")
+
+# --- Mermaid ---
+
+def mermaid_text(text: str) -> str:
+    return text.replace('"', "#quot;")
+
+def write_mermaid(graph, f, sort: bool = True):
+    f.write("flowchart LR\n")
+    for node_type, fill in MERMAID_FILLS.items():
+        f.write(f"    classDef {node_type} fill:{fill},stroke:#333,color:#000;\n")
+    names, labels, types = graph.node_names, graph.node_labels, graph.node_types
+    order = node_order(graph, sort)
+    for nid in order:
+        opening, closing = MERMAID_SHAPES[types[nid]]
+        css_class = NODE_TYPES[types[nid]] if types[nid] not in (IMPLICIT, PLAIN) else "plain"
+        f.write(f"    n{nid}{opening}{mermaid_text(labels[nid])}{closing}:::{css_class}\n")
+    for position in iter_edge_positions(graph, order, sort):
+        label, weight = graph.label_names[graph.edge_label[position]], edge_weight(graph, position)
+        if weight > 1:
+            label = f"{label} ({weight})"
+        f.write(f'    n{graph.edge_src[position]} -->|"{mermaid_text(label)}"| n{graph.edge_dst[position]}\n')
+
+# --- Dispatch ---
+
+EXPORTERS: Dict[str, Tuple[str, Callable]] = {
+    ".dot": ("DOT", write_dot),
+    ".gv": ("DOT", write_dot),
+    ".graphml": ("GraphML", write_graphml),
+    ".json": ("JSON adjacency", write_json_adjacency),
+    ".mmd": ("Mermaid", write_mermaid),
+    ".mermaid": ("Mermaid", write_mermaid),
+}
+
+def export_graph(graph, output_path: str, sort: bool = True):
+    """Streams the graph to output_path in the format given by its extension (DOT if unknown)."""
+    format_name, writer = EXPORTERS.get(os.path.splitext(output_path)[1].lower(), EXPORTERS[".dot"])
+    with open(output_path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+        writer(graph, f, sort)
+    print(f"\n✅ Successfully generated rich dependency graph ({format_name}) at: {output_path}")
@@ -0,0 +1,276 @@
+# Persistent forward/reverse dependency index for impact queries.
+#
+# UniversalGraph.py and newUniversalGraph.py save every graph they build to
+# '<output>.index.db' (SQLite). Queries then run against the indexed edge table
+# without loading or re-parsing any AST:
+#    python GraphIndex.py dependencies.index.db dependents src/config.js --transitive
+#    python GraphIndex.py dependencies.index.db dependencies src/App.js
+#
+# The index also records which file owns every edge (see GraphModel.edge_owner)
+# and each file's raw imports, so update_graph_index can refresh the graph for a
+# few changed files without rebuilding it.
+
+import os
+import sqlite3
+import sys
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from GraphModel import NODE_TYPE_IDS, NODE_TYPE_PRIORITY, DependencyGraph, edge_owner
+from ImportResolver import ImportResolver
+
+SCHEMA = """
+CREATE TABLE nodes (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE, label TEXT, type TEXT);
+CREATE TABLE labels (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+CREATE TABLE edges (src INTEGER NOT NULL, dst INTEGER NOT NULL, label INTEGER NOT NULL, owner INTEGER NOT NULL);
+CREATE TABLE file_imports (file INTEGER NOT NULL, position INTEGER NOT NULL, import_path TEXT NOT NULL);
+"""
+# Created after the bulk insert, which is much faster than maintaining them row by row.
+INDEXES = """
+CREATE UNIQUE INDEX edges_forward ON edges (src, label, dst);
+CREATE INDEX edges_reverse ON edges (dst, label, src);
+CREATE INDEX edges_owner ON edges (owner);
+CREATE INDEX file_imports_file ON file_imports (file, position);
+"""
+
+def save_graph_index(graph, db_path: str):
+    """Writes a DependencyGraph to a fresh SQLite index, replacing any previous one atomically."""
+    temp_path = db_path + ".tmp"
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+    connection = sqlite3.connect(temp_path)
+    try:
+        connection.executescript("PRAGMA journal_mode=OFF; PRAGMA synchronous=OFF;" + SCHEMA)
+        connection.executemany("INSERT INTO nodes VALUES (?, ?, ?, ?)", graph.iter_nodes())
+        connection.executemany("INSERT INTO labels VALUES (?, ?)", enumerate(graph.label_names))
+        label_names = graph.label_names
+        connection.executemany("INSERT INTO edges VALUES (?, ?, ?, ?)",
+                               ((src, dst, lid, edge_owner(src, dst, label_names[lid]))
+                                for src, dst, lid in zip(graph.edge_src, graph.edge_dst, graph.edge_label)))
+        connection.executemany("INSERT INTO file_imports VALUES (?, ?, ?)",
+                               ((graph.node_ids[file], position, import_path)
+                                for file, import_paths in graph.file_imports.items()
+                                for position, import_path in enumerate(import_paths)))
+        connection.executescript(INDEXES)
+        connection.commit()
+    finally:
+        connection.close()
+    os.replace(temp_path, db_path)
+    print(f"✅ Dependency index saved to: {db_path}")
+
+def load_dependency_graph(connection: sqlite3.Connection) -> DependencyGraph:
+    """Rebuilds the in-memory DependencyGraph stored in an index."""
+    graph = DependencyGraph()
+    names = {}
+    for nid, name, label, node_type in connection.execute("SELECT id, name, label, type FROM nodes ORDER BY id"):
+        graph.add_node(name, label, node_type)
+        names[nid] = name
+    labels = dict(connection.execute("SELECT id, name FROM labels"))
+    for src, dst, lid in connection.execute("SELECT src, dst, label FROM edges ORDER BY rowid"):
+        graph.add_edge(names[src], names[dst], labels[lid])
+    for file, import_path in connection.execute("SELECT file, import_path FROM file_imports ORDER BY file, position"):
+        graph.file_imports.setdefault(names[file], []).append(import_path)
+    return graph
+
+# --- Incremental Updates ---
+
+class IndexUpdater:
+    """Applies node and owned-edge changes to an open index."""
+    def __init__(self, connection: sqlite3.Connection):
+        self.connection = connection
+        self.label_ids: Dict[str, int] = {}
+
+    def label_id(self, label: str) -> int:
+        if label not in self.label_ids:
+            self.connection.execute("INSERT OR IGNORE INTO labels (name) VALUES (?)", (label,))
+            self.label_ids[label] = self.connection.execute("SELECT id FROM labels WHERE name = ?", (label,)).fetchone()[0]
+        return self.label_ids[label]
+
+    def add_node(self, name: str, label: str, node_type: str) -> int:
+        """Same rules as DependencyGraph.add_node: an existing node only changes to a higher priority type."""
+        row = self.connection.execute("SELECT id, type FROM nodes WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            return self.connection.execute("INSERT INTO nodes (name, label, type) VALUES (?, ?, ?)",
+                                           (name, label, node_type)).lastrowid
+        nid, current_type = row
+        if NODE_TYPE_PRIORITY[NODE_TYPE_IDS[node_type]] > NODE_TYPE_PRIORITY[NODE_TYPE_IDS[current_type]]:
+            self.connection.execute("UPDATE nodes SET label = ?, type = ? WHERE id = ?", (label, node_type, nid))
+        return nid
+
+    def add_edge(self, src: int, dst: int, label: str):
+        self.connection.execute("INSERT OR IGNORE INTO edges VALUES (?, ?, ?, ?)",
+                                (src, dst, self.label_id(label), edge_owner(src, dst, label)))
+
+    def add_file(self, name: str) -> int:
+        """Adds a file node and its folder chain, each owning the 'contains' edge from its parent."""
+        nid = self.add_node(name, os.path.basename(name), "file")
+        parts = name.split("/")
+        parent = None
+        for i in range(1, len(parts)):
+            folder = self.add_node("/".join(parts[:i]), parts[i - 1], "folder")
+            if parent is not None:
+                self.add_edge(parent, folder, "contains")
+            parent = folder
+        if parent is not None:
+            self.add_edge(parent, nid, "contains")
+        return nid
+
+    def remove_node(self, nid: int):
+        self.connection.execute("DELETE FROM edges WHERE owner = ?", (nid,))
+        self.connection.execute("DELETE FROM file_imports WHERE file = ?", (nid,))
+        self.connection.execute("DELETE FROM nodes WHERE id = ?", (nid,))
+
+    def set_file_imports(self, nid: int, import_paths: List[str]):
+        self.connection.execute("DELETE FROM file_imports WHERE file = ?", (nid,))
+        self.connection.executemany("INSERT INTO file_imports VALUES (?, ?, ?)",
+                                    ((nid, position, path) for position, path in enumerate(import_paths)))
+
+    def relink_file(self, nid: int, name: str, resolver: ImportResolver, import_targets):
+        """Replaces a file's owned 'imports' edges from its stored raw imports."""
+        self.connection.execute("DELETE FROM edges WHERE owner = ? AND label = ?", (nid, self.label_id("imports")))
+        import_paths = [row[0] for row in self.connection.execute(
+            "SELECT import_path FROM file_imports WHERE file = ? ORDER BY position", (nid,))]
+        for import_path in import_paths:
+            for target, target_type in import_targets(name, import_path, resolver):
+                self.add_edge(nid, self.add_node(target, target, target_type), "imports")
+
+    def collect_garbage(self):
+        """
+        Removes module placeholders nothing imports any more and folders left
+        without children. An empty folder that is still imported by name turns
+        back into the 'module' placeholder a full rebuild would create.
+        """
+        self.connection.execute("DELETE FROM nodes WHERE type IN ('module', 'implicit') AND id NOT IN (SELECT dst FROM edges)")
+        contains, imports = self.label_id("contains"), self.label_id("imports")
+        while True:
+            empty = [row[0] for row in self.connection.execute(
+                "SELECT id FROM nodes WHERE type = 'folder' AND id NOT IN (SELECT src FROM edges WHERE label = ?)", (contains,))]
+            if not empty:
+                break
+            for nid in empty:
+                if self.connection.execute("SELECT 1 FROM edges WHERE dst = ? AND label = ? LIMIT 1", (nid, imports)).fetchone():
+                    self.connection.execute("DELETE FROM edges WHERE owner = ?", (nid,))
+                    self.connection.execute("UPDATE nodes SET label = name, type = 'module' WHERE id = ?", (nid,))
+                else:
+                    self.remove_node(nid)
+
+def update_graph_index(db_path: str, ast_dir: str, changed_files: Iterable[str],
+                       read_imports: Callable[[str], List[str]],
+                       import_targets: Callable[[str, str, ImportResolver], List[Tuple[str, str]]]) -> DependencyGraph:
+    """
+    Refreshes a saved graph for the given changed, added or removed AST files
+    (paths relative to ast_dir, with or without the '.json' suffix) and returns it.
+
+    Only the changed files' ASTs are read and only the edges they own are
+    replaced. When files were added or removed, the other files' stored raw imports
+    are re-resolved against the new file list (no AST is read for them).
+    """
+    connection = sqlite3.connect(db_path)
+    try:
+        updater = IndexUpdater(connection)
+        files = dict(connection.execute("SELECT name, id FROM nodes WHERE type = 'file'"))
+        names = {name.replace("\\", "/") for name in changed_files}
+        names = sorted(name[:-len(".json")] if name.endswith(".json") else name for name in names)
+
+        present, file_set_changed = [], False
+        for name in names:
+            ast_path = os.path.join(ast_dir, name + ".json")
+            if not os.path.isfile(ast_path):
+                if name in files:
+                    updater.remove_node(files.pop(name))
+                    file_set_changed = True
+                continue
+            if name not in files:
+                file_set_changed = True
+            nid = files[name] = updater.add_file(name)
+            try:
+                import_paths = read_imports(ast_path)
+            except Exception as e:
+                print(f"\n❌ Failed to analyze file: {ast_path}. Reason: {e}", file=sys.stderr)
+                import_paths = []
+            updater.set_file_imports(nid, import_paths)
+            present.append(name)
+
+        resolver = ImportResolver(files)
+        # A new or deleted file can change what any other file's imports resolve to
+        for name in (sorted(files) if file_set_changed else present):
+            updater.relink_file(files[name], name, resolver, import_targets)
+        updater.collect_garbage()
+        connection.commit()
+        print(f"✅ Dependency index updated for {len(names)} changed files: {db_path}")
+        return load_dependency_graph(connection)
+    finally:
+        connection.close()
+
+class GraphIndex:
+    """Read-only queries over a saved dependency index."""
+    def __init__(self, db_path: str):
+        if not os.path.isfile(db_path):
+            raise FileNotFoundError(db_path)
+        self.connection = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+
+    def close(self):
+        self.connection.close()
+
+    def node_id(self, name: str) -> Optional[int]:
+        """Finds a node by exact name, or by a unique path suffix ('config.js' -> 'src/config.js')."""
+        row = self.connection.execute("SELECT id FROM nodes WHERE name = ?", (name,)).fetchone()
+        if row:
+            return row[0]
+        rows = self.connection.execute("SELECT id FROM nodes WHERE name LIKE ? ESCAPE '\\'",
+                                       ('%/' + name.replace('%', '\\%').replace('_', '\\_'),)).fetchall()
+        return rows[0][0] if len(rows) == 1 else None
+
+    def label_id(self, label: str) -> int:
+        row = self.connection.execute("SELECT id FROM labels WHERE name = ?", (label,)).fetchone()
+        return row[0] if row else -1
+
+    def query(self, name: str, reverse: bool, transitive: bool, label: str = "imports") -> List[str]:
+        nid = self.node_id(name)
+        if nid is None:
+            raise KeyError(name)
+        near, far = ("dst", "src") if reverse else ("src", "dst")
+        if transitive:
+            sql = f"""
+                WITH RECURSIVE reached(id) AS (
+                    SELECT {far} FROM edges WHERE {near} = :node AND label = :label
+                    UNION
+                    SELECT edges.{far} FROM edges JOIN reached ON edges.{near} = reached.id WHERE edges.label = :label
+                )
+                SELECT nodes.name FROM reached JOIN nodes ON nodes.id = reached.id ORDER BY nodes.name"""
+        else:
+            sql = f"""
+                SELECT nodes.name FROM edges JOIN nodes ON nodes.id = edges.{far}
+                WHERE edges.{near} = :node AND edges.label = :label ORDER BY nodes.name"""
+        return [row[0] for row in self.connection.execute(sql, {"node": nid, "label": self.label_id(label)})]
+
+    def dependents(self, name: str, transitive: bool = False) -> List[str]:
+        """Files that import the given file (directly, or through any chain of imports)."""
+        return self.query(name, reverse=True, transitive=transitive)
+
+    def dependencies(self, name: str, transitive: bool = False) -> List[str]:
+        """Files and modules the given file imports (directly, or through any chain of imports)."""
+        return self.query(name, reverse=False, transitive=transitive)
+
+# --- Main Execution ---
+def main(db_path: str, direction: str, name: str, transitive: bool):
+    try:
+        index = GraphIndex(db_path)
+    except FileNotFoundError:
+        print("Error: Index file not found.", file=sys.stderr)
+        return
+    try:
+        results = index.dependents(name, transitive) if direction == "dependents" else index.dependencies(name, transitive)
+    except KeyError:
+        print(f"Error: '{name}' is not a node of the index (or matches several).", file=sys.stderr)
+        return
+    finally:
+        index.close()
+    for result in results:
+        print(result)
+
+if __name__ == "__main__":
+    args = [a for a in sys.argv[1:] if a != "--transitive"]
+    if len(args) != 3 or args[1] not in ("dependents", "dependencies"):
+        print("Usage: python GraphIndex.py <index.db> <dependents|dependencies> <file> [--transitive]")
+    else:
+        main(args[0], args[1], args[2], "--transitive" in sys.argv)
@@ -0,0 +1,247 @@
+# Shared graph model for UniversalGraph.py and newUniversalGraph.py.
+#
+# Nodes are interned to integer ids the first time they are seen and keep their
+# attributes in parallel arrays; edges are stored as packed (src, dst, label-id)
+# arrays and de-duplicated through a set of integer keys. Nothing is formatted
+# while the graph is built: DOT and the other formats in GraphExport.py are
+# streamed at output time.
+
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+# 'implicit' nodes were only seen as an edge endpoint and are not declared in the output.
+NODE_TYPES = ["implicit", "node", "file", "folder", "module"]
+NODE_TYPE_IDS = {name: type_id for type_id, name in enumerate(NODE_TYPES)}
+IMPLICIT, FILE, FOLDER = NODE_TYPE_IDS["implicit"], NODE_TYPE_IDS["file"], NODE_TYPE_IDS["folder"]
+# DOT (shape, color) per node type id, in NODE_TYPES order.
+NODE_STYLES = [None, ("box", "black"), ("ellipse", "lightblue"), ("folder", "gray"), ("component", "orange")]
+# When a node id is added again with another type, the higher priority type is kept,
+# so a real file always wins over a 'module' placeholder of the same path.
+NODE_TYPE_PRIORITY = [0, 1, 4, 3, 2]
+
+def edge_owner(src: int, dst: int, label: str) -> int:
+    """
+    The node whose analysis produced an edge: a file owns its outgoing 'imports'
+    edges, and every file or folder owns the 'contains' edge linking it to its parent.
+    """
+    return dst if label == "contains" else src
+
+class DependencyGraph:
+    """A class to build and manage the dependency graph."""
+    def __init__(self):
+        # Node attribute arrays, indexed by node id
+        self.node_ids: Dict[str, int] = {}
+        self.node_names: List[str] = []
+        self.node_labels: List[str] = []
+        self.node_types = array('B')
+
+        # Edge arrays, indexed by edge position
+        self.edge_src = array('I')
+        self.edge_dst = array('I')
+        self.edge_label = array('H')
+        self.edge_keys: Set[int] = set()
+        # How many original edges each edge stands for; only set on collapsed views
+        self.edge_weights: Optional[array] = None
+
+        self.label_ids: Dict[str, int] = {}
+        self.label_names: List[str] = []
+        self.path_aliases = {}
+        # Raw import strings per file, kept so a saved graph can be re-linked without its ASTs
+        self.file_imports: Dict[str, List[str]] = {}
+
+    @property
+    def node_count(self) -> int:
+        return len(self.node_names)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.edge_src)
+
+    def intern(self, node_id: str) -> int:
+        """Returns the integer id of a node, creating an implicit node if it is new."""
+        nid = self.node_ids.get(node_id)
+        if nid is None:
+            nid = len(self.node_names)
+            self.node_ids[node_id] = nid
+            self.node_names.append(node_id)
+            self.node_labels.append(node_id)
+            self.node_types.append(IMPLICIT)
+        return nid
+
+    def intern_label(self, label: str) -> int:
+        lid = self.label_ids.get(label)
+        if lid is None:
+            lid = len(self.label_names)
+            self.label_ids[label] = lid
+            self.label_names.append(label)
+        return lid
+
+    def add_node(self, node_id: str, label: str, node_type: str) -> int:
+        nid = self.node_ids.get(node_id)
+        type_id = NODE_TYPE_IDS.get(node_type, NODE_TYPE_IDS["node"])
+        if nid is None:
+            nid = self.intern(node_id)
+        elif self.node_types[nid] == type_id or NODE_TYPE_PRIORITY[type_id] < NODE_TYPE_PRIORITY[self.node_types[nid]]:
+            return nid
+        self.node_labels[nid] = label
+        self.node_types[nid] = type_id
+        return nid
+
+    def add_edge(self, source: str, target: str, label: str) -> bool:
+        """Adds an edge once; returns False if the same (source, target, label) already exists."""
+        node_ids = self.node_ids
+        src = node_ids.get(source)
+        if src is None:
+            src = self.intern(source)
+        dst = node_ids.get(target)
+        if dst is None:
+            dst = self.intern(target)
+        lid = self.label_ids.get(label)
+        if lid is None:
+            lid = self.intern_label(label)
+        key = (((src << 32) | dst) << 16) | lid
+        if key in self.edge_keys:
+            return False
+        self.edge_keys.add(key)
+        self.edge_src.append(src)
+        self.edge_dst.append(dst)
+        self.edge_label.append(lid)
+        return True
+
+    def add_folder_hierarchy(self, file_label: str):
+        """Creates nodes for each part of a file's path and connects them."""
+        folder = file_label.rpartition("/")[0]
+        nid = self.node_ids.get(folder)
+        if nid is not None and self.node_types[nid] == FOLDER:
+            # The whole folder chain already exists; only the file link is new
+            self.add_edge(folder, file_label, "contains")
+            return
+
+        parts = file_label.split("/")
+        parent = None
+        current_path = ""
+
+        # Iterate through folders, but not the filename itself
+        for part in parts[:-1]:
+            current_path = f"{current_path}/{part}" if current_path else part
+            nid = self.node_ids.get(current_path)
+            if nid is not None and self.node_types[nid] == FOLDER:
+                # This folder and its ancestors were already linked by an earlier file
+                parent = current_path
+                continue
+            self.add_node(current_path, part, "folder")
+            if parent:
+                self.add_edge(parent, current_path, "contains")
+            parent = current_path
+
+        # Link the last folder to the file
+        if parent:
+            self.add_edge(parent, file_label, "contains")
+
+    def add_imports(self, source: str, targets: Iterable[Tuple[str, str]]):
+        """Adds 'imports' edges from a file to (target, node type) pairs; 'module' targets get a node."""
+        for target, target_type in targets:
+            if target_type == "module":
+                self.add_node(target, target, "module")
+            self.add_edge(source, target, "imports")
+
+    # --- Iteration ---
+
+    def iter_nodes(self) -> Iterator[Tuple[int, str, str, str]]:
+        """Yields (node id, name, label, node type) for every node."""
+        for nid, name in enumerate(self.node_names):
+            yield nid, name, self.node_labels[nid], NODE_TYPES[self.node_types[nid]]
+
+    def iter_edges(self) -> Iterator[Tuple[int, int, str]]:
+        """Yields (source id, target id, label) for every edge."""
+        label_names = self.label_names
+        for src, dst, lid in zip(self.edge_src, self.edge_dst, self.edge_label):
+            yield src, dst, label_names[lid]
+
+    # --- Level of Detail ---
+
+    def collapse(self, depth: Optional[int] = None, max_nodes: Optional[int] = None, focus: Optional[str] = None) -> "DependencyGraph":
+        """
+        Returns an overview where every file and folder is merged into its ancestor
+        folder `depth` levels deep. With `focus`, the depth counts from that folder
+        and everything outside it is merged into top-level folders. With `max_nodes`,
+        the deepest level whose view fits the budget is used (capped by `depth`).
+        Edges are aggregated in one pass and edge_weights counts the merged edges.
+        """
+        names, types = self.node_names, self.node_types
+        focus = focus.strip("/") if focus else None
+        focus_levels = focus.count("/") + 1 if focus else 0
+
+        # Path level of each file/folder (0 for modules) and whether it lies in the focused subtree
+        levels = [0] * self.node_count
+        inside = [True] * self.node_count
+        for nid, name in enumerate(names):
+            if types[nid] == FILE or types[nid] == FOLDER:
+                levels[nid] = name.count("/") + 1
+                if focus and name != focus and not name.startswith(focus + "/"):
+                    inside[nid] = False
+
+        if max_nodes is not None:
+            # Every folder prefix is a node itself, so the view at level d has one node
+            # per file/folder at most d levels below the focus, plus the fixed rest.
+            per_level: Dict[int, int] = {}
+            fixed = 0
+            for nid in range(self.node_count):
+                if types[nid] == IMPLICIT:
+                    continue
+                if levels[nid] and inside[nid]:
+                    relative = max(levels[nid] - focus_levels, 0)
+                    per_level[relative] = per_level.get(relative, 0) + 1
+                elif not levels[nid] or levels[nid] == 1:
+                    fixed += 1
+            chosen, total = 1, fixed + per_level.get(0, 0)
+            for level in range(1, max(per_level, default=0) + 1):
+                total += per_level.get(level, 0)
+                if total > max_nodes or (depth is not None and level > depth):
+                    break
+                chosen = level
+            depth = chosen
+        depth = max(depth or 1, 1)
+
+        # Representative node of every node
+        representative = array('I', range(self.node_count))
+        merged_files: Dict[int, int] = {}
+        for nid, name in enumerate(names):
+            if not levels[nid]:
+                continue
+            keep = focus_levels + depth if inside[nid] else 1
+            if levels[nid] > keep:
+                rep = self.node_ids.get("/".join(name.split("/")[:keep]), nid)
+                representative[nid] = rep
+                if types[nid] == FILE:
+                    merged_files[rep] = merged_files.get(rep, 0) + 1
+
+        view = DependencyGraph()
+        for nid in sorted(set(representative)):
+            label = self.node_labels[nid]
+            if nid in merged_files:
+                label = f"{label} ({merged_files[nid]} files)"
+            view.add_node(names[nid], label, NODE_TYPES[types[nid]])
+
+        # One pass over the edge arrays; edges inside a merged node disappear
+        counts: Dict[int, int] = {}
+        for src, dst, lid in zip(self.edge_src, self.edge_dst, self.edge_label):
+            rep_src, rep_dst = representative[src], representative[dst]
+            if rep_src != rep_dst:
+                key = (((rep_src << 32) | rep_dst) << 16) | lid
+                counts[key] = counts.get(key, 0) + 1
+        view.edge_weights = array('I')
+        for key, count in counts.items():
+            view.add_edge(names[key >> 48], names[(key >> 16) & 0xFFFFFFFF], self.label_names[key & 0xFFFF])
+            view.edge_weights.append(count)
+        return view
+
+    # --- Output ---
+
+    def generate_dot_file(self, output_path: str):
+        """Generates and saves the final .dot file."""
+        # Imported here because GraphExport depends on the constants of this module
+        from GraphExport import write_dot
+        with open(output_path, 'w', encoding='utf-8') as f:
+            write_dot(self, f)
+        print(f"\n✅ Successfully generated rich dependency graph at: {output_path}")
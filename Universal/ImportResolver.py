@@ -0,0 +1,157 @@
+# Resolves raw import strings ("./utils", ".models", "com.acme.models.User",
+# "First_Backend.Models") to the files that exist in an AST directory.
+#
+# The index is built once per project from the file listing alone (no AST is
+# loaded and no filesystem probing happens per import); every import is then
+# resolved with a few dict lookups and memoized per (importing folder, import).
+
+import os
+import posixpath
+from typing import Dict, Iterable, List, Tuple
+
+JS_EXTENSIONS = ('.js', '.jsx', '.ts', '.tsx', '.mjs', '.cjs')
+DOTTED_EXTENSIONS = ('.py', '.java', '.cs')
+INDEX_NAMES = ('index', '__init__')
+FRAMEWORK_NAMESPACES = {'System', 'Microsoft', 'Windows', 'Newtonsoft', 'NUnit', 'Xunit'}
+
+def language_of(path: str) -> str:
+    extension = os.path.splitext(path)[1]
+    if extension in JS_EXTENSIONS:
+        return 'javascript'
+    return {'.py': 'python', '.java': 'java', '.cs': 'c_sharp'}.get(extension, '')
+
+def common_prefix_length(a: str, b: str) -> int:
+    length = 0
+    for part_a, part_b in zip(a.split('/'), b.split('/')):
+        if part_a != part_b:
+            break
+        length += 1
+    return length
+
+class ImportResolver:
+    """A precomputed path/package index over the source files of one project."""
+    def __init__(self, source_files: Iterable[str]):
+        self.files = set()
+        self.module_index: Dict[str, List[str]] = {}   # extension-less path -> files ('src/store' -> index.js)
+        self.dotted_index: Dict[str, List[str]] = {}   # dotted module/class suffix -> files
+        self.package_index: Dict[str, List[str]] = {}  # dotted folder suffix -> files in that folder
+        self.src_roots: Dict[str, str] = {}            # importing folder -> its 'src' root, for '@/' aliases
+        self.cache: Dict[Tuple[str, str], List[str]] = {}
+        for path in source_files:
+            self.add_file(path.replace("\\", "/"))
+
+    @classmethod
+    def from_ast_dir(cls, ast_dir: str) -> "ImportResolver":
+        """Indexes every '<source>.json' AST file name under ast_dir."""
+        files = []
+        for root, _, names in os.walk(ast_dir):
+            for name in names:
+                if name.endswith('.json'):
+                    files.append(os.path.relpath(os.path.join(root, name), ast_dir)[:-len('.json')])
+        return cls(files)
+
+    def add_file(self, path: str):
+        self.files.add(path)
+        stem, extension = os.path.splitext(path)
+        folder, _, base = stem.rpartition('/')
+        self.module_index.setdefault(stem, []).append(path)
+        if base in INDEX_NAMES:
+            self.module_index.setdefault(folder, []).append(path)
+
+        if extension in DOTTED_EXTENSIONS:
+            parts = stem.split('/')
+            if parts[-1] == '__init__':
+                parts = parts[:-1]
+            for i in range(len(parts)):
+                self.dotted_index.setdefault('.'.join(parts[i:]), []).append(path)
+            folder_parts = folder.split('/') if folder else []
+            for i in range(len(folder_parts)):
+                self.package_index.setdefault('.'.join(folder_parts[i:]), []).append(path)
+
+    def resolve(self, importing_file: str, import_path: str) -> List[str]:
+        """Returns the project files an import refers to, or [] for external imports."""
+        importing_file = importing_file.replace("\\", "/")
+        folder = posixpath.dirname(importing_file)
+        key = (folder, import_path)
+        resolved = self.cache.get(key)
+        if resolved is None:
+            language = language_of(importing_file)
+            if language == 'javascript':
+                resolved = self.resolve_js(folder, import_path)
+            elif language == 'python':
+                resolved = self.resolve_python(folder, import_path)
+            elif language == 'java':
+                resolved = self.resolve_java(folder, import_path)
+            elif language == 'c_sharp':
+                resolved = self.resolve_csharp(import_path)
+            else:
+                resolved = []
+            self.cache[key] = resolved
+        return resolved
+
+    # --- Per-language Rules ---
+
+    def lookup_module(self, path: str) -> List[str]:
+        """Finds a file by path with or without extension, or a folder's index file."""
+        path = posixpath.normpath(path) if path else path
+        if path in self.files:
+            return [path]
+        return self.module_index.get(path, [])[:1]
+
+    def closest(self, folder: str, candidates: List[str]) -> List[str]:
+        """Picks the candidate sharing the longest folder prefix with the importing file."""
+        if len(candidates) <= 1:
+            return list(candidates)
+        return [max(candidates, key=lambda c: common_prefix_length(folder, c))]
+
+    def resolve_js(self, folder: str, specifier: str) -> List[str]:
+        if specifier.startswith('.'):
+            return self.lookup_module(posixpath.join(folder, specifier))
+        if specifier.startswith('@/') or specifier.startswith('~/'):
+            root = self.src_root(folder)
+            return self.lookup_module(posixpath.join(root, specifier[2:])) if root is not None else []
+        return []
+
+    def src_root(self, folder: str):
+        if folder not in self.src_roots:
+            parts = folder.split('/')
+            self.src_roots[folder] = '/'.join(parts[:parts.index('src') + 1]) if 'src' in parts else None
+        return self.src_roots[folder]
+
+    def resolve_python(self, folder: str, module: str) -> List[str]:
+        if module.startswith('.'):
+            level = len(module) - len(module.lstrip('.'))
+            base = folder.split('/') if folder else []
+            if level > 1:
+                base = base[:len(base) - (level - 1)]
+            parts = base + [p for p in module[level:].split('.') if p]
+            return self.lookup_module('/'.join(parts))
+        return self.closest(folder, self.dotted_index.get(module, []))
+
+    def resolve_java(self, folder: str, name: str) -> List[str]:
+        if name.endswith('.*'):
+            return sorted(self.package_index.get(name[:-2], []))
+        found = self.closest(folder, self.dotted_index.get(name, []))
+        if not found and name in self.package_index:
+            # On-demand import whose '.*' the import selector does not capture
+            return sorted(self.package_index[name])
+        if not found and '.' in name:
+            # Static import of a member: com.acme.Util.helper -> com.acme.Util
+            found = self.closest(folder, self.dotted_index.get(name.rsplit('.', 1)[0], []))
+        return found
+
+    def resolve_csharp(self, namespace: str) -> List[str]:
+        """
+        Maps a namespace to the files of the folder it corresponds to. The first
+        component is treated as the project's root namespace and may be dropped
+        (First_Backend.Models -> Models/), except for framework namespaces.
+        """
+        parts = namespace.split('.')
+        candidates = [namespace]
+        if len(parts) > 1 and parts[0] not in FRAMEWORK_NAMESPACES:
+            candidates.append('.'.join(parts[1:]))
+        for candidate in candidates:
+            files = self.package_index.get(candidate)
+            if files:
+                return sorted(files)
+        return []
@@ -0,0 +1,193 @@
+# Flat Arrow/Parquet tables of a project's ASTs for ad-hoc queries.
+#
+# UniversalParser.py writes them next to its report with '--tables DIR':
+#    python UniversalParser.py ./PythonAST ./python.json --tables ./tables
+#    python UniversalParser.py ./ast.pack ./javascript.json javascript --tables ./tables --format arrow
+#
+# Four tables are written, one file each (DIR/<table>.parquet or .arrow):
+#    nodes      file, node, parent, depth, type, start_row, start_col, end_row, end_col
+#    functions  file, type, name, start_row, end_row, lines, complexity
+#    imports    file, type, import, internal
+#    patterns   file, metric, value, row
+# File, type and metric columns are dictionary-encoded. They can be queried directly, e.g.
+#    duckdb -c "SELECT type, count(*) FROM 'tables/nodes.parquet' GROUP BY type ORDER BY 2 DESC"
+#    pandas.read_parquet('tables/functions.parquet').nlargest(20, 'complexity')
+#
+# pyarrow is only needed to write the files ('pip install pyarrow').
+
+import os
+import re
+from array import array
+from typing import Any, Dict, List
+
+from CallGraph import definition_name
+from UniversalParser import extract_value_by_path, find_nodes_by_type, get_config_value
+
+TABLE_FORMATS = {'parquet': '.parquet', 'arrow': '.arrow'}
+
+def pyarrow_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+# --- Columns ---
+
+def int_array(column: array):
+    """Wraps a 32-bit array('i') or array('I') as an Arrow array without copying."""
+    import pyarrow as pa
+    arrow_type = pa.int32() if column.typecode == 'i' else pa.uint32()
+    return pa.Array.from_buffers(arrow_type, len(column), [None, pa.py_buffer(column)])
+
+class DictionaryColumn:
+    """A string column kept as int32 codes into a list of distinct values."""
+    def __init__(self):
+        self.codes = array('i')
+        self.values: List[str] = []
+        self.value_codes: Dict[str, int] = {}
+
+    def append(self, value: str):
+        code = self.value_codes.get(value)
+        if code is None:
+            code = self.value_codes[value] = len(self.values)
+            self.values.append(value)
+        self.codes.append(code)
+
+    def extend(self, values: List[str]):
+        for value in values:
+            self.append(value)
+
+    def to_arrow(self):
+        import pyarrow as pa
+        return pa.DictionaryArray.from_arrays(int_array(self.codes), pa.array(self.values, pa.string()))
+
+class Table:
+    """Named columns of equal length: DictionaryColumn, array (integers) or list (strings, booleans)."""
+    def __init__(self, **columns):
+        self.columns = columns
+
+    def new_rows(self) -> Dict[str, list]:
+        """Empty per-column lists to collect rows in before they are added with extend()."""
+        return {name: [] for name in self.columns}
+
+    def convert(self, rows: Dict[str, list]) -> Dict[str, Any]:
+        """Rows collected with new_rows(), with the integer columns packed (this is where a bad value fails)."""
+        return {name: array(column.typecode, rows[name]) if isinstance(column, array) else rows[name]
+                for name, column in self.columns.items()}
+
+    def extend(self, rows: Dict[str, Any]):
+        for name, column in self.columns.items():
+            column.extend(rows[name])
+
+    def to_arrow(self):
+        import pyarrow as pa
+        arrays = []
+        for column in self.columns.values():
+            if isinstance(column, DictionaryColumn):
+                arrays.append(column.to_arrow())
+            elif isinstance(column, array):
+                arrays.append(int_array(column))
+            else:
+                arrays.append(pa.array(column))
+        return pa.Table.from_arrays(arrays, names=list(self.columns))
+
+# --- Collection ---
+
+class TableBuilder:
+    """Accumulates the rows of every table, one AST at a time, using a language configuration's selectors."""
+    def __init__(self, lang_config: Dict[str, Any]):
+        self.function_types = set(get_config_value(lang_config, 'selectors.function', []))
+        self.import_selectors = get_config_value(lang_config, 'selectors.import', [])
+        self.pattern_selectors = []
+        for metric, patterns in get_config_value(lang_config, 'selectors.patterns', {}).items():
+            for selector in (patterns if isinstance(patterns, list) else [patterns]):
+                self.pattern_selectors.append((metric, selector))
+        self.branch_types = get_config_value(lang_config, 'selectors.cyclomaticComplexity', {}).get('branchingNodes', [])
+        self.internal_patterns = [re.compile(p) for p in get_config_value(lang_config, 'internalDependencyPatterns', [])]
+
+        self.nodes = Table(file=DictionaryColumn(), node=array('I'), parent=array('i'), depth=array('I'), type=DictionaryColumn(),
+                           start_row=array('I'), start_col=array('I'), end_row=array('I'), end_col=array('I'))
+        self.functions = Table(file=DictionaryColumn(), type=DictionaryColumn(), name=[], start_row=array('I'),
+                               end_row=array('I'), lines=array('I'), complexity=array('I'))
+        self.imports = Table(file=DictionaryColumn(), type=DictionaryColumn(), **{'import': []}, internal=[])
+        self.patterns = Table(file=DictionaryColumn(), metric=DictionaryColumn(), value=[], row=array('I'))
+
+    def add_file(self, file: str, ast: Any):
+        """
+        Adds one AST (dict, ASTNode or NodeView). Nodes are numbered in pre-order
+        within the file. Rows are collected per file and added only once the whole
+        file has been processed, so a failing file leaves every column the same length.
+        """
+        nodes, functions = self.nodes.new_rows(), self.functions.new_rows()
+        imports, patterns = self.imports.new_rows(), self.patterns.new_rows()
+        stack = [(ast, -1, 0)]
+        number = 0
+        while stack:
+            node, parent, depth = stack.pop()
+            node_type = node.get('type')
+            start, end = node.get('startPosition'), node.get('endPosition')
+            nodes['file'].append(file)
+            nodes['node'].append(number)
+            nodes['parent'].append(parent)
+            nodes['depth'].append(depth)
+            nodes['type'].append(node_type)
+            nodes['start_row'].append(start['row'])
+            nodes['start_col'].append(start['column'])
+            nodes['end_row'].append(end['row'])
+            nodes['end_col'].append(end['column'])
+            if node_type in self.function_types:
+                self.add_function(functions, file, node)
+            stack.extend((child, number, depth + 1) for child in reversed(node.get('children', [])))
+            number += 1
+
+        for selector in self.import_selectors:
+            for node in find_nodes_by_type(ast, selector.get('type')):
+                dependency = extract_value_by_path(node, selector.get('source'))
+                if dependency:
+                    imports['file'].append(file)
+                    imports['type'].append(selector.get('type'))
+                    imports['import'].append(dependency)
+                    imports['internal'].append(any(p.search(dependency) for p in self.internal_patterns))
+
+        for metric, selector in self.pattern_selectors:
+            for node in find_nodes_by_type(ast, selector.get('type')):
+                if selector.get('textMatch') in node.get('text', ''):
+                    patterns['file'].append(file)
+                    patterns['metric'].append(metric)
+                    patterns['value'].append(extract_value_by_path(node, selector.get('value')))
+                    patterns['row'].append(node.get('startPosition')['row'])
+
+        converted = [(table, table.convert(rows)) for table, rows in
+                     ((self.nodes, nodes), (self.functions, functions), (self.imports, imports), (self.patterns, patterns))]
+        for table, rows in converted:
+            table.extend(rows)
+
+    def add_function(self, functions: Dict[str, list], file: str, node: Any):
+        start_row, end_row = node.get('startPosition')['row'], node.get('endPosition')['row']
+        functions['file'].append(file)
+        functions['type'].append(node.get('type'))
+        functions['name'].append(definition_name(node))
+        functions['start_row'].append(start_row)
+        functions['end_row'].append(end_row)
+        functions['lines'].append(end_row - start_row + 1)
+        # Same rule as UniversalParser: 1 plus the branching nodes in the function's subtree
+        functions['complexity'].append(1 + sum(len(find_nodes_by_type(node, b_type)) for b_type in self.branch_types))
+
+    def write(self, output_dir: str, table_format: str = 'parquet') -> List[str]:
+        """Writes every table to output_dir and returns the written paths."""
+        import pyarrow as pa
+        os.makedirs(output_dir, exist_ok=True)
+        written = []
+        for name in ('nodes', 'functions', 'imports', 'patterns'):
+            table = getattr(self, name).to_arrow()
+            path = os.path.join(output_dir, name + TABLE_FORMATS[table_format])
+            if table_format == 'parquet':
+                import pyarrow.parquet as pq
+                pq.write_table(table, path)
+            else:
+                with pa.OSFile(path, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            written.append(path)
+            print(f"✅ {name} table ({table.num_rows} rows) saved to: {path}")
+        return written
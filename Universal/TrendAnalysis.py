@@ -0,0 +1,191 @@
+# Trend of a project's metrics over its recent git history.
+#
+# Execute from your terminal:
+#    python TrendAnalysis.py /path/to/repo ./python.json python [--commits 500] [--revision HEAD] [--cache trend_cache.db]
+#
+# Walks the first-parent history back from the revision (see GitObjects.py; no
+# checkout needed) and reports, per commit, the files, lines of code, functions,
+# average complexity, direct dependencies and endpoints, by the same rules as
+# UniversalParser.py. The series is written to trend_report.json, oldest first.
+#
+# Work grows with churn, not with commits x files:
+#  - every blob is parsed and analyzed once; its partial statistics are cached by
+#    blob sha (per configuration and language) in a SQLite file, which later runs
+#    reuse as well;
+#  - the summed statistics of every directory are kept in memory (LRU) by tree
+#    sha, so a directory unchanged since any earlier commit is never read again;
+#    only the directories on the path of a change are re-summed.
+
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from ASTView import encode_tree, load_view
+from GitObjects import BLOB_MODES, TREE_MODE, GitError, GitObjects
+from UniversalAST import LANGUAGE_CONFIG, initialize_parsers
+from UniversalParser import analyze_ast_file, finalize_report, merge_stats, new_stats, stats_from_json, stats_to_json
+
+IGNORED_DIRS = {'__pycache__', '.venv', 'venv', 'env', 'dist', 'build', 'target', 'bin', 'node_modules', 'Project_AST_Output'} | \
+               {lang_cfg['output_dir'] for lang_cfg in LANGUAGE_CONFIG.values()}
+TREND_METRICS = ("No of Files", "Lines of Code", "Functions", "Avg Complexity", "No of Direct dependencies", "Endpoints defined")
+
+CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS partials (config TEXT NOT NULL, blob TEXT NOT NULL, stats TEXT NOT NULL, PRIMARY KEY (config, blob))
+"""
+
+# --- Partial Statistics Cache ---
+
+class PartialStatsCache:
+    """Per-blob statistics in a SQLite file, keyed by the configuration they were computed with."""
+    def __init__(self, cache_path: str, config_key: str):
+        self.connection = sqlite3.connect(cache_path)
+        self.connection.execute(CACHE_SCHEMA)
+        self.config_key = config_key
+
+    def get(self, blob: str) -> Optional[Dict[str, Any]]:
+        row = self.connection.execute("SELECT stats FROM partials WHERE config = ? AND blob = ?", (self.config_key, blob)).fetchone()
+        return stats_from_json(json.loads(row[0])) if row else None
+
+    def put(self, blob: str, stats: Dict[str, Any]):
+        self.connection.execute("INSERT OR REPLACE INTO partials VALUES (?, ?, ?)",
+                                (self.config_key, blob, json.dumps(stats_to_json(stats), separators=(',', ':'))))
+
+    def close(self):
+        self.connection.commit()
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+# --- Trend ---
+
+class LRUCache:
+    """A dict bounded to its most recently used max_size entries."""
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.entries: "OrderedDict[str, Any]" = OrderedDict()
+
+    def get(self, key: str) -> Any:
+        value = self.entries.get(key)
+        if value is not None:
+            self.entries.move_to_end(key)
+        return value
+
+    def put(self, key: str, value: Any):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+class TrendAnalyzer:
+    """Statistics of commits' trees, built from cached per-blob and per-directory statistics."""
+    def __init__(self, git: GitObjects, parsers: Dict[str, Any], lang_config: Dict[str, Any], cache: PartialStatsCache,
+                 memory_size: int = 100000):
+        self.git = git
+        self.parsers = parsers
+        self.lang_config = lang_config
+        self.cache = cache
+        # Summed directories and blob partials stay in memory across commits (least recently used dropped first)
+        self.trees = LRUCache(memory_size)
+        self.blobs = LRUCache(memory_size)
+        self.parsed_blobs = 0
+
+    def analyze_blob(self, source: bytes, extension: str) -> Dict[str, Any]:
+        stats = new_stats(self.lang_config)
+        tree = self.parsers[extension].parse(source)
+        analyze_ast_file(load_view(encode_tree(source, tree.root_node)), stats, self.lang_config)
+        return stats
+
+    def blob_stats(self, sha: str, extension: str) -> Dict[str, Any]:
+        stats = self.blobs.get(sha)
+        if stats is None:
+            stats = self.cache.get(sha)
+        if stats is None:
+            stats = self.analyze_blob(self.git.blob(sha), extension)
+            self.cache.put(sha, stats)
+            self.parsed_blobs += 1
+        self.blobs.put(sha, stats)
+        return stats
+
+    def tree_stats(self, tree_sha: str) -> Dict[str, Any]:
+        stats = self.trees.get(tree_sha)
+        if stats is None:
+            stats = new_stats(self.lang_config)
+            for mode, name, sha in list(self.git.tree_entries(tree_sha)):
+                extension = os.path.splitext(name)[1]
+                try:
+                    if mode == TREE_MODE and name not in IGNORED_DIRS:
+                        merge_stats(stats, self.tree_stats(sha))
+                    elif mode in BLOB_MODES and extension in self.parsers:
+                        merge_stats(stats, self.blob_stats(sha, extension))
+                except (GitError, ValueError) as e:
+                    print(f"[FAILED] Could not analyze {name} ({sha}). Reason: {e}")
+            self.trees.put(tree_sha, stats)
+        return stats
+
+    def commit_report(self, tree_sha: str) -> Dict[str, Any]:
+        """The UniversalParser report of one commit's tree."""
+        return finalize_report(self.tree_stats(tree_sha), self.lang_config)
+
+# --- Main Execution ---
+def main(repo_dir: str, config_path: str, language: str, commits: int = 500,
+         revision: str = "HEAD", cache_path: str = "trend_cache.db"):
+    if not os.path.isfile(config_path) or language not in LANGUAGE_CONFIG:
+        print(f"Error: language configuration not found or language not one of: {', '.join(LANGUAGE_CONFIG)}.", file=sys.stderr)
+        return
+
+    with open(config_path, 'rb') as f:
+        config_bytes = f.read()
+    lang_config = json.loads(config_bytes)
+    parsers = initialize_parsers(set(LANGUAGE_CONFIG[language]['extensions']))
+    if not parsers:
+        print("\nCould not initialize any parsers. Please check for installation errors above.", file=sys.stderr)
+        return
+
+    series: List[Dict[str, Any]] = []
+    config_key = hashlib.sha1(language.encode('utf-8') + b"\0" + config_bytes).hexdigest()
+    try:
+        with GitObjects(repo_dir) as git, PartialStatsCache(cache_path, config_key) as cache:
+            analyzer = TrendAnalyzer(git, parsers, lang_config, cache)
+            sha = revision
+            for _ in range(commits):
+                sha, tree, parents, timestamp = git.commit(sha)
+                report = analyzer.commit_report(tree)
+                point = {"Commit": sha, "Date": datetime.fromtimestamp(timestamp, timezone.utc).isoformat()}
+                point.update((metric, report[metric]) for metric in TREND_METRICS)
+                series.append(point)
+                print(f"{sha[:10]}  {point['Date'][:10]}  " + "  ".join(f"{metric}: {point[metric]}" for metric in TREND_METRICS))
+                if not parents:
+                    break
+                sha = parents[0]
+    except GitError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return
+
+    output_file_path = os.path.join(os.getcwd(), 'trend_report.json')
+    with open(output_file_path, 'w', encoding='utf-8') as f:
+        json.dump(series[::-1], f, indent=2)
+    print(f"\n✅ Trend of {len(series)} commits ({analyzer.parsed_blobs} blobs parsed) saved to: {output_file_path}")
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    options = {}
+    for name in ("--commits", "--revision", "--cache"):
+        if name in args and args.index(name) + 1 < len(args):
+            position = args.index(name)
+            options[name] = args[position + 1]
+            del args[position:position + 2]
+    if len(args) != 3:
+        print("Usage: python TrendAnalysis.py <path-to-repo> <path-to-config.json> <language> "
+              "[--commits 500] [--revision HEAD] [--cache trend_cache.db]")
+    else:
+        main(*args, commits=int(options.get("--commits", 500)), revision=options.get("--revision", "HEAD"),
+             cache_path=options.get("--cache", "trend_cache.db"))
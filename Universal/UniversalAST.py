@@ -4,13 +4,46 @@
 #
 # 2. Execute from your terminal with ONLY the project path:
 #    python generate_asts_final.py /path/to/your/project
+#
+#    Or write every AST into one SQLite store instead of JSON files (see ASTStore.py):
+#    python generate_asts_final.py /path/to/your/project --store ast.db
+#
+#    Or append every AST to one packfile with an offset index (see ASTPack.py):
+#    python generate_asts_final.py /path/to/your/project --pack ast.pack
+#    python generate_asts_final.py /path/to/your/project --binary-pack ast.pack
+#
+#    Or parse a git revision straight from the object database, without checking it out
+#    (see GitObjects.py); it combines with any of the output options above. Its JSON
+#    output goes to Revision_AST_Output/<revision>/ instead of the live folders:
+#    python generate_asts_final.py /path/to/your/repo --revision v2.1.0 --store v2.1.0.db
+#
+#    The project is scanned once, honouring its .gitignore files (see FileManifest.py), and
+#    the files found are saved to file_manifest.tsv; to parse from it instead of scanning again:
+#    python generate_asts_final.py /path/to/your/project --manifest file_manifest.tsv
+#
+#    JSON outputs are written atomically and progress is journaled (see Checkpoint.py);
+#    if a run is interrupted, rerun it with '--resume' to skip the files already saved:
+#    python generate_asts_final.py /path/to/your/project --resume
+#
+# Identical source files are parsed once: in the JSON output their copies are
+# hard links to the same AST file, in a store or pack they share one record.
 
 import json
 import os
+import re
 import sys
 from tree_sitter import Parser
 from tree_sitter_languages import get_language
 
+from ASTPack import ASTPackWriter
+from ASTStore import ASTStoreWriter, blob_id
+from Checkpoint import Journal, link_file, write_file
+from FileManifest import discover_files, load_manifest, write_manifest
+from GitObjects import GitError, GitObjects
+
+# JSON output of '--revision' runs: <cwd>/Revision_AST_Output/<revision>/
+REVISION_OUTPUT_DIR = "Revision_AST_Output"
+
 # --- Language Configuration Map ---
 # The 'output_dir' key is back to define the language-specific folder names.
 LANGUAGE_CONFIG = {
@@ -37,18 +70,40 @@ def node_to_dict(node):
     }
 
 def discover_languages_and_files(project_dir, ignored_dirs):
-    """Scan the project to find which files to parse and return a map of file_path -> extension."""
+    """
+    Scan the project (honouring its .gitignore files, see FileManifest.py) to find which
+    files to parse. Returns a map of file_path -> extension and the manifest entries.
+    """
+    ext_to_lang_key = {ext: key for key, conf in LANGUAGE_CONFIG.items() for ext in conf['extensions']}
+    entries = discover_files(project_dir, ext_to_lang_key, ignored_dirs)
+    return files_from_manifest(project_dir, entries), entries
+
+def files_from_manifest(project_dir, entries):
+    """The file_path -> extension map of manifest entries (with a supported extension)."""
     files_to_parse = {}
     all_extensions = {ext for config in LANGUAGE_CONFIG.values() for ext in config['extensions']}
-    for root, dirs, files in os.walk(project_dir, topdown=True):
-        dirs[:] = [d for d in dirs if d not in ignored_dirs]
-        for file in files:
-            _, extension = os.path.splitext(file)
-            if extension in all_extensions:
-                full_path = os.path.join(root, file)
-                files_to_parse[full_path] = extension
+    for entry in entries:
+        _, extension = os.path.splitext(entry.path)
+        if extension in all_extensions:
+            files_to_parse[os.path.join(project_dir, entry.path)] = extension
     return files_to_parse
 
+def discover_revision_files(git, project_dir, revision, ignored_dirs):
+    """
+    Same as discover_languages_and_files for a revision's tree. Returns the
+    file_path -> extension map (paths as they would be in a checkout) and the
+    file_path -> blob sha map to read their sources with.
+    """
+    files_to_parse, blobs = {}, {}
+    all_extensions = {ext for config in LANGUAGE_CONFIG.values() for ext in config['extensions']}
+    for path, sha in git.iter_tree(git.tree_of(revision), ignored_dirs=ignored_dirs):
+        _, extension = os.path.splitext(path)
+        if extension in all_extensions:
+            full_path = os.path.join(project_dir, path)
+            files_to_parse[full_path] = extension
+            blobs[full_path] = sha
+    return files_to_parse, blobs
+
 def initialize_parsers(extensions_found: set) -> dict:
     """Initializes only the parsers needed for the found file types."""
     parsers = {}
@@ -73,10 +128,21 @@ def initialize_parsers(extensions_found: set) -> dict:
 
     return parsers
 
-def parse_project(project_dir, files_to_parse, parsers, mirrored_output_dir):
-    """Parses all discovered files and saves the AST to BOTH output structures."""
+def parse_project(project_dir, files_to_parse, parsers, mirrored_output_dir, store=None, pack=None, read_source=None, journal=None,
+                  blob_ids=None):
+    """
+    Parses all discovered files and saves the AST to BOTH output structures (the
+    language-specific folders sit next to mirrored_output_dir), or only into the
+    given ASTStoreWriter or ASTPackWriter. read_source(file_path) supplies the
+    source bytes when the files are not on disk (e.g. git blobs), and blob_ids
+    their known git blob ids, which are then not recomputed.
+    Files with identical content (same language and git blob id) are parsed once;
+    their copies are linked to the first file's outputs. Files a resumed Journal
+    records with the same blob id already have their outputs and are skipped.
+    """
     file_count = 0
     ext_to_lang_key = {ext: key for key, conf in LANGUAGE_CONFIG.items() for ext in conf['extensions']}
+    parsed = {}     # (language, blob id) -> relative path of the first file with that content
 
     for file_path, extension in files_to_parse.items():
         parser = parsers.get(extension)
@@ -84,31 +150,70 @@ def parse_project(project_dir, files_to_parse, parsers, mirrored_output_dir):
             print(f"[SKIPPED] No parser available for file: {file_path}")
             continue
         try:
-            with open(file_path, 'rb') as f:
-                tree = parser.parse(f.read())
-            
+            if read_source is not None:
+                source = read_source(file_path)
+            else:
+                with open(file_path, 'rb') as f:
+                    source = f.read()
+            relative_path = os.path.relpath(file_path, project_dir).replace("\\", "/")
+            lang_key = ext_to_lang_key[extension]
+            lang_specific_dir = os.path.join(os.path.dirname(mirrored_output_dir), LANGUAGE_CONFIG[lang_key]['output_dir'])
+            content_key = (lang_key, blob_ids[file_path] if blob_ids is not None else blob_id(source))
+            original_path = parsed.get(content_key)
+
+            if journal is not None and journal.get(relative_path) == content_key[1]:
+                parsed.setdefault(content_key, relative_path)
+                print(f"[RESUMED] AST already saved for: {file_path}")
+                file_count += 1
+                continue
+
+            if original_path is not None:
+                if store is not None:
+                    store.add_copy(relative_path, lang_key, original_path)
+                elif pack is not None:
+                    pack.add_copy(relative_path, original_path)
+                else:
+                    for output_dir in (mirrored_output_dir, lang_specific_dir):
+                        link_file(os.path.join(output_dir, f"{original_path}.json"), os.path.join(output_dir, f"{relative_path}.json"))
+                    if journal is not None:
+                        journal.record(relative_path, content_key[1])
+                print(f"[DUPLICATE] Reused AST of {original_path} for: {file_path}")
+                file_count += 1
+                continue
+
+            tree = parser.parse(source)
+            parsed[content_key] = relative_path
+
+            if store is not None:
+                store.add_tree(relative_path, lang_key, source, tree.root_node)
+                print(f"[SUCCESS] Stored AST for: {file_path}")
+                file_count += 1
+                continue
+
+            if pack is not None:
+                if pack.binary:
+                    pack.add_tree(relative_path, source, tree.root_node)
+                else:
+                    pack.add_ast(relative_path, node_to_dict(tree.root_node))
+                print(f"[SUCCESS] Packed AST for: {file_path}")
+                file_count += 1
+                continue
+
             serializable_ast = node_to_dict(tree.root_node)
+
             json_string = json.dumps(serializable_ast, indent=2)
             
-            relative_path = os.path.relpath(file_path, project_dir)
-            
             # 1. Path for the mirrored directory
             mirrored_output_path = os.path.join(mirrored_output_dir, f"{relative_path}.json")
             
             # 2. Path for the language-specific directory
-            lang_key = ext_to_lang_key[extension]
-            lang_specific_dir_name = LANGUAGE_CONFIG[lang_key]['output_dir']
-            lang_specific_dir = os.path.join(os.getcwd(), lang_specific_dir_name)
             lang_specific_output_path = os.path.join(lang_specific_dir, f"{relative_path}.json")
             
             # Write to both locations
-            os.makedirs(os.path.dirname(mirrored_output_path), exist_ok=True)
-            with open(mirrored_output_path, 'w', encoding='utf-8') as f:
-                f.write(json_string)
-
-            os.makedirs(os.path.dirname(lang_specific_output_path), exist_ok=True)
-            with open(lang_specific_output_path, 'w', encoding='utf-8') as f:
-                f.write(json_string)
+            write_file(mirrored_output_path, json_string)
+            write_file(lang_specific_output_path, json_string)
+            if journal is not None:
+                journal.record(relative_path, content_key[1])
 
             print(f"[SUCCESS] Saved AST for: {file_path}")
             file_count += 1
@@ -119,24 +224,69 @@ def parse_project(project_dir, files_to_parse, parsers, mirrored_output_dir):
 
 # --- Main Execution ---
 if __name__ == "__main__":
+    resume = "--resume" in sys.argv
+    if resume:
+        sys.argv.remove("--resume")
+    options = {}
+    for name in ("--revision", "--manifest"):
+        if name in sys.argv[2:-1]:
+            position = sys.argv.index(name)
+            options[name] = sys.argv[position + 1]
+            del sys.argv[position:position + 2]
+    revision = options.get("--revision")
+    output_mode, output_path = None, None
+    if len(sys.argv) == 4 and sys.argv[2] in ("--store", "--pack", "--binary-pack"):
+        output_mode, output_path = sys.argv[2], sys.argv[3]
+        del sys.argv[2:]
     if len(sys.argv) != 2:
-        print("Usage: python generate_asts_final.py <path-to-project>")
+        print("Usage: python generate_asts_final.py <path-to-project> [--revision REV | --manifest file_manifest.tsv] "
+              "[--store ast.db | --pack ast.pack | --binary-pack ast.pack | --resume]")
         sys.exit(1)
 
     project_directory = sys.argv[1]
     if not os.path.isdir(project_directory):
         print(f"Error: The specified directory does not exist: '{project_directory}'")
         sys.exit(1)
+    if resume and output_mode:
+        print("Error: --resume works with the JSON output only (a store or pack is complete only once it is closed).")
+        sys.exit(1)
+    if revision and "--manifest" in options:
+        print("Error: --manifest lists the files of the checkout; it cannot be combined with --revision.")
+        sys.exit(1)
 
-    mirrored_output_directory = os.path.join(os.getcwd(), "Project_AST_Output")
+    # A revision's JSON output gets its own folder, so it never overwrites the live checkout's
+    output_root = os.getcwd()
+    if revision and not output_mode:
+        output_root = os.path.join(output_root, REVISION_OUTPUT_DIR, re.sub(r'[^\w.-]', '_', revision))
+    mirrored_output_directory = os.path.join(output_root, "Project_AST_Output")
     os.makedirs(mirrored_output_directory, exist_ok=True)
 
-    ignored_dirs = {'__pycache__', '.git', '.venv', 'venv', 'env', 'dist', 'build', 'target', 'bin', 'node_modules', os.path.basename(mirrored_output_directory)}
+    ignored_dirs = {'__pycache__', '.git', '.venv', 'venv', 'env', 'dist', 'build', 'target', 'bin', 'node_modules', os.path.basename(mirrored_output_directory), REVISION_OUTPUT_DIR}
     for lang_cfg in LANGUAGE_CONFIG.values():
         ignored_dirs.add(lang_cfg['output_dir'])
 
-    print(f"Scanning project at '{os.path.abspath(project_directory)}' to discover languages...")
-    files_to_parse = discover_languages_and_files(project_directory, ignored_dirs)
+    git, read_source, blobs = None, None, None
+    if revision:
+        print(f"Reading revision '{revision}' of '{os.path.abspath(project_directory)}' to discover languages...")
+        try:
+            git = GitObjects(project_directory)
+            files_to_parse, blobs = discover_revision_files(git, project_directory, revision, ignored_dirs)
+        except GitError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        read_source = lambda file_path: git.blob(blobs[file_path])
+    elif "--manifest" in options:
+        try:
+            manifest_entries = load_manifest(options["--manifest"], project_directory)
+        except (OSError, ValueError) as e:
+            print(f"Error: Could not read the file manifest. Reason: {e}")
+            sys.exit(1)
+        print(f"Using {len(manifest_entries)} files from the manifest '{options['--manifest']}'...")
+        files_to_parse = files_from_manifest(project_directory, manifest_entries)
+    else:
+        print(f"Scanning project at '{os.path.abspath(project_directory)}' to discover languages...")
+        files_to_parse, manifest_entries = discover_languages_and_files(project_directory, ignored_dirs)
+        write_manifest(os.path.join(os.getcwd(), "file_manifest.tsv"), project_directory, manifest_entries)
 
     if not files_to_parse:
         print("\n⚠️ No supported source code files were found to parse.")
@@ -152,13 +302,30 @@ if __name__ == "__main__":
         sys.exit(1)
 
     print(f"\nStarting AST generation for all discovered files...")
-    print(f"Output will be saved in TWO formats:")
-    print(f"  1. A single mirrored structure inside: '{os.path.abspath(mirrored_output_directory)}'")
-    print(f"  2. Separate language-specific folders (e.g., PythonAST/, CSharpAST/, etc.)\n")
-    
-    total_files_parsed = parse_project(project_directory, files_to_parse, parsers_by_extension, mirrored_output_directory)
+    if output_mode == "--store":
+        print(f"Output will be saved in the AST store: '{os.path.abspath(output_path)}'\n")
+        with ASTStoreWriter(output_path) as store:
+            total_files_parsed = parse_project(project_directory, files_to_parse, parsers_by_extension, mirrored_output_directory, store=store,
+                                               read_source=read_source, blob_ids=blobs)
+    elif output_mode in ("--pack", "--binary-pack"):
+        print(f"Output will be saved in the AST pack: '{os.path.abspath(output_path)}'\n")
+        with ASTPackWriter(output_path, binary=output_mode == "--binary-pack") as pack:
+            total_files_parsed = parse_project(project_directory, files_to_parse, parsers_by_extension, mirrored_output_directory, pack=pack,
+                                               read_source=read_source, blob_ids=blobs)
+    else:
+        print(f"Output will be saved in TWO formats:")
+        print(f"  1. A single mirrored structure inside: '{os.path.abspath(mirrored_output_directory)}'")
+        print(f"  2. Separate language-specific folders next to it (e.g., PythonAST/, CSharpAST/, etc.)\n")
+        with Journal(os.path.join(mirrored_output_directory, ".ast_journal.jsonl"),
+                     [os.path.abspath(project_directory), revision], resume) as journal:
+            total_files_parsed = parse_project(project_directory, files_to_parse, parsers_by_extension, mirrored_output_directory,
+                                               read_source=read_source, journal=journal, blob_ids=blobs)
+        journal.finish()
     
     if total_files_parsed > 0:
         print(f"\n✅ Successfully generated and saved ASTs for {total_files_parsed} files.")
     else:
-        print("\n⚠️ No supported files were parsed.")
\ No newline at end of file
+        print("\n⚠️ No supported files were parsed.")
+
+    if git is not None:
+        git.close()
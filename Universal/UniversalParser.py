@@ -3,13 +3,37 @@
 # 2. You will need a language configuration file (e.g., python.config.json).
 # 3. Execute from your terminal:
 #    python UniversalParser.py ./PythonAST ./python.config.json
+#
+#    An AST store written with '--store' (see ASTStore.py) can be analyzed in
+#    place of the directory. The optional language argument restricts any source
+#    (directory, store or pack) to the files of one language:
+#    python UniversalParser.py ./ast.db ./python.config.json python
+#
+#    A packfile written with '--pack' or '--binary-pack' (see ASTPack.py) works the
+#    same way. Binary packs are read as lazy node views over a memory map, so only
+#    the fields the selectors touch are ever decoded:
+#    python UniversalParser.py ./ast.pack ./python.config.json python
+#
+#    '--tables DIR [--format parquet|arrow]' also writes flat node, function, import
+#    and pattern tables for pandas/DuckDB (see TableExport.py; needs pyarrow).
+#
+#    '--resume' journals every file's statistics next to the report (see Checkpoint.py);
+#    if such a run is interrupted, rerunning it with '--resume' re-uses the statistics of
+#    the files already analyzed, unless their AST has been rewritten since.
 
 import json
 import os
 import sys
 import re
+from collections import Counter
+from functools import partial
 from typing import Any, Dict, List, Optional, Set
 
+from ASTPack import ASTPack, is_pack
+from ASTStore import EXTENSION_LANGUAGES, ASTStore
+from ASTView import ASTNode, NodeView, is_node, load_ast_file
+from Checkpoint import Journal, write_json_atomic
+
 # --- Helper Functions ---
 
 def get_config_value(config: Dict[str, Any], key_path: str, default_value: Any = None) -> Any:
@@ -24,6 +48,8 @@ def get_config_value(config: Dict[str, Any], key_path: str, default_value: Any =
 
 def find_nodes_by_type(node: Dict[str, Any], node_type: str) -> List[Dict[str, Any]]:
     """Recursively finds all nodes of a specific type in the AST."""
+    if isinstance(node, (ASTNode, NodeView)):
+        return node.find_all(node_type)
     nodes = []
     if not isinstance(node, dict): return nodes
     if node.get('type') == node_type:
@@ -34,7 +60,7 @@ def find_nodes_by_type(node: Dict[str, Any], node_type: str) -> List[Dict[str, A
 
 def extract_value_by_path(node: Dict[str, Any], query: Optional[Dict[str, Any]]) -> Optional[str]:
     """Extracts a text value from a node by following a path query."""
-    if not query or not isinstance(node, dict): return None
+    if not query or not is_node(node): return None
     current_node = node
     
     for step in query.get('path', []):
@@ -44,7 +70,7 @@ def extract_value_by_path(node: Dict[str, Any], query: Optional[Dict[str, Any]])
             allowed_types = [allowed_types]
 
         child_node = next((c for c in current_node.get('children', [])
-                           if isinstance(c, dict) and (c.get('type') in allowed_types if is_last_step else c.get('type') == allowed_types) and
+                           if is_node(c) and (c.get('type') in allowed_types if is_last_step else c.get('type') == allowed_types) and
                            (not step.get('textMatch') or step.get('textMatch') in c.get('text', ''))),
                           None)
 
@@ -53,11 +79,64 @@ def extract_value_by_path(node: Dict[str, Any], query: Optional[Dict[str, Any]])
         
     return current_node.get('text', '').replace("'", "").replace('"', '')
 
+def iter_ast_files(ast_source: str, language: Optional[str] = None):
+    """
+    Yields (name, content key, stamp, load) for every AST in a directory of .json
+    files or in an AST pack. ASTs shared by several files (hard-linked JSON files,
+    pack entries pointing at one record) get the same content key; others get
+    None. The stamp ([size, mtime_ns] of the JSON file, [offset, length] of the
+    pack record) changes whenever the AST is rewritten.
+    """
+    if is_pack(ast_source):
+        with ASTPack(ast_source) as pack:
+            records = Counter(pack.entries.values())
+            for path, record in pack.entries.items():
+                if language is None or EXTENSION_LANGUAGES.get(os.path.splitext(path)[1]) == language:
+                    yield path, record if records[record] > 1 else None, list(record), partial(pack.load, path)
+        return
+    for root, _, files in os.walk(ast_source):
+        for file in files:
+            if file.endswith('.json') and (language is None or
+                                           EXTENSION_LANGUAGES.get(os.path.splitext(file[:-len('.json')])[1]) == language):
+                full_path = os.path.join(root, file)
+                st = os.stat(full_path)
+                yield (full_path, (st.st_dev, st.st_ino) if st.st_nlink > 1 else None,
+                       [st.st_size, st.st_mtime_ns], partial(load_ast_file, full_path))
+
 # --- Main Analysis Logic ---
 
+def new_stats(lang_config: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'composition': {'fileCount': 0, 'functionCount': 0, 'classCount': 0, 'totalLinesOfCode': 0, 'totalComments': 0},
+        'dependencies': {'importCount': 0, 'importFrequency': {}},
+        'patterns': {metric: {'count': 0, 'list': set()} for metric in get_config_value(lang_config, 'selectors.patterns', {})},
+        'quality': {'tryCatchCount': 0},
+        'complexity': {'totalCyclomatic': 0}
+    }
+
+def merge_stats(stats: Dict[str, Any], other: Dict[str, Any]):
+    """Adds the statistics of other (e.g. one file's) into stats."""
+    for section in ('composition', 'quality', 'complexity'):
+        for key, value in other[section].items():
+            stats[section][key] += value
+    stats['dependencies']['importCount'] += other['dependencies']['importCount']
+    frequency = stats['dependencies']['importFrequency']
+    for dep_name, count in other['dependencies']['importFrequency'].items():
+        frequency[dep_name] = frequency.get(dep_name, 0) + count
+    for metric, pattern in other['patterns'].items():
+        stats['patterns'][metric]['count'] += pattern['count']
+        stats['patterns'][metric]['list'] |= pattern['list']
+
+def stats_to_json(stats: Dict[str, Any]) -> Dict[str, Any]:
+    """A JSON-serializable copy of stats (pattern value sets become sorted lists)."""
+    return dict(stats, patterns={metric: {'count': p['count'], 'list': sorted(p['list'])} for metric, p in stats['patterns'].items()})
+
+def stats_from_json(data: Dict[str, Any]) -> Dict[str, Any]:
+    return dict(data, patterns={metric: {'count': p['count'], 'list': set(p['list'])} for metric, p in data['patterns'].items()})
+
 def analyze_ast_file(ast: Dict[str, Any], stats: Dict[str, Any], lang_config: Dict[str, Any]):
     """Analyzes a single AST file and aggregates statistics."""
-    if not ast or not isinstance(ast, dict): return
+    if not ast or not is_node(ast): return
 
     # Composition Metrics
     stats['composition']['fileCount'] += 1
@@ -108,6 +187,51 @@ def analyze_ast_file(ast: Dict[str, Any], stats: Dict[str, Any], lang_config: Di
             complexity += len(find_nodes_by_type(func_node, b_node_type))
         stats['complexity']['totalCyclomatic'] += complexity
 
+def analyze_ast_store(store: ASTStore, stats: Dict[str, Any], lang_config: Dict[str, Any], language: Optional[str] = None):
+    """
+    Same statistics as analyze_ast_file over every file of an AST store. Counts
+    run as indexed queries; only nodes whose values are extracted are loaded.
+    """
+    for _, start_row, end_row in store.root_spans(language):
+        stats['composition']['fileCount'] += 1
+        stats['composition']['totalLinesOfCode'] += end_row - start_row + 1
+
+    function_types = get_config_value(lang_config, 'selectors.function', [])
+    function_count = sum(store.count_nodes(f_type, language) for f_type in function_types)
+    stats['composition']['functionCount'] += function_count
+
+    for c_type in get_config_value(lang_config, 'selectors.class', []):
+        stats['composition']['classCount'] += store.count_nodes(c_type, language)
+
+    for c_type in get_config_value(lang_config, 'selectors.comment', []):
+        stats['composition']['totalComments'] += store.count_nodes(c_type, language)
+
+    for selector in get_config_value(lang_config, 'selectors.import', []):
+        for _, node in store.nodes_of_type(selector.get('type'), language=language):
+            stats['dependencies']['importCount'] += 1
+            dep_name = extract_value_by_path(node, selector.get('source'))
+            if dep_name:
+                stats['dependencies']['importFrequency'][dep_name] = stats['dependencies']['importFrequency'].get(dep_name, 0) + 1
+
+    for metric, patterns in get_config_value(lang_config, 'selectors.patterns', {}).items():
+        if not isinstance(patterns, list):
+            patterns = [patterns]
+
+        for selector in patterns:
+            for _, node in store.nodes_of_type(selector.get('type'), selector.get('textMatch'), language):
+                stats['patterns'][metric]['count'] += 1
+                value = extract_value_by_path(node, selector.get('value'))
+                if value:
+                    stats['patterns'][metric]['list'].add(value)
+
+    for t_type in get_config_value(lang_config, 'selectors.quality.exceptionHandling', []):
+        stats['quality']['tryCatchCount'] += store.count_nodes(t_type, language)
+
+    # Each function contributes 1 plus the branching nodes in its subtree
+    branch_nodes = get_config_value(lang_config, 'selectors.cyclomaticComplexity', {}).get('branchingNodes', [])
+    stats['complexity']['totalCyclomatic'] += function_count + sum(
+        store.count_descendants(f_type, b_node_type, language) for f_type in function_types for b_node_type in branch_nodes)
+
 
 def finalize_report(stats: Dict[str, Any], lang_config: Dict[str, Any]) -> Dict[str, Any]:
     """Assembles the final report from the aggregated statistics."""
@@ -153,45 +277,96 @@ def finalize_report(stats: Dict[str, Any], lang_config: Dict[str, Any]) -> Dict[
     return report
 
 # --- Main Execution ---
-def main(ast_dir: str, config_path: str):
-    if not os.path.isdir(ast_dir) or not os.path.isfile(config_path):
+def main(ast_dir: str, config_path: str, language: Optional[str] = None,
+         tables_dir: Optional[str] = None, table_format: str = 'parquet', resume: bool = False):
+    is_store = os.path.isfile(ast_dir) and ast_dir.endswith('.db')
+    from_pack = is_pack(ast_dir)
+    if not (is_store or from_pack or os.path.isdir(ast_dir)) or not os.path.isfile(config_path):
         print("Error: AST directory or language configuration not found.", file=sys.stderr)
         return
 
+    tables = None
+    if tables_dir:
+        # Imported here: TableExport builds on this module's selector helpers
+        from TableExport import TABLE_FORMATS, pyarrow_available
+        if table_format not in TABLE_FORMATS or not pyarrow_available():
+            print(f"Error: table export needs a format in ({', '.join(TABLE_FORMATS)}) and pyarrow ('pip install pyarrow').", file=sys.stderr)
+            return
+
     with open(config_path, 'r', encoding='utf-8') as f:
         lang_config = json.load(f)
 
     print(f"Analyzing project using '{lang_config.get('language')}' configuration...")
+    if tables_dir:
+        from TableExport import TableBuilder
+        tables = TableBuilder(lang_config)
 
-    stats = {
-        'composition': {'fileCount': 0, 'functionCount': 0, 'classCount': 0, 'totalLinesOfCode': 0, 'totalComments': 0},
-        'dependencies': {'importCount': 0, 'importFrequency': {}},
-        'patterns': {metric: {'count': 0, 'list': set()} for metric in get_config_value(lang_config, 'selectors.patterns', {})},
-        'quality': {'tryCatchCount': 0},
-        'complexity': {'totalCyclomatic': 0}
-    }
+    stats = new_stats(lang_config)
 
-    for root, _, files in os.walk(ast_dir):
-        for file in files:
-            if file.endswith('.json'):
-                full_path = os.path.join(root, file)
-                try:
-                    with open(full_path, 'r', encoding='utf-8') as f:
-                        ast_data = json.load(f)
-                    analyze_ast_file(ast_data, stats, lang_config)
-                except Exception as e:
-                    print(f"\n❌ Failed to analyze file: {full_path}. Reason: {e}", file=sys.stderr)
+    if is_store:
+        with ASTStore(ast_dir) as store:
+            analyze_ast_store(store, stats, lang_config, language)
+            if tables:
+                for path, _ in store.iter_files(language):
+                    tables.add_file(path, store.load_tree(path))
+
+    output_file_path = os.path.join(os.getcwd(), 'analysis_report.json')
+    # With --resume every file's statistics are journaled next to the report, with the
+    # stamp of the AST they came from, so an interrupted run can pick them up again
+    journal = None
+    if resume and not is_store:
+        journal = Journal(output_file_path + ".journal",
+                          [os.path.abspath(ast_dir), os.path.abspath(config_path), language], resume=True)
+    # Statistics of ASTs shared by several files, analyzed once and added for every copy
+    shared_stats: Dict[Any, Dict[str, Any]] = {}
+    for full_path, content_key, stamp, load_ast in (() if is_store else iter_ast_files(ast_dir, language)):
+        try:
+            ast_data = None
+            saved = journal.get(full_path) if journal is not None else None
+            resumed = saved is not None and saved[0] == stamp
+            if resumed:
+                file_stats = stats_from_json(saved[1])
+            elif content_key is not None and content_key in shared_stats:
+                file_stats = shared_stats[content_key]
+            else:
+                ast_data = load_ast()
+                file_stats = new_stats(lang_config)
+                analyze_ast_file(ast_data, file_stats, lang_config)
+            if content_key is not None:
+                shared_stats.setdefault(content_key, file_stats)
+            merge_stats(stats, file_stats)
+            if journal is not None and not resumed:
+                journal.record(full_path, [stamp, stats_to_json(file_stats)])
+            if tables:
+                file = full_path if from_pack else os.path.relpath(full_path, ast_dir)[:-len('.json')].replace("\\", "/")
+                tables.add_file(file, ast_data if ast_data is not None else load_ast())
+        except Exception as e:
+            print(f"\n❌ Failed to analyze file: {full_path}. Reason: {e}", file=sys.stderr)
 
     final_report = finalize_report(stats, lang_config)
     
-    output_file_path = os.path.join(os.getcwd(), 'analysis_report.json')
-    with open(output_file_path, 'w', encoding='utf-8') as f:
-        json.dump(final_report, f, indent=2)
+    write_json_atomic(output_file_path, final_report)
+    if journal is not None:
+        journal.finish()
     
     print(f"\n✅ Successfully saved analysis report to: {output_file_path}")
 
+    if tables:
+        tables.write(tables_dir, table_format)
+
 if __name__ == "__main__":
-    if len(sys.argv) != 3:
-        print("Usage: python UniversalParser.py <path-to-ast-directory> <path-to-config.json>")
+    args = sys.argv[1:]
+    resume = "--resume" in args
+    if resume:
+        args.remove("--resume")
+    options = {}
+    for name in ("--tables", "--format"):
+        if name in args and args.index(name) + 1 < len(args):
+            position = args.index(name)
+            options[name] = args[position + 1]
+            del args[position:position + 2]
+    if len(args) not in (2, 3):
+        print("Usage: python UniversalParser.py <path-to-ast-directory|ast.db|ast.pack> <path-to-config.json> [language] "
+              "[--tables DIR [--format parquet|arrow]] [--resume]")
     else:
-        main(sys.argv[1], sys.argv[2])
\ No newline at end of file
+        main(*args, tables_dir=options.get("--tables"), table_format=options.get("--format", "parquet"), resume=resume)
\ No newline at end of file
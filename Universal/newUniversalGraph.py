@@ -3,12 +3,21 @@
 # 2. Use the corresponding advanced configuration file (e.g., python.graph.config.json).
 # 3. Execute from your terminal:
 #    python create_rich_dependency_graph.py ./PythonAST ./python.graph.config.json python_deps.dot
+#    (.graphml, .json or .mmd output files are written as GraphML, JSON adjacency or Mermaid)
 
 import json
 import os
 import sys
 import re
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+from ASTView import ASTNode, is_node, load_ast_file
+from GraphAnalytics import write_analytics
+from GraphDiff import write_snapshot
+from GraphExport import export_graph
+from GraphIndex import save_graph_index, update_graph_index
+from GraphModel import DependencyGraph
+from ImportResolver import ImportResolver
 
 # --- Helper Functions ---
 
@@ -24,6 +33,8 @@ def get_config_value(config: Dict[str, Any], key_path: str, default_value: Any =
 
 def find_nodes_by_type(node: Dict[str, Any], node_type: str) -> List[Dict[str, Any]]:
     """Recursively finds all nodes of a specific type in the AST."""
+    if isinstance(node, ASTNode):
+        return node.find_all(node_type)
     nodes = []
     if not isinstance(node, dict): return nodes
     if node.get('type') == node_type:
@@ -34,7 +45,7 @@ def find_nodes_by_type(node: Dict[str, Any], node_type: str) -> List[Dict[str, A
 
 def extract_value_by_path(node: Dict[str, Any], query: Optional[Dict[str, Any]]) -> Optional[str]:
     """Extracts a text value from a node by following a path query."""
-    if not query or not isinstance(node, dict): return None
+    if not query or not is_node(node): return None
     current_node = node
     for step in query.get('path', []):
         is_last_step = step == query['path'][-1]
@@ -42,68 +53,44 @@ def extract_value_by_path(node: Dict[str, Any], query: Optional[Dict[str, Any]])
         if is_last_step and not isinstance(allowed_types, list):
             allowed_types = [allowed_types]
         child_node = next((c for c in current_node.get('children', [])
-                           if isinstance(c, dict) and (c.get('type') in allowed_types if is_last_step else c.get('type') == allowed_types) and
+                           if is_node(c) and (c.get('type') in allowed_types if is_last_step else c.get('type') == allowed_types) and
                            (not step.get('textMatch') or step.get('textMatch') in c.get('text', ''))), None)
         if not child_node: return None
         current_node = child_node
     return current_node.get('text', '').replace("'", "").replace('"', '')
 
 # --- Core Graphing Logic ---
+# DependencyGraph lives in GraphModel.py and is shared with UniversalGraph.py.
+
+def read_imports(ast_path: str, import_selectors: List[Dict[str, Any]]) -> List[str]:
+    """Returns the raw import strings of one AST file, in selector order."""
+    ast_data = load_ast_file(ast_path)
+    imports = []
+    for selector in import_selectors:
+        for node in find_nodes_by_type(ast_data, selector.get('type')):
+            import_path = extract_value_by_path(node, selector.get('source'))
+            if import_path:
+                imports.append(import_path)
+    return imports
+
+def make_import_targets(lang_config: Dict[str, Any]):
+    """Returns a function mapping (file, import, resolver) to the (target, node type) pairs to link."""
+    # Use the new external patterns for filtering
+    external_patterns = [re.compile(p) for p in get_config_value(lang_config, 'externalDependencyPatterns', [])]
 
-class DependencyGraph:
-    """A class to build and manage the dependency graph."""
-    def __init__(self):
-        self.nodes = set()
-        self.edges = set()
-
-    def add_node(self, node_id: str, label: str, node_type: str):
-        shape, color = "box", "black"
-        if node_type == "file":
-            shape, color = "ellipse", "lightblue"
-        elif node_type == "folder":
-            shape, color = "folder", "gray"
-        elif node_type == "module":
-            shape, color = "component", "orange"
-        
-        dot_node = f'  "{node_id}" [label="{label}", shape="{shape}", color="{color}", style=filled];'
-        self.nodes.add(dot_node)
-
-    def add_edge(self, source: str, target: str, label: str):
-        dot_edge = f'  "{source}" -> "{target}" [label="{label}"];'
-        self.edges.add(dot_edge)
-
-    def add_folder_hierarchy(self, file_label: str):
-        """Creates nodes for each part of a file's path and connects them."""
-        parts = file_label.split("/")
-        parent = None
-        current_path = ""
-        for part in parts[:-1]:
-            current_path = f"{current_path}/{part}" if current_path else part
-            self.add_node(current_path, part, "folder")
-            if parent:
-                self.add_edge(parent, current_path, "contains")
-            parent = current_path
-        if parent:
-            self.add_edge(parent, file_label, "contains")
-
-    def generate_dot_file(self, output_path: str):
-        """Generates and saves the final .dot file."""
-        dot_content = [
-            "digraph G {",
-            "  rankdir=LR;",
-            "  node [fontname=\"Helvetica\"];",
-            "  edge [fontname=\"Helvetica\"];",
-            "\n  // --- Nodes ---",
-            *sorted(list(self.nodes)),
-            "\n  // --- Edges ---",
-            *sorted(list(self.edges)),
-            "}"
-        ]
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write("\n".join(dot_content))
-        print(f"\n✅ Successfully generated rich dependency graph at: {output_path}")
-
-def main(ast_dir: str, config_path: str, output_path: str):
+    def import_targets(source_node_id: str, import_path: str, resolver: ImportResolver) -> List[Tuple[str, str]]:
+        # Imports that resolve to a project file become file -> file edges
+        target_files = resolver.resolve(source_node_id, import_path)
+        if target_files:
+            return [(target_file, "file") for target_file in target_files if target_file != source_node_id]
+        # If the import is NOT external, we assume it's internal and graph it.
+        if not any(p.search(import_path) for p in external_patterns):
+            return [(import_path, "module")]
+        return []
+    return import_targets
+
+def main(ast_dir: str, config_path: str, output_path: str, changed_files: Optional[List[str]] = None,
+         collapse: Optional[Dict[str, Any]] = None):
     """Main function to analyze a directory and generate the dependency graph."""
     if not os.path.isdir(ast_dir) or not os.path.isfile(config_path):
         print("Error: AST directory or language configuration not found.", file=sys.stderr)
@@ -114,10 +101,30 @@ def main(ast_dir: str, config_path: str, output_path: str):
 
     print(f"Generating dependency graph using '{lang_config.get('language')}' configuration...")
 
-    graph = DependencyGraph()
-    # Use the new external patterns for filtering
-    external_patterns = [re.compile(p) for p in get_config_value(lang_config, 'externalDependencyPatterns', [])]
     import_selectors = get_config_value(lang_config, 'selectors.import', [])
+    import_targets = make_import_targets(lang_config)
+    index_path = os.path.splitext(output_path)[0] + ".index.db"
+
+    if changed_files is not None and os.path.isfile(index_path):
+        # Only the changed files' ASTs are read; everything else comes from the saved index
+        graph = update_graph_index(index_path, ast_dir, changed_files,
+                                   lambda path: read_imports(path, import_selectors), import_targets)
+    else:
+        graph = build_graph(ast_dir, import_selectors, import_targets)
+        save_graph_index(graph, index_path)
+
+    # A collapsed overview only changes what is rendered; analytics use the full graph
+    view = graph.collapse(**collapse) if collapse else graph
+    export_graph(view, output_path)
+    write_analytics(graph, os.path.splitext(output_path)[0] + ".analytics.json")
+    # Canonical hashed node/edge list, compared across runs with GraphDiff.py
+    write_snapshot(graph, os.path.splitext(output_path)[0] + ".edges")
+
+def build_graph(ast_dir: str, import_selectors: List[Dict[str, Any]], import_targets) -> DependencyGraph:
+    """Builds the full graph from every AST file under ast_dir."""
+    graph = DependencyGraph()
+    # Indexes the AST file names once so imports can be linked to the files they refer to
+    resolver = ImportResolver.from_ast_dir(ast_dir)
 
     for root, _, files in os.walk(ast_dir):
         for file in files:
@@ -130,30 +137,33 @@ def main(ast_dir: str, config_path: str, output_path: str):
                 graph.add_folder_hierarchy(source_node_id)
 
                 try:
-                    with open(full_path, 'r', encoding='utf-8') as f_ast:
-                        ast_data = json.load(f_ast)
-                    
-                    for selector in import_selectors:
-                        for node in find_nodes_by_type(ast_data, selector.get('type')):
-                            import_path = extract_value_by_path(node, selector.get('source'))
-                            if not import_path:
-                                continue
-
-                            # If the import is NOT external, we assume it's internal and graph it.
-                            if not any(p.search(import_path) for p in external_patterns):
-                                graph.add_node(import_path, import_path, "module")
-                                graph.add_edge(source_node_id, import_path, "imports")
-                                
+                    import_paths = read_imports(full_path, import_selectors)
                 except Exception as e:
                     print(f"\n❌ Failed to analyze file: {full_path}. Reason: {e}", file=sys.stderr)
+                    continue
+
+                graph.file_imports[source_node_id] = import_paths
+                for import_path in import_paths:
+                    graph.add_imports(source_node_id, import_targets(source_node_id, import_path, resolver))
 
-    graph.generate_dot_file(output_path)
+    return graph
 
 if __name__ == "__main__":
-    if len(sys.argv) < 3:
-        print("Usage: python create_rich_dependency_graph.py <path-to-ast-directory> <path-to-config.json> [output_file.dot]")
+    args = sys.argv[1:]
+    # '--update a.py.json b.py.json ...' refreshes the saved graph for the listed AST files only
+    changed = args[args.index("--update") + 1:] if "--update" in args else None
+    args = args[:args.index("--update")] if "--update" in args else args
+    # '--depth N', '--max-nodes N' and '--focus <folder>' render a collapsed overview instead of every file
+    collapse = {}
+    for option, key, cast in (("--depth", "depth", int), ("--max-nodes", "max_nodes", int), ("--focus", "focus", str)):
+        if option in args:
+            position = args.index(option)
+            collapse[key] = cast(args[position + 1])
+            del args[position:position + 2]
+    if len(args) < 2:
+        print("Usage: python create_rich_dependency_graph.py <path-to-ast-directory> <path-to-config.json> [output_file.dot] [--depth N] [--max-nodes N] [--focus <folder>] [--update <changed-ast-file> ...]")
     else:
-        ast_directory = sys.argv[1]
-        config_file_path = sys.argv[2]
-        output_file = sys.argv[3] if len(sys.argv) > 3 else "dependencies.dot"
-        main(ast_directory, config_file_path, output_file)
\ No newline at end of file
+        ast_directory = args[0]
+        config_file_path = args[1]
+        output_file = args[2] if len(args) > 2 else "dependencies.dot"
+        main(ast_directory, config_file_path, output_file, changed, collapse)
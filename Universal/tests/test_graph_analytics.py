@@ -0,0 +1,110 @@
+import os
+import random
+import sys
+import unittest
+from array import array
+
+UNIVERSAL_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, UNIVERSAL_DIR)
+
+from GraphAnalytics import (CSRGraph, condensation, reachable, strongly_connected_components,  # noqa: E402
+                            synthetic_graph, topological_layers, transitive_dependencies, transitive_dependents)
+
+def random_graph(rng, node_count, edge_count):
+    sources = array('I', (rng.randrange(node_count) for _ in range(edge_count)))
+    destinations = array('I', (rng.randrange(node_count) for _ in range(edge_count)))
+    return CSRGraph.from_edges(node_count, sources, destinations)
+
+def edges(graph):
+    return [(v, w) for v in range(graph.node_count) for w in graph.successors(v)]
+
+def brute_reachable(graph, start_nodes):
+    """Nodes at the end of a path of one or more edges from any start node (plain DFS)."""
+    found, stack = set(), [w for v in start_nodes for w in graph.successors(v)]
+    while stack:
+        v = stack.pop()
+        if v not in found:
+            found.add(v)
+            stack.extend(graph.successors(v))
+    return found
+
+def brute_layers(dag):
+    layer = {}
+    def depth(c):
+        if c not in layer:
+            layer[c] = max((depth(d) + 1 for d in dag.successors(c)), default=0)
+        return layer[c]
+    return [depth(c) for c in range(dag.node_count)]
+
+class GraphAnalyticsTest(unittest.TestCase):
+    def check_graph(self, graph):
+        n = graph.node_count
+        reach = [brute_reachable(graph, [v]) | {v} for v in range(n)]
+        component = strongly_connected_components(graph)
+
+        # Same component exactly when mutually reachable
+        for v in range(n):
+            for w in range(n):
+                self.assertEqual(component[v] == component[w], w in reach[v] and v in reach[w], (v, w))
+        # Tarjan numbering: edges between components go from a higher id to a lower one
+        for v, w in edges(graph):
+            self.assertGreaterEqual(component[v], component[w])
+
+        dag = condensation(graph, component)
+        expected_dag_edges = {(component[v], component[w]) for v, w in edges(graph) if component[v] != component[w]}
+        self.assertEqual(sorted(edges(dag)), sorted(expected_dag_edges))
+        self.assertEqual(list(topological_layers(dag)), brute_layers(dag))
+
+        reverse_graph = graph.reverse()
+        for start in ([0], [n - 1], list(range(0, n, 7))):
+            forward = transitive_dependencies(graph, start)
+            backward = transitive_dependents(graph, start, reverse_graph)
+            self.assertEqual(len(forward), len(set(forward)))
+            self.assertEqual(len(backward), len(set(backward)))
+            self.assertEqual(set(forward), brute_reachable(graph, start))
+            self.assertEqual(set(backward), brute_reachable(reverse_graph, start))
+            self.assertEqual(set(backward), {v for v in range(n) if brute_reachable(graph, [v]) & set(start)})
+
+    def test_random_graphs_match_brute_force(self):
+        rng = random.Random(7)
+        for node_count, edge_count in ((1, 0), (1, 1), (5, 0), (8, 12), (30, 30), (40, 90), (60, 200)):
+            for _ in range(5):
+                self.check_graph(random_graph(rng, node_count, edge_count))
+
+    def test_synthetic_graphs_match_brute_force(self):
+        for seed in range(3):
+            self.check_graph(synthetic_graph(200, 1000, seed))
+
+    def test_deep_chain_needs_no_recursion(self):
+        n = 200000
+        chain = CSRGraph.from_edges(n, array('I', range(n - 1)), array('I', range(1, n)))
+        component = strongly_connected_components(chain)
+        self.assertEqual(list(component), list(range(n - 1, -1, -1)))
+        dag = condensation(chain, component)
+        self.assertEqual(max(topological_layers(dag)), n - 1)
+        self.assertEqual(len(reachable(chain, [0])), n - 1)
+        self.assertEqual(len(transitive_dependents(chain, [n - 1])), n - 1)
+
+        # Closing the chain into one cycle puts every node in one component
+        cycle = CSRGraph.from_edges(n, array('I', range(n)), array('I', list(range(1, n)) + [0]))
+        component = strongly_connected_components(cycle)
+        self.assertEqual(set(component), {0})
+        self.assertEqual(sorted(reachable(cycle, [0])), list(range(n)))
+
+    def test_million_edge_graph_invariants(self):
+        graph = synthetic_graph(200000, 1000000)
+        component = strongly_connected_components(graph)
+        offsets, targets = graph.offsets, graph.targets
+        for v in range(graph.node_count):
+            cv = component[v]
+            for i in range(offsets[v], offsets[v + 1]):
+                self.assertGreaterEqual(cv, component[targets[i]])
+        dag = condensation(graph, component)
+        layer = topological_layers(dag)
+        for c, d in edges(dag):
+            self.assertGreater(layer[c], layer[d])
+        last = graph.node_count - 1
+        self.assertEqual(set(transitive_dependents(graph, [last])), brute_reachable(graph.reverse(), [last]))
+
+if __name__ == '__main__':
+    unittest.main()
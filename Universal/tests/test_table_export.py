@@ -0,0 +1,68 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+UNIVERSAL_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, UNIVERSAL_DIR)
+
+from ASTView import load_ast_file  # noqa: E402
+from TableExport import TableBuilder, pyarrow_available  # noqa: E402
+
+SAMPLE_AST = os.path.join(UNIVERSAL_DIR, 'Project_AST_Output', 'api-server-flask', 'api', 'routes.py.json')
+
+def load_config(name):
+    with open(os.path.join(UNIVERSAL_DIR, name), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def column_lengths(builder):
+    return {name: {column: len(values.codes) if hasattr(values, 'codes') else len(values)
+                   for column, values in getattr(builder, name).columns.items()}
+            for name in ('nodes', 'functions', 'imports', 'patterns')}
+
+class TableBuilderTest(unittest.TestCase):
+    def test_failing_file_adds_no_rows(self):
+        builder = TableBuilder(load_config('python.json'))
+        builder.add_file('routes.py', load_ast_file(SAMPLE_AST))
+        before = column_lengths(builder)
+
+        broken = {'type': 'module', 'text': 'x = 1', 'startPosition': {'row': 0, 'column': 0},
+                  'endPosition': {'row': 0, 'column': 5}, 'children': [{'type': 'expression_statement', 'text': 'x = 1'}]}
+        with self.assertRaises(TypeError):
+            builder.add_file('broken.py', broken)
+
+        self.assertEqual(column_lengths(builder), before)
+        for table in before.values():
+            self.assertEqual(len(set(table.values())), 1)
+
+    @unittest.skipUnless(pyarrow_available(), "pyarrow is not installed")
+    def test_write_parquet_and_arrow(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        builder = TableBuilder(load_config('python.json'))
+        builder.add_file('api/routes.py', load_ast_file(SAMPLE_AST))
+        lengths = column_lengths(builder)
+        with tempfile.TemporaryDirectory() as output_dir:
+            for table_format in ('parquet', 'arrow'):
+                paths = builder.write(os.path.join(output_dir, table_format), table_format)
+                self.assertEqual(len(paths), 4)
+                for path in paths:
+                    name = os.path.splitext(os.path.basename(path))[0]
+                    if table_format == 'parquet':
+                        table = pq.read_table(path)
+                    else:
+                        with pa.memory_map(path) as source:
+                            table = pa.ipc.open_file(source).read_all()
+                    self.assertEqual(table.column_names, list(lengths[name]))
+                    self.assertEqual(table.num_rows, next(iter(lengths[name].values())))
+                    if table.num_rows:
+                        self.assertEqual(table.column('file').to_pylist()[0], 'api/routes.py')
+
+            nodes = pq.read_table(os.path.join(output_dir, 'parquet', 'nodes.parquet'))
+            self.assertEqual(nodes.column('parent').to_pylist()[0], -1)
+            self.assertEqual(nodes.column('type').to_pylist()[0], 'module')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,10 +2,14 @@ import os
 import json
 import re
 from collections import defaultdict
+from functools import partial
+from SymbolTable import SymbolCache
 
-def find_specific_api_calls(node, file_path, results):
+def find_specific_api_calls(node, file_path, results, resolve_constant=None):
     """
     Recursively traverses the AST to find specific API calls like fetch, axios, etc.
+    If resolve_constant is given, endpoint arguments such as `${API}/users` are
+    resolved against the file's symbol table.
     """
     if not isinstance(node, dict):
         return
@@ -40,7 +44,8 @@ def find_specific_api_calls(node, file_path, results):
             args_node = node.get("children", [{}, {}])[1]
             if args_node and args_node.get("children"):
                 endpoint_node = args_node.get("children")[0]
-                endpoint = endpoint_node.get("text", "'unknown'").strip("'\"")
+                endpoint_text = endpoint_node.get("text", "'unknown'")
+                endpoint = resolve_constant(endpoint_text) if resolve_constant else endpoint_text.strip("'\"")
             
             results['api_calls'].append(f"{file_path} \t {call_type} ({method}) \t {endpoint}")
 
@@ -53,7 +58,7 @@ def find_specific_api_calls(node, file_path, results):
     # Recurse through children nodes
     if "children" in node and isinstance(node["children"], list):
         for child in node["children"]:
-            find_specific_api_calls(child, file_path, results)
+            find_specific_api_calls(child, file_path, results, resolve_constant)
 
 
 def parse_ast_files_for_api_calls(root_folder):
@@ -65,6 +70,7 @@ def parse_ast_files_for_api_calls(root_folder):
         return None
     
     all_results = defaultdict(list)
+    symbols = SymbolCache(root_folder, 'javascript')
 
     for dirpath, _, filenames in os.walk(root_folder):
         for filename in filenames:
@@ -75,7 +81,9 @@ def parse_ast_files_for_api_calls(root_folder):
                     with open(file_path, 'r', encoding='utf-8') as f:
                         ast_data = json.load(f)
                     
-                    find_specific_api_calls(ast_data, relative_path, all_results)
+                    symbols.table_for(relative_path, ast_data)
+                    resolve_constant = partial(symbols.resolve, relative_path)
+                    find_specific_api_calls(ast_data, relative_path, all_results, resolve_constant)
 
                 except Exception as e:
                     print(f"An error occurred while processing {relative_path}: {e}")